@@ -9,57 +9,60 @@ class ClipSlotMK2(ClipSlotComponent):
 		button = self._launch_button_value.subject
 		if self._allow_updates:
 			if self.is_enabled() and button != None:
-				value_to_send = self._feedback_value()
-				if value_to_send in (None, -1) or value_to_send["value"] in (None, -1):
-					button.turn_off()
-				elif in_range(value_to_send["value"], 0, 128):
-					button.force_next_send()
-					button.send_value(value_to_send["value"], channel = value_to_send["channel"])
-				else:
-					button.force_next_send()
-					button.set_light(value_to_send["value"])
+				feedback = self._feedback_value()
+				# a pad still showing this slot's feedback is not drawn again
+				shown = (self, feedback)
+				if not button.shows(shown):
+					if feedback == None or feedback[0] in (None, -1):
+						button.turn_off()
+					elif in_range(feedback[0], 0, 128):
+						button.force_next_send()
+						button.send_value(feedback[0], channel = feedback[1])
+					else:
+						button.force_next_send()
+						button.set_light(feedback[0])
+					button.mark_shown(shown)
 		else:
 			self._update_requests += 1
 			
 	
 	def _feedback_value(self):
 		if self._clip_slot != None:
-			ret = {}
-			ret["value"] = 0
-			ret["channel"] = 0
+			value = 0
+			channel = 0
 			track = self._clip_slot.canonical_parent
 			slot_or_clip = self._clip_slot.clip if self.has_clip() else self._clip_slot
 	
 			if getattr(slot_or_clip, 'controls_other_clips', True) and self._stopped_value != None:
-				ret["value"] = self._stopped_value
+				value = self._stopped_value
 			if self._track_is_armed(track) and self._clip_slot.has_stop_button and self._record_button_value != None:
-				ret["value"] = self._record_button_value
+				value = self._record_button_value
 				
 			if slot_or_clip.color != None:
-				ret["value"] = self._color_value(slot_or_clip.color)
+				value = self._color_value(slot_or_clip.color)
 				if slot_or_clip.is_triggered:
-					#ret["channel"] = 1 # blink me
+					#channel = 1 # blink me
 					if slot_or_clip.will_record_on_start:
-						ret["value"] = self._triggered_to_record_value
+						value = self._triggered_to_record_value
 					else:
-						ret["value"]= self._triggered_to_play_value
-						#ret["channel"] = 1 # blink me
+						value= self._triggered_to_play_value
+						#channel = 1 # blink me
 				elif slot_or_clip.is_playing:
 					if slot_or_clip.is_recording:
-						ret["value"] = self._recording_value
+						value = self._recording_value
 					else:	
-						ret["value"] = self._started_value
-						#ret["channel"] = 2 # pulse me
+						value = self._started_value
+						#channel = 2 # pulse me
 			else:
 				if slot_or_clip.is_triggered:
 					if slot_or_clip.will_record_on_start:
-						ret["value"] = self._triggered_to_record_value
+						value = self._triggered_to_record_value
 					else:
-						ret["value"]= self._triggered_to_play_value	
+						value= self._triggered_to_play_value	
 				elif slot_or_clip.is_playing:
 					if slot_or_clip.is_recording:
-						ret["value"] = self._recording_value
+						value = self._recording_value
 					else:	
-						ret["value"] = self._started_value
+						value = self._started_value
 					
-			return ret
\ No newline at end of file
+			return (value, channel)
\ No newline at end of file
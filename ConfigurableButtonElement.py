@@ -1,5 +1,6 @@
 from _Framework.Skin import SkinColorMissingError
 from _Framework.ButtonElement import ButtonElement, ON_VALUE, OFF_VALUE
+from .SkinTable import skin_table, find_color_id
 
 class ConfigurableButtonElement(ButtonElement):
 	"""
@@ -9,16 +10,25 @@ class ConfigurableButtonElement(ButtonElement):
 	A ConfigurableButtonElement can have states other than True or
 	False, which can be defined by setting the 'states' property.
 	Thus 'set_light' can take any state or skin color.
+	Skin colors are given by name or by SkinTable color id, looked up
+	in the skin compiled to a SkinTable and drawn with their own draw().
+	The colors of the on and off states are looked up once for each value
+	they are given.
 	"""
 	default_states = {True: 'DefaultButton.On', False: 'DefaultButton.Off'}
 	send_depends_on_forwarding = False
+	# what a component marked as drawn with mark_shown. Anything sent since, or a cleared send cache, forgets it
+	_shown = None
 
 	def __init__(self, is_momentary, msg_type, channel, identifier, skin = None, default_states = None, control_surface = None, *a, **k):
 		self._control_surface = control_surface
 		super(ConfigurableButtonElement, self).__init__(is_momentary, msg_type, channel, identifier, skin = skin, **k)
+		self._skin_table = skin_table(self._skin)
 		if default_states is not None:
 			self.default_states = default_states
 		self.states = dict(self.default_states)
+		# state -> (state value, its skin color or None)
+		self._state_colors = {True: (None, None), False: (None, None)}
 
 	@property
 	def _on_value(self):
@@ -30,17 +40,24 @@ class ConfigurableButtonElement(ButtonElement):
 
 	@property
 	def on_value(self):
-		return self._try_fetch_skin_value(self._on_value)
+		return self._state_value(True)
 
 	@property
 	def off_value(self):
-		return self._try_fetch_skin_value(self._off_value)
+		return self._state_value(False)
 
-	def _try_fetch_skin_value(self, value):
-		try:
-			return self._skin[value]
-		except SkinColorMissingError:
-			return value
+	def _state_value(self, state):
+		# the skin color of a state, or its value when that is not a skin color
+		color = self._state_color(state)
+		return self.states[state] if color is None else color
+
+	def _state_color(self, state):
+		value = self.states[state]
+		bound_value, color = self._state_colors[state]
+		if bound_value is not value:
+			color = self._skin_color(value)
+			self._state_colors[state] = (value, color)
+		return color
 
 	def reset(self):
 		self.set_light('DefaultButton.Disabled')
@@ -66,13 +83,27 @@ class ConfigurableButtonElement(ButtonElement):
 	def is_enabled(self):
 		return not self.suppress_script_forwarding
 
+	def shows(self, state):
+		# True while the button still shows state, as marked after drawing it
+		return self._shown is not None and self._shown == state
+
+	def mark_shown(self, state):
+		self._shown = state
+
+	def clear_send_cache(self):
+		self._shown = None
+		super(ConfigurableButtonElement, self).clear_send_cache()
+
 	def set_light(self, value):
-		try:
-			self._draw_skin(value)
-		except SkinColorMissingError:
+		self._shown = None
+		color = self._skin_color(value)
+		if color is None:
 			super(ButtonElement, self).set_light(value)
+		else:
+			color.draw(self)
 
 	def send_value(self, value, **k):
+		self._shown = None
 		if value is ON_VALUE:
 			self._do_send_on_value(**k)
 		elif value is OFF_VALUE:
@@ -92,19 +123,33 @@ class ConfigurableButtonElement(ButtonElement):
 		
 		
 	def _do_send_on_value(self, **k):
-		if type(self._on_value) is int:
-			super(ConfigurableButtonElement, self).send_value(self._on_value, **k)
-		else:
-			self._draw_skin(self._on_value)
+		self._send_state(True, **k)
 			
 	def _do_send_off_value(self, **k):
-		if type(self._off_value) is int:
-			super(ConfigurableButtonElement, self).send_value(self._off_value, **k)
+		self._send_state(False, **k)
+
+	def _send_state(self, state, **k):
+		value = self.states[state]
+		if type(value) is int:
+			super(ConfigurableButtonElement, self).send_value(value, **k)
 		else:
-			self._draw_skin(self._off_value)
+			color = self._state_color(state)
+			if color is None:
+				raise SkinColorMissingError('Skin color missing: %s' % str(value))
+			color.draw(self)
+
+	def _skin_color(self, value):
+		# the skin color given by name or id, None if the skin does not have it
+		color_id = find_color_id(value)
+		if color_id is None:
+			return None
+		return self._skin_table.entry(color_id)
 
 	def _draw_skin(self, value):
-		self._skin[value].draw(self)
+		color = self._skin_color(value)
+		if color is None:
+			raise SkinColorMissingError('Skin color missing: %s' % str(value))
+		color.draw(self)
 		
 	def script_wants_forwarding(self):
 		return not self.suppress_script_forwarding
\ No newline at end of file
@@ -2,8 +2,11 @@ from _Framework.DeviceComponent import DeviceComponent
 from _Framework.ButtonElement import ButtonElement
 import sys
 from .DeviceControllerStripProxy import DeviceControllerStripProxy
+from .DeviceControllerGlideEngine import DeviceControllerGlideEngine
 import time
 import Live
+from .Instrumentation import timed
+from .SettingDefaults import setting
 try:
     from .Settings import Settings
 except ImportError:
@@ -53,6 +56,11 @@ class DeviceControllerComponent(DeviceComponent):
         self._force = True
         self._osd = None
 
+        # stepless glides on Live's main thread instead of the strip server thread
+        self._glide_engine = None
+        if setting("DEVICE_CONTROLLER__MAIN_THREAD_GLIDE"):
+            self._glide_engine = DeviceControllerGlideEngine(self._control_surface)
+
         self._control_surface.application().view.add_is_view_visible_listener(
             'Detail', self._on_detail_view_changed)
         self._control_surface.application().view.add_is_view_visible_listener(
@@ -118,6 +126,8 @@ class DeviceControllerComponent(DeviceComponent):
         self._device = None
         for slider in self._sliders:
             slider.shutdown()
+        if self._glide_engine is not None:
+            self._glide_engine.disconnect()
 
     def set_matrix(self, matrix):
         self._matrix = matrix
@@ -127,7 +137,8 @@ class DeviceControllerComponent(DeviceComponent):
                 slider = DeviceControllerStripProxy(tuple([
                     self._matrix.get_button(column,
                                             (self._matrix.height() - 1 - row))
-                    for row in range(self._matrix.height())]), self, column, self)
+                    for row in range(self._matrix.height())]), self, column, self,
+                    glide_engine=self._glide_engine)
                 slider._parent = self
                 #slider.set_parent(self)
                 self._sliders.append(slider)
@@ -163,46 +174,44 @@ class DeviceControllerComponent(DeviceComponent):
 
     def _update_OSD(self):
         if self._osd is not None:
-            self._osd.mode = "Device Controller"
+            self._osd.draft_mode = "Device Controller"
             i = 0
             try:
                 for slider in self._parameter_controls:
                     name = slider.param_name()
                     if name is not "None":
-                        self._osd.attribute_names[i] = str(name)
-                        self._osd.attributes[i] = str(slider.param_value())
+                        self._osd.set_attribute_name(i, str(name))
+                        self._osd.set_attribute(i, str(slider.param_value()))
                     else:
-                        self._osd.attribute_names[i] = " "
-                        self._osd.attributes[i] = " "
+                        self._osd.set_attribute_name(i, " ")
+                        self._osd.set_attribute(i, " ")
                     i += 1
             except:
                 for i in range(8):
-                    self._osd.attribute_names[i] = " "
-                    self._osd.attributes[i] = " "
+                    self._osd.set_attribute_name(i, " ")
+                    self._osd.set_attribute(i, " ")
 
             if self._selected_track is not None:
                 if self._is_locked_to_device:
                     if self._device is not None:
-                        self._osd.info[
-                            0] = "track : " + self.get_device_track_name(
-                            self._device) + " (locked)"
+                        self._osd.set_info(0, "track : " + self.get_device_track_name(
+                            self._device) + " (locked)")
                     else:
-                        self._osd.info[
-                            0] = "track : " + self._selected_track.name
+                        self._osd.set_info(0, "track : " + self._selected_track.name)
                 else:
-                    self._osd.info[0] = "track : " + self._selected_track.name
+                    self._osd.set_info(0, "track : " + self._selected_track.name)
             else:
-                self._osd.info[0] = " "
+                self._osd.set_info(0, " ")
             try:
                 name = self._device.name
                 if name == "":
                     name = "(unamed device)"
                 if self._is_locked_to_device:
-                    self._osd.info[1] = "device : " + name + " (locked)"
+                    self._osd.set_info(1, "device : " + name + " (locked)")
                 else:
-                    self._osd.info[1] = "device : " + name
+                    self._osd.set_info(1, "device : " + name)
             except:
-                self._osd.info[1] = "no device selected"
+                self._osd.set_info(1, "no device selected")
             self._osd.update()
 
     # DEVICE SELECTION
@@ -247,6 +256,7 @@ class DeviceControllerComponent(DeviceComponent):
             view.show_view('Detail/DeviceChain')
 
     # UPDATE
+    @timed("DeviceControllerComponent.update")
     def update(self):
 
         if self.is_enabled():
@@ -0,0 +1,107 @@
+import time
+
+from .Log import get_logger
+from .Instrumentation import timed
+
+log = get_logger(__name__)
+
+
+def glide_value(start_value, target_value, rate, elapsed):
+    # value a glide started at start_value has reached after elapsed seconds,
+    # moving at rate units per second. a rate of None jumps to the target
+    if rate is None:
+        return target_value
+    distance = rate * max(0.0, elapsed)
+    if target_value >= start_value:
+        return min(start_value + distance, target_value)
+    return max(start_value - distance, target_value)
+
+
+class Glide(object):
+
+    def __init__(self, parameter, start_value, target_value, rate, start_time):
+        self.parameter = parameter
+        self.start_value = start_value
+        self.target_value = target_value
+        self.rate = rate
+        self.start_time = start_time
+        self.last_value = start_value
+
+    def value_at(self, now):
+        return glide_value(self.start_value, self.target_value, self.rate, now - self.start_time)
+
+
+class DeviceControllerGlideEngine(object):
+    """ Moves device parameters to their targets from Live's main thread. Glides are advanced on
+    scheduled ticks, each tick writing the value the glide has reached at that time """
+
+    def __init__(self, control_surface, delay_in_ticks=1):
+        self._control_surface = control_surface
+        self._delay_in_ticks = delay_in_ticks
+        self._glides = {}
+        self._timed_strips = []
+        self._scheduled = False
+        self.clock = time.time
+
+    def disconnect(self):
+        self._glides = {}
+        self._timed_strips = []
+        self._control_surface = None
+
+    @property
+    def is_active(self):
+        return len(self._glides) > 0 or len(self._timed_strips) > 0
+
+    def start_glide(self, parameter, target_value, rate):
+        # replaces any glide already running on the parameter
+        if rate is None:
+            self.set_value(parameter, target_value)
+            return
+        value = parameter.value
+        self._glides[parameter._live_ptr] = Glide(parameter, value, target_value, rate, self.clock())
+        self._schedule()
+
+    def set_value(self, parameter, value):
+        self._glides.pop(parameter._live_ptr, None)
+        try:
+            parameter.value = value
+        except RuntimeError:
+            log.warning("GlideEngine: could not set parameter " + parameter.name)
+
+    def watch_timed_press(self, strip):
+        # strip.update_timed_step(now) is called every tick until it returns False
+        if strip not in self._timed_strips:
+            self._timed_strips.append(strip)
+        self._schedule()
+
+    def _schedule(self):
+        if not self._scheduled and self._control_surface is not None:
+            self._scheduled = True
+            self._control_surface.schedule_message(self._delay_in_ticks, self._tick)
+
+    @timed("DeviceControllerGlideEngine._tick")
+    def _tick(self):
+        self._scheduled = False
+        now = self.clock()
+        for key, glide in list(self._glides.items()):
+            if not self._advance(glide, now):
+                del self._glides[key]
+        self._timed_strips = [strip for strip in self._timed_strips if strip.update_timed_step(now)]
+        if self.is_active:
+            self._schedule()
+
+    def _advance(self, glide, now):
+        # returns False once the glide is done, or the parameter was moved by someone else or deleted
+        parameter = glide.parameter
+        try:
+            if round(parameter.value, 5) != round(glide.last_value, 5):
+                return False
+            value = max(min(glide.value_at(now), parameter.max), parameter.min)
+            parameter.value = value
+            glide.last_value = parameter.value
+        except RuntimeError:
+            log.warning("GlideEngine: could not set parameter " + parameter.name)
+            return False
+        except Exception:
+            return False
+        return value != glide.target_value
@@ -1,14 +1,17 @@
 import traceback
 import time
-from threading import Thread
 from functools import partial
 try:
     import Queue as queue
 except ModuleNotFoundError:
     import queue
 
-from .DeviceControllerStripServer import DeviceControllerStripServer
-from .Log import log
+from .DeviceControllerStripServer import DeviceControllerStripServer, mirrored
+from .DeviceControllerStripScheduler import get_scheduler
+from .LatencyHistogram import LatencyHistogram
+from .Log import get_logger
+
+log = get_logger(__name__)
 
 non_returns = ["set_precision_mode", "set_stepless_mode", "shutdown",
                "update", "reset_if_no_parameter", "_button_value", "connect_to",
@@ -16,27 +19,46 @@ non_returns = ["set_precision_mode", "set_stepless_mode", "shutdown",
 
 returning = ["set_enabled", "param_name", "param_value","__ne__"]
 
+# time spent in proxy calls, by function name
+latency = {}
+
+
+def _record_latency(name, start):
+    histogram = latency.get(name)
+    if histogram is None:
+        histogram = latency[name] = LatencyHistogram()
+    histogram.add(time.time() - start)
+
 
 class DeviceControllerStripProxy():
-    def __init__(self, buttons, control_surface, column, parent=None):
+    def __init__(self, buttons, control_surface, column, parent=None, glide_engine=None):
         self._request_queue = queue.Queue()
         self._response_queue = queue.Queue()
         self.failed = False
         self.column = column
         self.request_id = 0
+        # what the server will publish once it handled our requests, as of request_id
+        self._mirror = (0, True, "None", 0)
+        # with a glide engine everything runs on Live's main thread, calls go straight to the server
+        self._glide_engine = glide_engine
+        self._scheduler = get_scheduler() if glide_engine is None else None
         self.server = DeviceControllerStripServer(buttons, control_surface,
                                                   column,
                                                   request_queue=self._request_queue,
                                                   response_queue=self._response_queue,
-                                                  parent=parent)
-        self._server_process = Thread(target=self.server.run)
-        self._server_process.start()
+                                                  parent=parent,
+                                                  scheduler=self._scheduler,
+                                                  glide_engine=glide_engine)
+        if self._scheduler is not None:
+            self._scheduler.register(self.server)
 
     def __getattr__(self, item):
         #log(f'Proxy{self.column}: __getattr__ {item}')
         if self.failed:
             return
-        if item in non_returns:
+        if item in mirrored:
+            return partial(self._call_mirrored_handler, item)
+        elif item in non_returns:
             return partial(self._call_non_return_handler, item)
         elif item in returning:
             return partial(self._call_return_handler, item)
@@ -45,13 +67,62 @@ class DeviceControllerStripProxy():
             return partial(self._call_non_return_handler, item)
 
     def _call_non_return_handler(self, name, *args, **kwargs):
+        start = time.time()
         self.request_id += 1
-        self._request_queue.put((name, self.request_id, args, kwargs))
+        if name == "connect_to":
+            self._update_mirror(parameter=args[0])
+        elif name == "release_parameter":
+            self._update_mirror(parameter=None)
+        if self._glide_engine is not None:
+            self.server._request_handler(name, self.request_id, *args, **kwargs)
+        else:
+            self._request_queue.put((name, self.request_id, args, kwargs))
+            self._scheduler.notify()
+        _record_latency(name, start)
+
+    def _snapshot(self):
+        # the server's snapshot once it caught up with the requests sent so far, else our own
+        snapshot = self.server.snapshot
+        if snapshot[0] >= self._mirror[0]:
+            return snapshot
+        return self._mirror
+
+    def _update_mirror(self, enabled=None, parameter=False):
+        # runs on Live's main thread, where reading the parameter is safe
+        _, current_enabled, name, value = self._snapshot()
+        if enabled is None:
+            enabled = current_enabled
+        if parameter is None:
+            name, value = "None", 0
+        elif parameter is not False:
+            try:
+                name, value = parameter.name, parameter.value
+            except:
+                name, value = "None", 0
+        self._mirror = (self.request_id, enabled, name, value)
+
+    def _call_mirrored_handler(self, name, *args, **kwargs):
+        if self.server.failed:
+            self.failed = True
+        if name == "set_enabled":
+            self._call_non_return_handler(name, *args, **kwargs)
+            self._update_mirror(enabled=args[0])
+            return args[0]
+        start = time.time()
+        if name == "param_name":
+            result = self._snapshot()[2]
+        else:
+            result = self._snapshot()[3]
+        _record_latency(name, start)
+        return result
 
     def _call_return_handler(self, name, *args, **kwargs):
         self.request_id += 1
         current_id = self.request_id
+        if self._glide_engine is not None:
+            return self.server._request_handler(name, current_id, *args, **kwargs)
         self._request_queue.put((name, current_id, args, kwargs))
+        self._scheduler.notify()
         try:
             while True:
                 token, response = self._response_queue.get(timeout=10)
@@ -70,5 +141,5 @@ class DeviceControllerStripProxy():
         except queue.Empty as e:
             self.failed = True
             #log(f'Proxy{self.column}: _call_return_handler {name} {args} {kwargs} failed')
-            log(traceback.format_stack())
+            log.error(traceback.format_stack())
             return
@@ -0,0 +1,66 @@
+import threading
+
+TICK_INTERVAL = 0.005
+
+
+class DeviceControllerStripScheduler(object):
+    """ Runs all DeviceControllerStripServers on one thread. The thread sleeps until a
+    request arrives, and wakes every TICK_INTERVAL only while a strip is moving a parameter """
+
+    def __init__(self, tick_interval=TICK_INTERVAL):
+        self.tick_interval = tick_interval
+        self._condition = threading.Condition()
+        self._servers = []
+        self._thread = None
+        self.wakeups = 0
+
+    def register(self, server):
+        with self._condition:
+            self._servers.append(server)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="DeviceControllerStripScheduler")
+                self._thread.daemon = True
+                self._thread.start()
+
+    def notify(self):
+        # called by the proxies after queueing a request
+        with self._condition:
+            self._condition.notify()
+
+    @property
+    def is_running(self):
+        return self._thread is not None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._servers:
+                    self._thread = None
+                    return
+                if not any(server.has_requests() for server in self._servers):
+                    if any(server.is_moving() for server in self._servers):
+                        self._condition.wait(self.tick_interval)
+                    else:
+                        self._condition.wait()
+                servers = list(self._servers)
+            self.wakeups += 1
+            for server in servers:
+                try:
+                    running = server.run_once()
+                except Exception:
+                    # the server already reported the error to its proxy
+                    running = False
+                if not running:
+                    with self._condition:
+                        if server in self._servers:
+                            self._servers.remove(server)
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = DeviceControllerStripScheduler()
+    return _scheduler
@@ -1,10 +1,12 @@
-import threading
 import traceback
 
 from .ButtonSliderElement import ButtonSliderElement
 from .Settings import Settings
 import time
-from .Log import log
+from .Log import get_logger
+from .Instrumentation import timed
+
+log = get_logger(__name__)
 
 SLIDER_MODE_OFF = 0
 SLIDER_MODE_TOGGLE = 1
@@ -20,12 +22,17 @@ non_returns = ["set_precision_mode", "set_stepless_mode", "shutdown", "update",
 
 returning = ["set_enabled", "param_name", "param_value", "__ne__"]
 
+# answered by the proxy from the published snapshot, their results are not sent back
+mirrored = ["set_enabled", "param_name", "param_value"]
+
 
-class DeviceControllerStripServer(ButtonSliderElement, threading.Thread):
+class DeviceControllerStripServer(ButtonSliderElement):
     def __init__(self, buttons, control_surface, column, request_queue,
-        response_queue, parent=None):
+        response_queue, parent=None, scheduler=None, glide_engine=None):
         ButtonSliderElement.__init__(self, buttons)
         self._control_surface = control_surface
+        self._scheduler = scheduler
+        self._glide_engine = glide_engine
         self._column = column
         self._request_queue = request_queue
         self._response_queue = response_queue
@@ -58,6 +65,14 @@ class DeviceControllerStripServer(ButtonSliderElement, threading.Thread):
         self._last_pressed_index = -1
         self._primed_target_value = None
 
+        # (token of the last handled request, enabled, name, value), read by the proxy
+        self.failed = False
+        self.snapshot = (0, self._enabled, "None", 0)
+
+    def _publish_snapshot(self):
+        # a new tuple is swapped in at once, readers on other threads never see a partial update
+        self.snapshot = (self.current_token, self._enabled, self.param_name(), self.param_value())
+
     def set_enabled(self, enabled):
         self._enabled = enabled
         return self._enabled
@@ -282,10 +297,20 @@ class DeviceControllerStripServer(ButtonSliderElement, threading.Thread):
             else:
                 self._buttons[index].turn_off()
 
-    def _button_value(self, value, sender):
+    def _button_value(self, value, sender, queued=False):
         assert isinstance(value, int)
         assert (sender in self._buttons)
         # log(f"button_value: value: {value} Mode: {self._mode} Range: {self._range} Momentary: {sender.is_momentary()}")
+        # buttons call in on the main thread, not through the request queue.
+        # while the strip still has requests to handle (e.g. it is being enabled and connected
+        # after a mode switch) the press is queued behind them
+        if not queued and self.has_requests():
+            self._request_queue.put(("_button_value", None, (value, sender, True), {}))
+            self._wake()
+            return
+        was_moving = self.is_moving()
+        if not was_moving:
+            self._resume()
         self._last_sent_value = -1
         if self._parameter_to_map_to is not None and self._enabled:
             index_of_sender = list(self._buttons).index(sender)
@@ -369,6 +394,14 @@ class DeviceControllerStripServer(ButtonSliderElement, threading.Thread):
                     self.update()
                     if self._parent is not None:
                         self._custom_update_OSD()
+        if not was_moving and self.is_moving():
+            self._wake()
+
+    def _wake(self):
+        if self._glide_engine is not None:
+            self._glide_engine.watch_timed_press(self)
+        elif self._scheduler is not None:
+            self._scheduler.notify()
 
     def _calc_velocity(self, pressed_time):
         factor = min(1.0, pressed_time / Settings.TDC_MAX_TIME)
@@ -386,7 +419,17 @@ class DeviceControllerStripServer(ButtonSliderElement, threading.Thread):
         target_value = self._target_value if new_target_value is None else new_target_value
         velocity = self._current_velocity if new_velocity is None else new_velocity
         current_value = self._current_value
-        if self._precision_mode or not self._stepless_mode or not self._mode == SLIDER_MODE_SLIDER:
+        if self._glide_engine is not None:
+            # main thread: the engine writes the parameter, the strip only follows its value
+            if self._precision_mode or not self._stepless_mode or not self._mode == SLIDER_MODE_SLIDER:
+                self._glide_engine.set_value(self._parameter_to_map_to, target_value)
+            else:
+                self._current_velocity = velocity
+                self._glide_engine.start_glide(self._parameter_to_map_to, target_value, self.calc_rate(velocity))
+            self._current_value = self._parameter_to_map_to.value
+            self._target_value = self._current_value
+            self._last_value = self._current_value
+        elif self._precision_mode or not self._stepless_mode or not self._mode == SLIDER_MODE_SLIDER:
             tries = 0
             while True:
                 try:
@@ -485,64 +528,95 @@ class DeviceControllerStripServer(ButtonSliderElement, threading.Thread):
         for param_id in to_remove:
             del self._parameter_stack[param_id]
 
-    def run(self):
-        try:
-            while True:
-                if not self._request_queue.empty():
-                    funct_name, token, args, kwargs = self._request_queue.get()
-                    if funct_name == "shutdown":
-                        # log(f"Shutting down DCSServer {self._column}")
-                        return
-                    else:
-                        self._request_handler(funct_name, token, *args,
-                                              **kwargs)
-                roundtrip_time = time.time() - self.roundtrip_start
-                time.sleep(max(0.0, self.roundtrip_target/10 - roundtrip_time))
-                if self._request_queue.empty() or roundtrip_time > self.roundtrip_target:
-
-                    self.roundtrip_end = time.time()
-                    self.roundtrip_time = self.roundtrip_end - self.roundtrip_start
-                    self.roundtrip_start = self.roundtrip_end
-                    if self._timed_mode and self._timed_start > 0:
-                        self._timed_step = min(9, (int((
-                                                           self.roundtrip_end - self._timed_start) // self._timed_step_size)))
-
-                        self.update()
-                        if self._parent is not None:
-                            self._custom_update_OSD()
-
-                    if (self._parameter_to_map_to is not None):
-                        # if (self._parameter_to_map_to != None and self._enabled):
-                        try:
-                            self._current_value = self._parameter_to_map_to.value
-                        except Exception as e:
-                            continue
-
-                        if self._target_value is None or self._last_value is None:
-                            self._target_value = self._current_value
-                            self._last_value = self._current_value
-
-                        if self._current_value != self._target_value:
-                            if round(self._last_value, 5) == round(
-                                self._current_value, 5):
-                                self.update_current_parameter_value()
-                            else:
-                                # log(f"Parameter {self._parameter_to_map_to.name} changed while moving, Dropping!!")
-                                self._last_value = self._current_value
-                                self._target_value = self._current_value
-                    self.update_parameter_stack()
+    def has_requests(self):
+        return not self._request_queue.empty()
+
+    def is_moving(self):
+        # True while a press is being timed, a glide runs or a released parameter still moves
+        if self._timed_mode and self._timed_start > 0:
+            return True
+        if self._parameter_stack:
+            return True
+        return self._parameter_to_map_to is not None and self._target_value is not None and self._current_value != self._target_value
 
+    @timed("DeviceControllerStripServer.run_once")
+    def run_once(self):
+        # called by the DeviceControllerStripScheduler. returns False once shut down
+        try:
+            moving = self.is_moving()
+            while not self._request_queue.empty():
+                funct_name, token, args, kwargs = self._request_queue.get()
+                if funct_name == "shutdown":
+                    # log(f"Shutting down DCSServer {self._column}")
+                    return False
+                if not moving:
+                    self._resume()
+                    moving = True
+                result = self._request_handler(funct_name, token, *args, **kwargs)
+                if result is not None and token is not None and funct_name not in mirrored:
+                    self._response_queue.put((token, result))
+            if self.is_moving() and time.time() - self.roundtrip_start >= self.roundtrip_target / 10:
+                self._tick()
+            return True
         except Exception as e:
-            log("Run-Loop Exception in DCSServer " + str(
-                self._column) + ": Type " + type(e) + "\n " + str(e))
-            log(traceback.format_stack())
-            log(traceback.format_exc())
+            log.error("Run-Loop Exception in DCSServer " + str(
+                self._column) + ": Type " + str(type(e)) + "\n " + str(e))
+            log.error(traceback.format_exc())
+            self.failed = True
             self._response_queue.put((0, "ERROR"))
             raise e
 
+    def _resume(self):
+        # the strip was idle and not ticked: restart the roundtrip clock and pick up changes made in Live
+        self.roundtrip_start = time.time()
+        self.roundtrip_time = self.roundtrip_target / 10
+        if self._parameter_to_map_to is not None:
+            self._sync_parameter()
+
+    def _sync_parameter(self):
+        try:
+            self._current_value = self._parameter_to_map_to.value
+        except Exception as e:
+            return False
+
+        if self._target_value is None or self._last_value is None:
+            self._target_value = self._current_value
+            self._last_value = self._current_value
+
+        if self._current_value != self._target_value and round(self._last_value, 5) != round(self._current_value, 5):
+            # log(f"Parameter {self._parameter_to_map_to.name} changed while moving, Dropping!!")
+            self._last_value = self._current_value
+            self._target_value = self._current_value
+        return True
+
+    def _tick(self):
+        self.roundtrip_end = time.time()
+        self.roundtrip_time = self.roundtrip_end - self.roundtrip_start
+        self.roundtrip_start = self.roundtrip_end
+        self.update_timed_step(self.roundtrip_end)
+
+        if (self._parameter_to_map_to is not None):
+            if not self._sync_parameter():
+                return
+            if self._current_value != self._target_value:
+                self.update_current_parameter_value()
+        self.update_parameter_stack()
+
+    def update_timed_step(self, now):
+        # recolors the held pad while a press is timed. returns False when no press is timed
+        if not (self._timed_mode and self._timed_start > 0):
+            return False
+        self._timed_step = min(9, (int((now - self._timed_start) // self._timed_step_size)))
+        self.update()
+        if self._parent is not None:
+            self._custom_update_OSD()
+        return True
+
     def _request_handler(self, funct_name, token, *args, **kwargs):
         # log(f"DCSServer {self._column} Request handler: {funct_name} with {args} and {kwargs}")
-        self.current_token = token
+        # requests the server queues itself have no token: the snapshot keeps the one of the last proxy request
+        if token is not None:
+            self.current_token = token
         result = None
         if funct_name == "release_parameter":
             self.releasing_parameter(funct_name, *args,
@@ -564,8 +638,8 @@ class DeviceControllerStripServer(ButtonSliderElement, threading.Thread):
             result = self._call_dispatcher(funct_name, *args, **kwargs)
 
         # log(f"DCSServer {self._column} Call dispatcher: {funct_name} returned {type(result)}")
-        if result is not None:
-            self._response_queue.put((token, result))
+        self._publish_snapshot()
+        return result
 
     def releasing_parameter(self, funct_name, *args, **kwargs):
         if self._parameter_to_map_to is not None and self._target_value is not None:
@@ -615,6 +689,9 @@ class DeviceControllerStripServer(ButtonSliderElement, threading.Thread):
             self._current_velocity = 10
 
     def _put_parameter_on_stack(self):
+        if self._glide_engine is not None:
+            # the engine keeps gliding released parameters
+            return
         value = self._parameter_to_map_to.value
         if self._parameter_to_map_to._live_ptr not in self._parameter_stack.keys():
             self._parameter_stack[self._parameter_to_map_to._live_ptr] = {
@@ -636,16 +713,17 @@ class DeviceControllerStripServer(ButtonSliderElement, threading.Thread):
                 log("DCSServer " + str(
                     self._column) + " has no method " + method_name)
         except Exception as e:
-            log("Exception in DCSServer " + str(
+            log.error("Exception in DCSServer " + str(
                 self._column) + " _call_dispatcher :\n " + str(e))
-            log(traceback.print_exc())
-            log(traceback.format_stack())
+            log.error(traceback.format_exc())
+            log.error(traceback.format_stack())
             raise e
 
     # when called from connect_to, trigger_osd should be false
     def _on_parameter_changed(self, trigger_osd=True):
         # log(traceback.format_stack())
         # log(f"DCSServer {self._column} _on_parameter_changed {trigger_osd}")
+        self._publish_snapshot()
         if self._enabled:
             assert (self._parameter_to_map_to is not None)
             if self._is_update_needed():
@@ -658,33 +736,36 @@ class DeviceControllerStripServer(ButtonSliderElement, threading.Thread):
 
     def _custom_update_OSD(self, trigger_osd=True):
         if self._parent._osd is not None:
-            self._parent._osd.mode = "Device Controller"
-            name = self.param_name()
-            if name is not "None":
-                self._parent._osd.attribute_names[self._column] = str(name)
-                self._parent._osd.attributes[self._column] = str(
-                    self.param_value())
-            else:
-                self._parent._osd.attribute_names[self._column] = " "
-                self._parent._osd.attributes[self._column] = " "
-            # this might be called be background thread -> crash
+            # called from the strip thread too: the edit is published as a whole
+            with self._parent._osd.edit() as osd:
+                osd.draft_mode = "Device Controller"
+                name = self.param_name()
+                if name != "None":
+                    osd.set_attribute_name(self._column, str(name))
+                    osd.set_attribute(self._column, str(self.param_value()))
+                else:
+                    osd.set_attribute_name(self._column, " ")
+                    osd.set_attribute(self._column, " ")
             if trigger_osd:
                 self._parent._osd.update()
 
-    def calc_value_offset(self, velocity, max_diff):
-        # log(f"Velocity: {velocity} Max diff: {max_diff}")
+    def calc_rate(self, velocity):
+        # parameter change per second for a velocity, None for an instant change
         if not self._timed_mode:
             if velocity > Settings.VELOCITY_THRESHOLD_MAX:
-                return max_diff
+                return None
             velocity = max(velocity, Settings.VELOCITY_THRESHOLD_MIN) ** 3
             velocity_factor = velocity / (Settings.VELOCITY_FACTOR * 127.0)
-            change_per_roundtrip = velocity_factor / self.roundtrip_target
-            value_offset = change_per_roundtrip * self.roundtrip_time
         else:
             velocity_factor = (velocity / 127.0)
-            change_per_roundtrip = velocity_factor / self.roundtrip_target
-            value_offset = change_per_roundtrip * self.roundtrip_time
-        return min(value_offset, max_diff)
+        return velocity_factor / self.roundtrip_target
+
+    def calc_value_offset(self, velocity, max_diff):
+        # log(f"Velocity: {velocity} Max diff: {max_diff}")
+        change_per_second = self.calc_rate(velocity)
+        if change_per_second is None:
+            return max_diff
+        return min(change_per_second * self.roundtrip_time, max_diff)
 
     def _is_update_needed(self):
         if self._update_primed:
@@ -23,6 +23,7 @@ except NameError:
 	xrange = range
 
 from _Framework.ButtonMatrixElement import ButtonMatrixElement
+from .Instrumentation import timed
 KEY_MODE = 0
 SCALE_TYPE_MODE = 1
 
@@ -138,9 +139,9 @@ class InstrumentControllerComponent(CompoundComponent):
 					
 	def _set_feedback_velocity(self):
 		if self.song().session_record:
-			self._control_surface._c_instance.set_feedback_velocity(self._recordind_feedback_velocity)
+			self._control_surface.set_feedback_velocity(self._recordind_feedback_velocity)
 		else:
-			self._control_surface._c_instance.set_feedback_velocity(self._normal_feedback_velocity)
+			self._control_surface.set_feedback_velocity(self._normal_feedback_velocity)
 
 	@subject_slot('session_record')
 	def _on_session_record_changed(self):
@@ -208,14 +209,14 @@ class InstrumentControllerComponent(CompoundComponent):
 					self._scales_toggle_button.turn_on()
 				else:
 					self._scales.set_enabled(True)
-					self._osd_mode_backup = self._osd.mode
-					self._osd.mode = self._osd_mode_backup + ' - Scale'
+					self._osd_mode_backup = self._osd.draft_mode
+					self._osd.draft_mode = self._osd_mode_backup + ' - Scale'
 					self._scales_toggle_button.turn_on()
 					self._scales.update()
 			else:
 				self._scales_toggle_button.turn_off()
 				self._scales.set_enabled(False)
-				self._osd.mode = self._osd_mode_backup
+				self._osd.draft_mode = self._osd_mode_backup
 				if(not self._scales.is_quick_scale):
 					self._note_repeat.set_enabled(False)
 				self.update()
@@ -395,6 +396,7 @@ class InstrumentControllerComponent(CompoundComponent):
 		else:
 			self._control_surface.show_message("quick scale : REPEATER")
 
+	@timed("InstrumentControllerComponent.update")
 	def update(self):
 		if self.is_enabled():
 			if self._track_controller != None:
@@ -432,32 +434,32 @@ class InstrumentControllerComponent(CompoundComponent):
 	def _update_OSD(self):
 		if self._osd != None:
 			if self._scales.is_quick_scale:
-				self._osd.mode = "Instrument (quick scale)"
+				self._osd.draft_mode = "Instrument (quick scale)"
 			else:
-				self._osd.mode = "Instrument"
-			self._osd.attributes[0] = MUSICAL_MODES[self._scales._modus * 2]
-			self._osd.attribute_names[0] = "Scale"
-			self._osd.attributes[1] = KEY_NAMES[self._scales._key % 12]
-			self._osd.attribute_names[1] = "Root Note"
-			self._osd.attributes[2] = self._scales._octave
-			self._osd.attribute_names[2] = "Octave"
-			self._osd.attributes[3] = " "
-			self._osd.attribute_names[3] = " "
-			self._osd.attributes[4] = " "
-			self._osd.attribute_names[4] = " "
-			self._osd.attributes[5] = " "
-			self._osd.attribute_names[5] = " "
-			self._osd.attributes[6] = " "
-			self._osd.attribute_names[6] = " "
-			self._osd.attributes[7] = " "
-			self._osd.attribute_names[7] = " "
+				self._osd.draft_mode = "Instrument"
+			self._osd.set_attribute(0, MUSICAL_MODES[self._scales._modus * 2])
+			self._osd.set_attribute_name(0, "Scale")
+			self._osd.set_attribute(1, KEY_NAMES[self._scales._key % 12])
+			self._osd.set_attribute_name(1, "Root Note")
+			self._osd.set_attribute(2, self._scales._octave)
+			self._osd.set_attribute_name(2, "Octave")
+			self._osd.set_attribute(3, " ")
+			self._osd.set_attribute_name(3, " ")
+			self._osd.set_attribute(4, " ")
+			self._osd.set_attribute_name(4, " ")
+			self._osd.set_attribute(5, " ")
+			self._osd.set_attribute_name(5, " ")
+			self._osd.set_attribute(6, " ")
+			self._osd.set_attribute_name(6, " ")
+			self._osd.set_attribute(7, " ")
+			self._osd.set_attribute_name(7, " ")
 
 			if self._track_controller.selected_track != None:
-				self._osd.info[0] = "track : " + self._track_controller.selected_track.name
+				self._osd.set_info(0, "track : " + self._track_controller.selected_track.name)
 			else:
-				self._osd.info[0] = " "
+				self._osd.set_info(0, " ")
 
-			self._osd.info[1] = " "
+			self._osd.set_info(1, " ")
 			self._osd.update()
 
 	# Refresh matrix and its listener
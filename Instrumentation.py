@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+from .LatencyHistogram import LatencyHistogram
+from .Log import LOG_DIRECTORY
+from .SettingDefaults import setting
+
+clock = getattr(time, 'perf_counter', time.time)
+
+INSTRUMENTATION_FILE = LOG_DIRECTORY + "/instrumentation.txt"
+
+
+class Instrumentation(object):
+	"""
+	Timings of the script's entry points, enabled with Settings.INSTRUMENTATION.
+	Each timed call goes to a histogram per name and to a ring buffer of the last calls.
+	Time spent in the outermost timed calls of the main thread is added up per display tick:
+	ticks over Settings.INSTRUMENTATION__TICK_BUDGET_MS are counted against the names that used it.
+	"""
+
+	def __init__(self, ring_size, tick_budget):
+		self._lock = threading.Lock()
+		self._main_thread = threading.current_thread()
+		self.tick_budget = tick_budget
+		self.histograms = {}
+		self.counters = {}
+		self.ring = deque(maxlen=ring_size)
+		self.ticks = 0
+		self.overruns = 0
+		self.overrun_time = {}
+		self.worst_tick = (0.0, {})
+		self._tick_time = {}
+		self._tick_busy = 0.0
+		self._names = []
+
+	@property
+	def action(self):
+		# the innermost timed call running on the main thread, None outside of them
+		return self._names[-1] if self._names else None
+
+	def call(self, name, function, a, k):
+		main = threading.current_thread() is self._main_thread
+		if main:
+			self._names.append(name)
+		start = clock()
+		try:
+			return function(*a, **k)
+		finally:
+			seconds = clock() - start
+			if main:
+				self._names.pop()
+			self.record(name, start, seconds, main)
+
+	def record(self, name, start, seconds, main=False):
+		with self._lock:
+			histogram = self.histograms.get(name)
+			if histogram is None:
+				histogram = self.histograms[name] = LatencyHistogram()
+			histogram.add(seconds)
+			self.ring.append((start, name, seconds))
+			if main:
+				self._tick_time[name] = self._tick_time.get(name, 0.0) + seconds
+				if not self._names:
+					self._tick_busy += seconds
+
+	def count(self, name, amount=1):
+		with self._lock:
+			self.counters[name] = self.counters.get(name, 0) + amount
+
+	def end_tick(self):
+		# called at the start of each display tick, closes the one before
+		with self._lock:
+			tick_time, self._tick_time = self._tick_time, {}
+			tick_seconds, self._tick_busy = self._tick_busy, 0.0
+			self.ticks += 1
+			if tick_seconds > self.tick_budget:
+				self.overruns += 1
+				for name, seconds in tick_time.items():
+					self.overrun_time[name] = self.overrun_time.get(name, 0.0) + seconds
+			if tick_seconds > self.worst_tick[0]:
+				self.worst_tick = (tick_seconds, tick_time)
+
+	def reset(self):
+		with self._lock:
+			self.histograms = {}
+			self.counters = {}
+			self.ring.clear()
+			self.ticks = 0
+			self.overruns = 0
+			self.overrun_time = {}
+			self.worst_tick = (0.0, {})
+			self._tick_time = {}
+			self._tick_busy = 0.0
+
+	def by_total_time(self):
+		with self._lock:
+			return sorted(self.histograms.items(), key=lambda item: -item[1].total)
+
+	def summary_lines(self):
+		lines = ["ticks: %d over %.1fms budget: %d" % (self.ticks, self.tick_budget * 1000, self.overruns)]
+		for name, histogram in self.by_total_time():
+			lines.append("%-45s total=%.1fms %s" % (name, histogram.total * 1000, histogram.summary()))
+		if self.overrun_time:
+			lines.append("time in ticks over budget:")
+			for name, seconds in sorted(self.overrun_time.items(), key=lambda item: -item[1]):
+				lines.append("  %-43s %.1fms" % (name, seconds * 1000))
+		seconds, tick_time = self.worst_tick
+		if tick_time:
+			lines.append("worst tick %.1fms:" % (seconds * 1000))
+			for name, seconds in sorted(tick_time.items(), key=lambda item: -item[1]):
+				lines.append("  %-43s %.1fms" % (name, seconds * 1000))
+		for name, count in sorted(self.counters.items()):
+			lines.append("%-45s count=%d" % (name, count))
+		return lines
+
+	def dump(self, path=INSTRUMENTATION_FILE):
+		# the summary followed by the ring buffer, oldest call first
+		with self._lock:
+			ring = list(self.ring)
+		with open(path, 'w') as f:
+			f.write('\n'.join(self.summary_lines()) + '\n\n')
+			if ring:
+				origin = ring[0][0]
+				for start, name, seconds in ring:
+					f.write("%10.3fms %-45s %8.1fus\n" % ((start - origin) * 1000, name, seconds * 1000000))
+
+	def show_on_osd(self, osd):
+		# the eight names with the most time, mean and p99 per call
+		osd.set_mode("Instrumentation")
+		osd.set_info(0, "ticks over budget: %d/%d" % (self.overruns, self.ticks))
+		for index, (name, histogram) in enumerate(self.by_total_time()[:8]):
+			osd.set_attribute_name(index, name)
+			osd.set_attribute(index, "%.0fus p99<%.0fus" % (histogram.mean * 1000000, histogram.percentile(0.99) * 1000000))
+		osd.update()
+
+
+if setting("INSTRUMENTATION"):
+	instrumentation = Instrumentation(setting("INSTRUMENTATION__RING_SIZE"), setting("INSTRUMENTATION__TICK_BUDGET_MS") / 1000.0)
+else:
+	instrumentation = None
+
+
+def timed(name):
+	# decorator timing every call under name; leaves the function untouched when instrumentation is off
+	def decorate(function):
+		if instrumentation is None:
+			return function
+
+		@wraps(function)
+		def timed_function(*a, **k):
+			return instrumentation.call(name, function, a, k)
+		return timed_function
+	return decorate
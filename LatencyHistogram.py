@@ -0,0 +1,46 @@
+class LatencyHistogram(object):
+	""" Counts durations in power of two microsecond buckets: bucket n holds durations below 2**n us """
+
+	def __init__(self, buckets=24):
+		self.counts = [0] * buckets
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+
+	def add(self, seconds):
+		micros = int(seconds * 1000000)
+		index = min(micros.bit_length(), len(self.counts) - 1)
+		self.counts[index] += 1
+		self.count += 1
+		self.total += seconds
+		if seconds > self.max:
+			self.max = seconds
+
+	def reset(self):
+		self.counts = [0] * len(self.counts)
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+
+	@property
+	def mean(self):
+		if self.count == 0:
+			return 0.0
+		return self.total / self.count
+
+	def percentile(self, fraction):
+		# upper bound in seconds of the bucket holding the given fraction of the samples
+		if self.count == 0:
+			return 0.0
+		wanted = fraction * self.count
+		seen = 0
+		for index, count in enumerate(self.counts):
+			seen += count
+			if count and seen >= wanted:
+				return (1 << index) / 1000000.0
+		return self.max
+
+	def summary(self):
+		return "n=%d mean=%.1fus p50<%.0fus p99<%.0fus max=%.1fus" % (
+			self.count, self.mean * 1000000, self.percentile(0.5) * 1000000,
+			self.percentile(0.99) * 1000000, self.max * 1000000)
@@ -1,17 +1,22 @@
 from __future__ import with_statement
 
 import traceback
+from contextlib import contextmanager
 
 import Live
 from _Framework.ControlSurface import ControlSurface
-from _Framework.InputControlElement import MIDI_CC_TYPE, MIDI_NOTE_TYPE
+from _Framework.InputControlElement import MIDI_CC_TYPE, MIDI_NOTE_TYPE, MIDI_INVALID_TYPE, InputControlElement
 from _Framework.ButtonElement import ButtonElement
 from _Framework.ButtonMatrixElement import ButtonMatrixElement
 from .ConfigurableButtonElement import ConfigurableButtonElement
 from .MainSelectorComponent import MainSelectorComponent
 from .NoteRepeatComponent import NoteRepeatComponent
 from .M4LInterface import M4LInterface
-from .Log import log
+from .LedFrameBuffer import LedFrameBuffer, MK2_LED_SYSEX, MK3_LED_SYSEX, LPX_LED_SYSEX
+from .Log import log, stop_log
+from .Instrumentation import instrumentation, timed
+from .MidiMeter import MidiMeter, TokenBucket
+from .SettingDefaults import setting
 try:
     from .Settings import Settings
 except ImportError:
@@ -61,12 +66,29 @@ class Launchpad(ControlSurface):
 	_active_instances = []
 	
 	def __init__(self, c_instance):
+		# pads lit while handling an event or a tick are sent once, when it is done
+		self._frame = LedFrameBuffer(self._send_frame_midi)
+		self._midi_meter = MidiMeter()
+		if setting("MIDI_RATE_LIMIT") > 0:
+			self._frame.limiter = TokenBucket(setting("MIDI_RATE_LIMIT"), setting("MIDI_RATE_BURST"))
+		# midi map rebuild requests made in a component guard are checked once, when the outermost guard is left
+		self._guard_depth = 0
+		self._rebuild_actions = None
+		self._built_routing = None
+		# feedback settings handed to Live through c_instance, part of the routing a rebuild request is checked against
+		self._feedback_channels = None
+		self._feedback_velocity = None
+		self._controlled_track = None
+		self._drum_translations = {}
+		self.midi_map_rebuilds = 0
+		self.midi_map_requests_dropped = 0
 		ControlSurface.__init__(self, c_instance)
 		live = Live.Application.get_application()
 		self._live_major_version = live.get_major_version()
 		self._live_minor_version = live.get_minor_version()
 		self._live_bugfix_version = live.get_bugfix_version()
 		self._selector = None #needed because update hardware is called.
+		self._osd = None
 		self._lpx = False
 		self._mk2_rgb = False
 		self._mk3_rgb = False
@@ -154,6 +176,18 @@ class Launchpad(ControlSurface):
 			side_buttons[5].name = 'Trk_On_Button'
 			side_buttons[6].name = 'Solo_Button'
 			side_buttons[7].name = 'Arm_Button'
+			# the matrix is what the rate limiter defers: playheads and blinking clips, not the mode buttons
+			self._frame.add_buttons([matrix.get_button(column, row) for row in range(8) for column in range(8)], "matrix", low_priority=True)
+			self._frame.add_buttons(top_buttons, "top")
+			self._frame.add_buttons(side_buttons, "side")
+			if self._lpx:
+				self._frame.set_led_format(LPX_LED_SYSEX)
+			elif self._mk3_rgb:
+				self._frame.set_led_format(MK3_LED_SYSEX)
+			elif self._mk2_rgb:
+				self._frame.set_led_format(MK2_LED_SYSEX)
+			else:
+				self._frame.set_rapid_update([matrix.get_button(column, row) for row in range(8) for column in range(8)] + side_buttons + top_buttons)
 			self._osd = M4LInterface()
 			self._osd.name = "OSD"
 			self._init_note_repeat()
@@ -185,6 +219,8 @@ class Launchpad(ControlSurface):
 				self.log_message("LaunchPad95 (classic) Loaded !")
 				
 	def disconnect(self):
+		self._frame.flush()
+		self._frame.enabled = False
 		self._suppress_send_midi = True
 		for control in self.controls:
 			if isinstance(control, ConfigurableButtonElement):
@@ -213,6 +249,16 @@ class Launchpad(ControlSurface):
 		if self._user_byte_write_button != None:
 			self._user_byte_write_button.send_value(0)
 			self._user_byte_write_button = None
+		if instrumentation != None:
+			try:
+				instrumentation.dump()
+			except (IOError, OSError):
+				pass
+		for line in self._midi_meter.summary_lines():
+			log(line)
+		log("midi map: %d rebuilds, %d requests dropped" % (self.midi_map_rebuilds, self.midi_map_requests_dropped))
+		# lines still queued are written before the log writer thread is stopped
+		stop_log()
 
 	def _combine_active_instances():
 		support_devices = False
@@ -246,9 +292,11 @@ class Launchpad(ControlSurface):
 			Launchpad._combine_active_instances()
 
 	def refresh_state(self):
+		self._frame.invalidate()
 		ControlSurface.refresh_state(self)
 		self.schedule_message(5, self._update_hardware)
 
+	@timed("Launchpad.handle_sysex")
 	def handle_sysex(self, midi_bytes):
 		if len(midi_bytes) >= 10 and midi_bytes[:8] == (240, 126, 0, 6, 2, 0, 32, 41): #0,32,41=novation
 			if len(midi_bytes) >= 12 and midi_bytes[8:10] == (19,1):
@@ -301,27 +349,129 @@ class Launchpad(ControlSurface):
 			ControlSurface.handle_sysex(self,midi_bytes)
 		
 
+	@timed("Launchpad.build_midi_map")
 	def build_midi_map(self, midi_map_handle):
 		ControlSurface.build_midi_map(self, midi_map_handle)
-		if self._selector!=None:
-			if self._selector._main_mode_index==1:
-				mode = Settings.USER_MODES_1[self._selector._sub_mode_list[self._selector._main_mode_index] ]
-				if mode != "instrument":
-					new_channel = self._selector.channel_for_current_mode()
-					for note in self._drum_notes:
-						self._translate_message(MIDI_NOTE_TYPE, note, 0, note, new_channel)
-			elif self._selector._main_mode_index==2:
-				mode = Settings.USER_MODES_2[self._selector._sub_mode_list[self._selector._main_mode_index] ] 
-				#self._selector.mode_index == 1:
-				#if self._selector._sub_mode_list[self._selector._mode_index] > 0:  # disable midi map rebuild for instrument mode to prevent light feedback errors
+		drum_routing = self._drum_routing()
+		if drum_routing != None:
+			translations = self._drum_translations.get(drum_routing)
+			if translations == None:
+				translations = tuple((MIDI_NOTE_TYPE, note, 0, note, drum_routing[1]) for note in self._drum_notes)
+				self._drum_translations[drum_routing] = translations
+			for translation in translations:
+				self._translate_message(*translation)
+		self._built_routing = self._midi_map_routing()
+		self.midi_map_rebuilds += 1
+		if instrumentation != None:
+			instrumentation.count("midi map rebuilds")
+
+	def _drum_routing(self):
+		# (mode, channel) the drum notes are translated to: in the user mode 1 modes, except for the instrument
+		if self._selector != None and self._selector._main_mode_index == 1:
+			mode = Settings.USER_MODES_1[self._selector._sub_mode_list[self._selector._main_mode_index]]
+			if mode != "instrument":
+				return (mode, self._selector.channel_for_current_mode())
+		return None
 
+	def set_feedback_channels(self, channels):
+		self._feedback_channels = tuple(channels)
+		ControlSurface.set_feedback_channels(self, channels)
+
+	def set_feedback_velocity(self, velocity):
+		self._feedback_velocity = velocity
+		self._c_instance.set_feedback_velocity(velocity)
+
+	def set_controlled_track(self, track):
+		self._controlled_track = track
+		ControlSurface.set_controlled_track(self, track)
+
+	def release_controlled_track(self):
+		self._controlled_track = None
+		ControlSurface.release_controlled_track(self)
+
+	def _midi_map_routing(self):
+		# what build_midi_map installs: the drum note translations, the feedback channels, velocity and track
+		# set through c_instance, and each control's message, parameter and forwarding. Controls without a
+		# message, like the button sliders, install nothing
+		routing = [self._drum_routing(), self._feedback_channels, self._feedback_velocity, self._controlled_track]
+		for control in self.controls:
+			if isinstance(control, InputControlElement) and control.message_type() != MIDI_INVALID_TYPE:
+				routing.append((control, control.message_channel(), control.message_identifier(), control.message_map_mode(), control.mapped_parameter(), control.script_wants_forwarding()))
+		return routing
 
+	def request_rebuild_midi_map(self):
+		if self._rebuild_actions == None:
+			self._rebuild_actions = set()
+		if instrumentation != None:
+			self._rebuild_actions.add(instrumentation.action or "other")
+		if self._guard_depth == 0:
+			self._flush_rebuild_request()
+
+	def _flush_rebuild_request(self):
+		# the request is dropped when the midi map would route the same as the one built last
+		actions, self._rebuild_actions = self._rebuild_actions, None
+		if actions == None:
+			return
+		if self._midi_map_routing() != self._built_routing:
+			ControlSurface.request_rebuild_midi_map(self)
+			counter = "midi map rebuild requests: "
+		else:
+			self.midi_map_requests_dropped += 1
+			counter = "midi map rebuild requests dropped: "
+		if instrumentation != None:
+			for action in actions:
+				instrumentation.count(counter + action)
+
+	def update_display(self):
+		if instrumentation != None:
+			instrumentation.end_tick()
+			if setting("INSTRUMENTATION__SHOW_ON_OSD") and self._osd != None and instrumentation.ticks % 10 == 0:
+				instrumentation.show_on_osd(self._osd)
+		self._update_display()
+
+	@timed("Launchpad.update_display")
+	def _update_display(self):
+		ControlSurface.update_display(self)
+		if self._osd != None:
+			self._osd.publish()
+		# pads the rate limiter deferred
+		self._frame.flush()
+		self._midi_meter.tick()
+
+	@contextmanager
+	def component_guard(self):
+		with ControlSurface.component_guard(self):
+			self._frame.begin_frame()
+			self._guard_depth += 1
+			try:
+				yield
+			finally:
+				self._guard_depth -= 1
+				if self._guard_depth == 0:
+					self._flush_rebuild_request()
+				self._frame.end_frame()
+
+	@timed("Launchpad._send_midi")
 	def _send_midi(self, midi_bytes, optimized=None):
 		sent_successfully = False
 		if not self._suppress_send_midi:
+			if self._frame.send(midi_bytes):
+				return True
 			sent_successfully = ControlSurface._send_midi(self, midi_bytes, optimized=optimized)
+			self._midi_sent(midi_bytes)
 		return sent_successfully
 
+	def _send_frame_midi(self, midi_bytes):
+		# not optimized: config, rapid update and pad messages have to reach the device in order
+		self._midi_sent(midi_bytes)
+		return ControlSurface._send_midi(self, midi_bytes, optimized=False)
+
+	def _midi_sent(self, midi_bytes):
+		# optimized sends made in a component guard are counted even if the guard drops them as duplicates
+		self._midi_meter.count(self._frame.source_of(midi_bytes), len(midi_bytes))
+		if self._frame.limiter != None:
+			self._frame.limiter.take()
+
 	def _update_hardware(self):
 		self._suppress_send_midi = False
 		if self._user_byte_write_button != None:
@@ -351,6 +501,7 @@ class Launchpad(ControlSurface):
 			self._control_is_with_automap = not enabled
 			self._suppress_send_midi = self._control_is_with_automap
 			if not self._control_is_with_automap:
+				self._frame.invalidate()
 				for control in self.controls:
 					if isinstance(control, ConfigurableButtonElement):
 						control.force_next_send()
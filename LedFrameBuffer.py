@@ -0,0 +1,260 @@
+import threading
+
+NOTE_ON_STATUS = 144
+NOTE_OFF_STATUS = 128
+CC_STATUS = 176
+
+# multi LED sysex of the RGB models, in programmer/session layout the LED index is the note or CC number:
+# (header, bytes sent before each led/colour pair)
+MK2_LED_SYSEX = ((240, 0, 32, 41, 2, 24, 10), ())
+MK3_LED_SYSEX = ((240, 0, 32, 41, 2, 13, 3), (0, ))
+LPX_LED_SYSEX = ((240, 0, 32, 41, 2, 12, 3), (0, ))
+MAX_LEDS_PER_SYSEX = 80
+# below this many static colour changes, single messages are cheaper
+MIN_LEDS_PER_SYSEX = 3
+
+# the original Launchpad (MK1/S/Mini) is configured with CC 0 on channel 0: 1 and 2 select the grid
+# layout and restart the rapid update cursor, 0x20 + copy (16) + flash (8) + update (4) + display (1)
+# select the double buffering mode
+CONFIG_CC = 0
+LAYOUTS = (1, 2)
+BUFFER_MODE_MIN = 32
+BUFFER_MODE_MAX = 61
+SHOW_BUFFER_0 = 32
+DRAW_BUFFER_1 = 36
+SHOW_BUFFER_1_AND_COPY = 49
+# rapid update: two LED velocities per note on channel 3, grid row by row, then side and top buttons
+RAPID_UPDATE_STATUS = 146
+# MK1 velocity: colour bits and the copy (4) / clear (8) flags; flashing LEDs only have clear set
+MK1_COLOUR_MASK = 51
+MK1_FLAGS_MASK = 12
+MK1_FLASHING = 8
+# a rapid update repaint: the 40 rapid update messages and the 4 config messages around them
+REPAINT_MESSAGES = 44
+
+
+def led_sysex(led_format, leds):
+	# one sysex per MAX_LEDS_PER_SYSEX (led, colour) pairs
+	header, prefix = led_format
+	messages = []
+	for start in range(0, len(leds), MAX_LEDS_PER_SYSEX):
+		body = []
+		for led, colour in leds[start:start + MAX_LEDS_PER_SYSEX]:
+			body.extend(prefix)
+			body.append(led)
+			body.append(colour)
+		messages.append(header + tuple(body) + (247, ))
+	return messages
+
+
+def pad_address(midi_bytes):
+	# (status without channel, identifier); note offs light the same pad as note ons
+	status = midi_bytes[0] & 240
+	if status == NOTE_OFF_STATUS:
+		status = NOTE_ON_STATUS
+	return (status, midi_bytes[1])
+
+
+class LedFrameBuffer(object):
+	""" Collects the LED messages of the matrix, side and top buttons and sends, once per frame,
+	only the pads whose state differs from what was last sent to the hardware.
+	A pad's state is its channel 0 (static) message followed by the flash and pulse messages
+	sent on other channels since.
+	With a limiter (a TokenBucket), low priority pads that do not fit in the tokens left stay pending
+	and are sent by a later flush, with whatever changed on them meanwhile """
+
+	def __init__(self, send_midi):
+		self._send_midi = send_midi
+		self._lock = threading.RLock()
+		self._pads = set()
+		self._sources = {}
+		self._low_priority = set()
+		self._sent = {}
+		self._pending = {}
+		self._order = []
+		self._depth = 0
+		self._led_format = None
+		self._rapid_order = None
+		self._layout = LAYOUTS[0]
+		self._buffer_mode = SHOW_BUFFER_0
+		self.enabled = True
+		self.limiter = None
+		self.messages_sent = 0
+		self.messages_dropped = 0
+		self.messages_deferred = 0
+
+	def add_buttons(self, buttons, source=None, low_priority=False):
+		# source names the buttons in source_of, low priority pads are the ones the limiter defers
+		for button in buttons:
+			status = CC_STATUS if button.message_type() == 1 else NOTE_ON_STATUS
+			pad = (status, button._original_identifier)
+			self._pads.add(pad)
+			self._sources[pad] = source
+			if low_priority:
+				self._low_priority.add(pad)
+
+	def source_of(self, midi_bytes):
+		# what a message sent to the device is for: a button group, "sysex", "config", "rapid update" or "other"
+		status = midi_bytes[0]
+		if status == 240:
+			return "sysex"
+		if len(midi_bytes) != 3:
+			return "other"
+		if status == CC_STATUS and midi_bytes[1] == CONFIG_CC:
+			return "config"
+		if status == RAPID_UPDATE_STATUS and self._rapid_order is not None:
+			return "rapid update"
+		return self._sources.get(pad_address(midi_bytes)) or "other"
+
+	def set_led_format(self, led_format):
+		# static colours of a frame are sent as multi LED sysex on models that have it
+		self._led_format = led_format
+
+	def set_rapid_update(self, buttons):
+		# full repaints are drawn into the hidden buffer with rapid updates, in the order of the given buttons
+		self._rapid_order = []
+		for button in buttons:
+			status = CC_STATUS if button.message_type() == 1 else NOTE_ON_STATUS
+			self._rapid_order.append((status, button._original_identifier))
+
+	def invalidate(self):
+		# the hardware state is unknown, e.g. after sends were suppressed: resend everything
+		with self._lock:
+			self._sent = {}
+
+	def begin_frame(self):
+		with self._lock:
+			self._depth += 1
+
+	def end_frame(self):
+		with self._lock:
+			self._depth -= 1
+			if self._depth <= 0:
+				self._depth = 0
+				self.flush()
+
+	def send(self, midi_bytes):
+		# returns False for messages the frame does not handle; they are to be sent by the caller,
+		# after the pending pads so the order on the wire is kept
+		with self._lock:
+			if not self.enabled or len(midi_bytes) != 3 or midi_bytes[0] == 240 or midi_bytes[0] & 240 not in (NOTE_ON_STATUS, NOTE_OFF_STATUS, CC_STATUS):
+				self.flush()
+				return False
+			if midi_bytes[0] == CC_STATUS and midi_bytes[1] == CONFIG_CC:
+				self.flush()
+				self._config_sent(midi_bytes[2])
+				return False
+			pad = pad_address(midi_bytes)
+			if pad not in self._pads:
+				self.flush()
+				return False
+			state = self._pending.get(pad)
+			if state is None:
+				state = list(self._sent.get(pad, ()))
+				self._order.append(pad)
+			channel = midi_bytes[0] & 15
+			if channel == 0:
+				state = [midi_bytes]
+			else:
+				state = [message for message in state if message[0] & 15 != channel] + [midi_bytes]
+			self._pending[pad] = state
+			if self._depth == 0:
+				self.flush()
+			return True
+
+	def flush(self):
+		with self._lock:
+			if not self._pending:
+				return
+			pending, order = self._pending, self._order
+			self._pending = {}
+			self._order = []
+			changes = []
+			count = 0
+			for pad in order:
+				state = tuple(pending[pad])
+				sent = self._sent.get(pad, ())
+				if state == sent:
+					self.messages_dropped += 1
+					continue
+				if state[:1] == sent[:1] and len(state) >= len(sent):
+					# same static color: only the flash/pulse messages that changed
+					messages = [message for index, message in enumerate(state) if index >= len(sent) or sent[index] != message]
+				else:
+					messages = state
+				changes.append((pad, state, messages))
+				count += len(messages)
+			if self.limiter is not None:
+				tokens = self.limiter.available()
+				repaint = self._rapid_order is not None and count > len(self._rapid_order) // 2
+				if count > tokens and not (repaint and tokens >= REPAINT_MESSAGES):
+					changes = self._defer(changes, tokens)
+			to_send = []
+			for pad, state, messages in changes:
+				to_send.extend(messages)
+				self._sent[pad] = state
+			if self._rapid_order is not None and len(to_send) > len(self._rapid_order) // 2:
+				repaint = self._repaint_messages()
+				if len(repaint) < len(to_send):
+					to_send = repaint
+			self._send_messages(to_send)
+
+	def _defer(self, changes, tokens):
+		# keeps the low priority pads that do not fit, and every one after the first of them, pending
+		taken = []
+		deferring = False
+		for change in changes:
+			pad, state, messages = change
+			if pad in self._low_priority and (deferring or len(messages) > tokens):
+				deferring = True
+				self._pending[pad] = list(state)
+				self._order.append(pad)
+				self.messages_deferred += 1
+				continue
+			taken.append(change)
+			tokens -= len(messages)
+		return taken
+
+	def _config_sent(self, value):
+		# remember what the rapid update repaint has to restore
+		if value == 0:
+			self._layout = LAYOUTS[0]
+			self._buffer_mode = SHOW_BUFFER_0
+		elif value in LAYOUTS:
+			self._layout = value
+		elif BUFFER_MODE_MIN <= value <= BUFFER_MODE_MAX:
+			self._buffer_mode = value
+
+	def _repaint_messages(self):
+		# the whole frame is written to buffer 1 while buffer 0 is shown, then shown with a single flip
+		# that also copies it to buffer 0. flashing LEDs are sent again on their own afterwards
+		values = []
+		after_flip = []
+		for pad in self._rapid_order:
+			state = self._sent.get(pad, ())
+			value = 0
+			if state and state[0][0] & 15 == 0:
+				if state[0][0] & 240 != NOTE_OFF_STATUS:
+					value = state[0][2]
+				if value & MK1_FLAGS_MASK == MK1_FLASHING:
+					after_flip.append(state[0])
+				after_flip.extend(state[1:])
+			else:
+				after_flip.extend(state)
+			values.append(value & MK1_COLOUR_MASK)
+		messages = [(CC_STATUS, CONFIG_CC, self._layout), (CC_STATUS, CONFIG_CC, DRAW_BUFFER_1)]
+		messages.extend((RAPID_UPDATE_STATUS, values[index], values[index + 1]) for index in range(0, len(values) - 1, 2))
+		messages.append((CC_STATUS, CONFIG_CC, SHOW_BUFFER_1_AND_COPY))
+		messages.append((CC_STATUS, CONFIG_CC, self._buffer_mode))
+		return messages + after_flip
+
+	def _send_messages(self, messages):
+		if self._led_format is not None:
+			static = [message for message in messages if message[0] & 15 == 0]
+			if len(static) >= MIN_LEDS_PER_SYSEX:
+				# a pad's static colour goes before its flash/pulse messages, as the sysex is sent first
+				leds = [(message[1], message[2] if message[0] & 240 != NOTE_OFF_STATUS else 0) for message in static]
+				messages = led_sysex(self._led_format, leds) + [message for message in messages if message[0] & 15 != 0]
+		for message in messages:
+			self._send_midi(message)
+		self.messages_sent += len(messages)
@@ -1,10 +1,192 @@
 import os
+import threading
+import time
+try:
+    import Queue as queue
+except ImportError:
+    import queue
 from .Settings import Settings
+from .SettingDefaults import setting
 
 USER_HOME = os.path.expanduser('~')
 LOG_DIRECTORY = USER_HOME+"/Documents/Ableton/User Library/Remote Scripts"
 LOG_FILE = LOG_DIRECTORY + "/log.txt"
 
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+LEVEL_NAMES = dict((level, name) for name, level in LEVELS.items())
+# above every level: nothing is logged
+OFF = 100
+
+# lines written per batch at most
+BATCH_SIZE = 256
+
+
+def _level(name):
+    if not Settings.LOGGING:
+        return OFF
+    return LEVELS.get(setting("LOG_MODULE_LEVELS").get(name, setting("LOG_LEVEL")), DEBUG)
+
+
+class LogWriter(object):
+    """ Writes queued log lines to the log file from a background thread, a batch at a time,
+    and rotates the file when it grows past Settings.LOG_MAX_BYTES """
+
+    def __init__(self, path):
+        self._path = path
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._file = None
+        self._line = 0
+
+    def put(self, record):
+        if self._thread is None:
+            self._start()
+        self._queue.put(record)
+
+    def flush(self, timeout=1.0):
+        # waits until the lines queued so far are written
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def stop(self, timeout=1.0):
+        # writes the lines queued so far, closes the file and ends the thread. a later put starts a new one
+        with self._start_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(None)
+            thread.join(timeout)
+            self._thread = None
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="LogWriter")
+                thread.daemon = True
+                thread.start()
+                self._thread = thread
+
+    def _run(self):
+        # None in the queue stops the thread
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < BATCH_SIZE and batch[-1] is not None:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if batch[-1] is None:
+                batch.pop()
+                stopping = True
+            try:
+                self._write(batch)
+            except (IOError, OSError):
+                self._file = None
+        try:
+            if self._file is not None:
+                self._file.close()
+        except (IOError, OSError):
+            pass
+        self._file = None
+
+    def _write(self, batch):
+        if self._file is None:
+            self._file = open(self._path, 'a')
+        for record in batch:
+            if isinstance(record, threading.Event):
+                self._file.flush()
+                record.set()
+                continue
+            try:
+                line = self._format(record)
+            except Exception:
+                line = "log: message could not be formatted\n"
+            self._file.write(line)
+        self._file.flush()
+        if self._file.tell() > setting("LOG_MAX_BYTES"):
+            self._rotate()
+
+    def _format(self, record):
+        created, thread_name, name, level, message = record
+        if level is None:
+            return str(message) + '\n'
+        if type(message) == list:
+            message = '\n'.join(message)
+        line = self._line
+        self._line += 1
+        source = thread_name if name is None else thread_name + ' ' + name
+        return "%d %s %s %s: %s\n" % (line, time.strftime("%H:%M:%S", time.localtime(created)), LEVEL_NAMES[level], source, message)
+
+    def _rotate(self):
+        # log.txt -> log.txt.1 -> log.txt.2 ..., the oldest is dropped. without backups log.txt starts over
+        backups = setting("LOG_BACKUPS")
+        if backups <= 0:
+            self._file.seek(0)
+            self._file.truncate()
+            return
+        self._file.close()
+        self._file = None
+        for index in range(backups, 0, -1):
+            source = self._path if index == 1 else self._path + "." + str(index - 1)
+            if os.path.exists(source):
+                target = self._path + "." + str(index)
+                if os.path.exists(target):
+                    os.remove(target)
+                os.rename(source, target)
+
+
+_writer = LogWriter(LOG_FILE)
+
+
+class Logger(object):
+    """ Logs for one module. Calls below the module's level return after one comparison,
+    the message is only formatted on the writer thread. Calling the logger logs at INFO """
+
+    def __init__(self, name):
+        self.name = name
+        self.level = _level(name)
+
+    def is_enabled_for(self, level):
+        return level >= self.level
+
+    def log(self, level, message):
+        if level >= self.level:
+            _writer.put((time.time(), threading.current_thread().name, self.name, level, message))
+
+    def __call__(self, message):
+        if INFO >= self.level:
+            _writer.put((time.time(), threading.current_thread().name, self.name, INFO, message))
+
+    def debug(self, message):
+        if DEBUG >= self.level:
+            _writer.put((time.time(), threading.current_thread().name, self.name, DEBUG, message))
+
+    def info(self, message):
+        self(message)
+
+    def warning(self, message):
+        self.log(WARNING, message)
+
+    def error(self, message):
+        self.log(ERROR, message)
+
+
+def get_logger(name):
+    # one logger per module: get_logger(__name__). Settings.LOG_MODULE_LEVELS is keyed by the module name
+    return Logger(name.rsplit('.', 1)[-1])
+
+
+_root_level = _level(None)
+
 if Settings.LOGGING:
     try:
         os.makedirs(LOG_DIRECTORY, exist_ok=True)
@@ -13,17 +195,19 @@ if Settings.LOGGING:
             os.makedirs(LOG_DIRECTORY)
         except OSError:
             pass
-            
-    with open(LOG_FILE, 'a') as f:
-        f.write('====================\n')
 
-log_num = 0
+    _writer.put((time.time(), None, None, None, '===================='))
+
 
 def log(message):
-    global log_num
-    if Settings.LOGGING:
-        with open(LOG_FILE, 'a') as f:
-            if type(message) == list:
-                message = '\n'.join(message)
-            f.write(str(log_num) + ' ' + str(message) + '\n')
-        log_num += 1
\ No newline at end of file
+    if INFO >= _root_level:
+        _writer.put((time.time(), threading.current_thread().name, None, INFO, message))
+
+
+def flush_log():
+    _writer.flush()
+
+
+def stop_log():
+    # at disconnect: the queued lines are written and the writer thread ends
+    _writer.stop()
@@ -2,6 +2,8 @@ import time
 
 from _Framework.ButtonElement import ButtonElement
 from _Framework.ControlSurfaceComponent import ControlSurfaceComponent
+from .NoteWriter import write_note_changes
+from .Instrumentation import timed
 
 STEPSEQ_MODE_MULTINOTE = 2
 class LoopSelectorComponent(ControlSurfaceComponent):
@@ -195,6 +197,7 @@ class LoopSelectorComponent(ControlSurfaceComponent):
             self._step_sequencer.set_page(self._block)
 
     # Iterates refreshing all loop selector buttons (called from playing position listener) OK
+    @timed("LoopSelectorComponent.update")
     def update(self):
         if self.is_enabled():
             self._get_clip_loop()  # gets the loop start/end values from the clip -> self._loop_start & self._loop_end
@@ -271,43 +274,36 @@ class LoopSelectorComponent(ControlSurfaceComponent):
                                       clone_start_point + clone_length,
                                       old_loop_end)
 
-    # Does the note by note copy OK
+    # Copies the notes starting in [start, end) to new_start OK
     def _copy_notes_in_range(self, start, end, new_start):
-        new_notes = list(self._note_cache)
-        # for i in range()
-        for note in new_notes:
-            if note[1] >= start and note[1] < end:
-                new_notes.append(
-                    [note[0], note[1] + new_start - start, note[2], note[3],
-                     note[4]])
-        self._clip.select_all_notes()
-        self._clip.replace_selected_notes(tuple(new_notes))
+        first, last = self._note_cache.time_range(start, end)
+        copies = []
+        for note in self._note_cache.by_time[first:last]:
+            # copies landing in the range are copied again: the range repeats up to its end
+            time = note[1]
+            while time >= start and time < end:
+                time = time + new_start - start
+                copies.append([note[0], time, note[2], note[3], note[4]])
+        if copies:
+            write_note_changes(self._clip, added=copies)
 
     # Checks if a range is empty OK
     def _no_notes_in_range(self, start, end, or_after):
-        for note in list(self._note_cache):
-            if note[1] >= start and (note[1] < end or or_after):
-                return (False)
-        return (True)
+        first, last = self._note_cache.time_range(start, None if or_after else end)
+        return first == last
 
     # Deletes a block of notes OK
     def _delete_notes_in_range(self, start, end):
-        new_notes = list()
-        for note in list(self._note_cache):
-            if note[1] < start or note[1] >= end:
-                new_notes.append(note)
-        self._clip.select_all_notes()
-        self._clip.replace_selected_notes(tuple(new_notes))
+        first, last = self._note_cache.time_range(start, end)
+        if first < last:
+            write_note_changes(self._clip, removed=self._note_cache.by_time[first:last])
 
     # Mutes a block of notes OK
     def _mute_notes_in_range(self, start, end):
-        new_notes = list()
-        for note in list(
-            self._note_cache):  # Note -> tuple containing pitch, time, duration, velocity, and mute
-            if note[1] < start or note[1] >= end:  # Note time
-                new_notes.append(note)
-            else:
-                new_notes.append([note[0], note[1], note[2], note[3],
-                                  not note[4]])  # Negate mute state
-        self._clip.select_all_notes()
-        self._clip.replace_selected_notes(tuple(new_notes))
+        first, last = self._note_cache.time_range(start, end)
+        if first < last:
+            notes = self._note_cache.by_time
+            pitches, times, durations, velocities, mutes = self._note_cache.columns
+            # Note -> tuple containing pitch, time, duration, velocity, and mute
+            toggled = [list(note) for note in zip(pitches[first:last], times[first:last], durations[first:last], velocities[first:last], [not mute for mute in mutes[first:last]])]
+            write_note_changes(self._clip, modified=list(zip(notes[first:last], toggled)))
@@ -1,26 +1,111 @@
+import threading
+from contextlib import contextmanager
 from _Framework.ControlSurfaceComponent import ControlSurfaceComponent
 
+
+class OSDFrame(object):
+	""" One published state of the OSD. Frames and their lists are never changed, a new one with the next version replaces it """
+	__slots__ = ('version', 'mode', 'info', 'attributes', 'attribute_names')
+
+	def __init__(self, version, mode, info, attributes, attribute_names):
+		self.version = version
+		self.mode = mode
+		self.info = info
+		self.attributes = attributes
+		self.attribute_names = attribute_names
+
+	def content(self):
+		return (self.mode, self.info, self.attributes, self.attribute_names)
+
+
 class M4LInterface(ControlSurfaceComponent):
+	"""
+	OSD read by the M4L device. Components write the draft through the setters,
+	from any thread; publish() turns the draft into a new OSDFrame once per display tick.
+	mode, info, attributes and attribute_names are read from the last published frame, as the
+	lists the M4L device has always received; frame gives all of them at once, with its version.
+	draft_mode is the mode of the draft.
+	"""
 
 	def __init__(self):
 		ControlSurfaceComponent.__init__(self)
 		self._name = 'OSD'
 		self._update_listener = None
 		self._updateML_listener = None
-		self.mode = ' '
+		self._lock = threading.RLock()
+		self._mode = ' '
+		self._dirty = False
+		self._frame = OSDFrame(0, ' ', [' ', ' '], [' '] * 8, [' '] * 8)
+		self._notified_version = -1
+		self.publish_count = 0
 		self.clear()
 
 	def disconnect(self):
 		self._updateM4L_listener = None
 
+	@contextmanager
+	def edit(self):
+		# groups writes made outside of the main thread, so no frame is published half way
+		with self._lock:
+			yield self
+
 	def set_mode(self, mode):
-		self.clear()
-		self.mode = mode
+		with self._lock:
+			self.clear()
+			self._mode = mode
 
 	def clear(self):
-		self.info = [' ', ' ']
-		self.attributes = [' ' for _ in range(8)]
-		self.attribute_names = [' ' for _ in range(8)]
+		with self._lock:
+			self._info = [' ', ' ']
+			self._attributes = [' ' for _ in range(8)]
+			self._attribute_names = [' ' for _ in range(8)]
+
+	def set_info(self, index, text):
+		with self._lock:
+			self._info[index] = text
+
+	def set_attribute(self, index, value):
+		with self._lock:
+			self._attributes[index] = value
+
+	def set_attribute_name(self, index, name):
+		with self._lock:
+			self._attribute_names[index] = name
+
+	@property
+	def frame(self):
+		return self._frame
+
+	@property
+	def version(self):
+		return self._frame.version
+
+	@property
+	def mode(self):
+		return self._frame.mode
+
+	@property
+	def draft_mode(self):
+		# the mode the next frame will have. unlike set_mode, setting it keeps the draft's attributes
+		with self._lock:
+			return self._mode
+
+	@draft_mode.setter
+	def draft_mode(self, mode):
+		with self._lock:
+			self._mode = mode
+
+	@property
+	def info(self):
+		return self._frame.info
+
+	@property
+	def attributes(self):
+		return self._frame.attributes
+
+	@property
+	def attribute_names(self):
+		return self._frame.attribute_names
 
 	def set_update_listener(self, listener):
 		self._update_listener = listener
@@ -37,9 +122,11 @@ class M4LInterface(ControlSurfaceComponent):
 
 	def set_updateML_listener(self, listener):
 		self._updateML_listener = listener
+		self._notified_version = -1
 
 	def add_updateML_listener(self, listener):
 		self._updateML_listener = listener
+		self._notified_version = -1
 		return
 
 	def remove_updateML_listener(self, listener):
@@ -50,5 +137,20 @@ class M4LInterface(ControlSurfaceComponent):
 		return self._updateML_listener is not None
 
 	def update(self, args=None):
-		if self.updateML_has_listener(None):
-			self._updateML_listener()
+		# only marks the OSD as changed, it is published on the next display tick
+		self._dirty = True
+
+	def publish(self):
+		# called once per display tick: publishes a new frame if the draft changed and notifies the M4L patch
+		if self._dirty:
+			self._dirty = False
+			with self._lock:
+				content = (self._mode, list(self._info), list(self._attributes), list(self._attribute_names))
+				if content != self._frame.content():
+					self._frame = OSDFrame(self._frame.version + 1, *content)
+		if self._frame.version == self._notified_version or not self.updateML_has_listener(None):
+			return False
+		self._notified_version = self._frame.version
+		self.publish_count += 1
+		self._updateML_listener()
+		return True
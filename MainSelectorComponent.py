@@ -15,11 +15,25 @@ from _Framework.SceneComponent import SceneComponent
 from .SpecialProSessionComponent import SpecialProSessionComponent
 import Live
 import time
+from .Instrumentation import timed, instrumentation
 try:
     from .Settings import Settings
 except ImportError:
     from .Settings import *
 
+# what each mode binds: (message, mode index, session (active, navigation enabled), component, double buffering config)
+MODES = {
+	"session": ("SESSION MODE", 0, (True, True), None, 40),
+	"mixer": ("MIXER MODE", 3, (False, True), "mixer", 40),
+	"instrument": ("INSTRUMENT MODE", 4, (False, False), "instrument", 40),
+	"device": ("DEVICE CONTROLLER MODE", 5, (False, False), "device", 32),
+	"drum stepseq": ("DRUM STEP SEQUENCER MODE", 6, (False, False), "stepseq", 32),
+	"melodic stepseq": ("MELODIC SEQUENCER MODE", 7, (False, False), "stepseq2", 32),
+	"user 1": ("USER 1 MODE", 1, (False, False), "user 1", 32),
+	"user 2": ("USER 2 MODE", 2, (False, False), "user 2", 32)}
+# the order components are released in when nothing is known about what is bound
+COMPONENTS = ("mixer", "device", "stepseq", "stepseq2", "instrument", "user 1", "user 2")
+
 class MainSelectorComponent(ModeSelectorComponent):
 
 	""" Class that reassigns the button on the launchpad to different functions """
@@ -112,6 +126,19 @@ class MainSelectorComponent(ModeSelectorComponent):
 		self._init_session()
 		self._all_buttons = tuple(self._all_buttons)
 
+		self._component_setups = {
+			"mixer": self._setup_mixer,
+			"device": self._setup_device_controller,
+			"stepseq": self._setup_step_sequencer,
+			"stepseq2": self._setup_step_sequencer2,
+			"instrument": self._setup_instrument_controller,
+			"user 1": self._setup_user_mode_1,
+			"user 2": self._setup_user_mode_2}
+		#what the last update bound, None when unknown
+		self._bound_mode = None
+		self._session_binding = None
+		self._config = {}
+
 	def disconnect(self):
 		for button in self._modes_buttons:
 			button.remove_value_listener(self._mode_value)
@@ -248,128 +275,73 @@ class MainSelectorComponent(ModeSelectorComponent):
 
 		return new_channel
 	
+	@timed("MainSelectorComponent.update")
 	def update(self):
 		assert (self._modes_buttons != None)
 		if self.is_enabled():
 
 			self._update_mode_buttons()
 
-			as_active = True
-			as_enabled = True
 			self._session.set_allow_update(False)
 			self._zooming.set_allow_update(False)
-			self._config_button.send_value(40) #Set LP double buffering mode (investigate this)
-			self._config_button.send_value(1) #Set LP X-Y layout grid mapping mode
-
-			if self._main_mode_index == 0:
-				# session
-				if(self._pro_session_on):
-					self._control_surface.show_message("PRO SESSION MODE")
-				else:
-					self._control_surface.show_message("SESSION MODE")
-				self._setup_mixer(not as_active)
-				self._setup_device_controller(not as_active)
-				self._setup_step_sequencer(not as_active)
-				self._setup_step_sequencer2(not as_active)
-				self._setup_instrument_controller(not as_active)
-				self._setup_session(as_active, as_enabled)
-				self._update_control_channels()
-				self._mode_index = 0
-
-			elif self._main_mode_index == 1:
-				self._setup_sub_mode(Settings.USER_MODES_1[self._sub_mode_list[self._main_mode_index]])
-			elif self._main_mode_index == 2:
-				self._setup_sub_mode(Settings.USER_MODES_2[self._sub_mode_list[self._main_mode_index]])
-
-			elif self._main_mode_index == 3:
-				# mixer
-				self._control_surface.show_message("MIXER MODE")
-				self._setup_device_controller(not as_active)
-				self._setup_step_sequencer(not as_active)
-				self._setup_step_sequencer2(not as_active)
-				self._setup_instrument_controller(not as_active)
-				self._setup_session(not as_active, as_enabled)
-				self._setup_mixer(as_active)
-				self._update_control_channels()
-				self._mode_index = 3
-			else:
-				assert False
-
+			self._apply_mode(self._current_mode_name())
 			self._session.set_allow_update(True)
 			self._zooming.set_allow_update(True)
-		
-	def _setup_sub_mode(self, mode):
-		as_active = True
-		as_enabled = True
-		if mode == "instrument":
-			self._control_surface.show_message("INSTRUMENT MODE")
-			self._setup_session(not as_active, not as_enabled)
-			self._setup_step_sequencer(not as_active)
-			self._setup_step_sequencer2(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_device_controller(not as_active)
-			self._update_control_channels()
-			self._setup_instrument_controller(as_active)
-			self._mode_index = 4
-		elif mode == "melodic stepseq":
-			self._control_surface.show_message("MELODIC SEQUENCER MODE")
-			self._setup_session(not as_active, not as_enabled)
-			self._setup_instrument_controller(not as_active)
-			self._setup_device_controller(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_step_sequencer(not as_active)
-			self._setup_step_sequencer2(as_active)
-			self._update_control_channels()
-			self._mode_index = 7
-		elif mode == "user 1":
-			self._control_surface.show_message("USER 1 MODE" )
-			self._setup_session(not as_active, not as_enabled)
-			self._setup_step_sequencer(not as_active)
-			self._setup_step_sequencer2(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_device_controller(not as_active)
-			self._setup_instrument_controller(not as_active)
-			self._setup_user_mode(True, True, False, True)
-			self._update_control_channels()
-			self._mode_index = 1
-			self._osd.clear()
-			self._osd.mode = "User 1"
-			self._osd.update()
-		elif mode == "drum stepseq":
-			self._control_surface.show_message("DRUM STEP SEQUENCER MODE")
-			self._setup_session(not as_active, not as_enabled)
-			self._setup_instrument_controller(not as_active)
-			self._setup_device_controller(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_step_sequencer2(not as_active)
-			self._setup_step_sequencer(as_active)
-			self._update_control_channels()
-			self._mode_index = 6
-		elif mode == "device":
-			self._control_surface.show_message("DEVICE CONTROLLER MODE")
-			self._setup_session(not as_active, not as_enabled)
-			self._setup_step_sequencer(not as_active)
-			self._setup_step_sequencer2(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_instrument_controller(not as_active)
-			self._setup_device_controller(as_active)
+		else:
+			#the device may be reset or used by someone else meanwhile: set up everything again once enabled
+			self._bound_mode = None
+			self._session_binding = None
+			self._config = {}
+
+	def _current_mode_name(self):
+		if self._main_mode_index == 0:
+			return "session"
+		elif self._main_mode_index == 1:
+			return Settings.USER_MODES_1[self._sub_mode_list[self._main_mode_index]]
+		elif self._main_mode_index == 2:
+			return Settings.USER_MODES_2[self._sub_mode_list[self._main_mode_index]]
+		elif self._main_mode_index == 3:
+			return "mixer"
+		assert False
+
+	def _apply_mode(self, name):
+		# only the component bound by the previous mode is released, the session buttons are only rebound when
+		# the session's state changes and the config messages are only sent when they change
+		message, mode_index, session, component, buffer_mode = MODES[name]
+		if name == "session" and self._pro_session_on:
+			message = "PRO SESSION MODE"
+		self._control_surface.show_message(message)
+		self._send_config(buffer_mode) #Set LP flashing mode, full repaints are double buffered by the LedFrameBuffer
+		self._send_config(1) #Set LP X-Y layout grid mapping mode
+
+		if self._bound_mode == None:
+			released = [other for other in COMPONENTS if other != component]
+		else:
+			previous = MODES[self._bound_mode][3]
+			released = [previous] if previous not in (None, component) else []
+		for other in released:
+			self._component_setups[other](False)
+		self._setup_session(*session)
+		if component == "instrument":
+			#the instrument controller sets the channels of its buttons itself
 			self._update_control_channels()
-			self._mode_index = 5
-		elif mode == "user 2":
-			self._control_surface.show_message("USER 2 MODE" )
-			self._setup_session(not as_active, not as_enabled)
-			self._setup_instrument_controller(not as_active)
-			self._setup_device_controller(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_step_sequencer(not as_active)
-			self._setup_step_sequencer2(not as_active)
-			self._setup_user_mode(False, False, False, False)
+			self._setup_instrument_controller(True)
+		else:
+			if component != None:
+				self._component_setups[component](True)
 			self._update_control_channels()
-			self._mode_index = 2
-			self._osd.clear()
-			self._osd.mode = "User 2"
-			self._osd.update()
-		
+		self._bound_mode = name
+		self._mode_index = mode_index
+		if instrumentation != None:
+			instrumentation.count("MainSelectorComponent.rebinds", len(released) + (component != None))
+
+	def _send_config(self, value):
+		# remembers the layout (1, 2) and double buffering (32 - 61) config values sent last
+		kind = value in (1, 2)
+		if self._config.get(kind) != value:
+			self._config[kind] = value
+			self._config_button.send_value(value)
+
 	def _setup_session(self, as_active, as_navigation_enabled):
 		assert isinstance(as_active, type(False))#assert is boolean
 		for button in self._nav_buttons:
@@ -381,7 +353,14 @@ class MainSelectorComponent(ModeSelectorComponent):
 		# matrix
 		self._activate_matrix(True)
 		self._turn_off_scene_buttons()
-		
+
+		binding = (as_active, as_navigation_enabled, self._pro_session_on)
+		if not as_active and binding == self._session_binding:
+			return #clip slots, scenes, zooming and navigation are released already
+		self._session_binding = binding
+		if instrumentation != None:
+			instrumentation.count("MainSelectorComponent.rebinds")
+
 		if (self._session.height() != self._matrix .height()) and (self._aux_scene != None):
 			self._session._scenes.append(self._aux_scene)
 		
@@ -488,7 +467,6 @@ class MainSelectorComponent(ModeSelectorComponent):
 				self._activate_matrix(True)
 				self._activate_navigation_buttons(True)
 				self._device_controller._is_active = True
-				self._config_button.send_value(32)
 				self._device_controller.set_enabled(True)
 				self._device_controller.update()
 			else:
@@ -516,8 +494,21 @@ class MainSelectorComponent(ModeSelectorComponent):
 			button.set_enabled((not release_nav_buttons)) #User1 & User2 enabled
 
 		if drum_rack_mode:#User1 enabled
-			self._config_button.send_value(2)#Set LP drum rack layout grid mapping mode
-		self._config_button.send_value(32)#Send enable flashing led config message to LP
+			self._send_config(2)#Set LP drum rack layout grid mapping mode
+
+	def _setup_user_mode_1(self, as_active):
+		if as_active:
+			self._setup_user_mode(True, True, False, True)
+			self._osd.clear()
+			self._osd.draft_mode = "User 1"
+			self._osd.update()
+
+	def _setup_user_mode_2(self, as_active):
+		if as_active:
+			self._setup_user_mode(False, False, False, False)
+			self._osd.clear()
+			self._osd.draft_mode = "User 2"
+			self._osd.update()
 				
 	def _setup_step_sequencer(self, as_active):
 		if(self._stepseq != None):
@@ -526,7 +517,6 @@ class MainSelectorComponent(ModeSelectorComponent):
 				self._activate_scene_buttons(True)
 				self._activate_matrix(True)
 				self._activate_navigation_buttons(True)
-				self._config_button.send_value(32)
 				self._stepseq.set_enabled(True)
 			else:
 				self._stepseq.set_enabled(False)
@@ -538,7 +528,6 @@ class MainSelectorComponent(ModeSelectorComponent):
 				self._activate_scene_buttons(True)
 				self._activate_matrix(True)
 				self._activate_navigation_buttons(True)
-				self._config_button.send_value(32)
 				self._stepseq2.set_enabled(True)
 			else:
 				self._stepseq2.set_enabled(False)
@@ -546,6 +535,7 @@ class MainSelectorComponent(ModeSelectorComponent):
 	def _setup_mixer(self, as_active):
 		assert isinstance(as_active, type(False))
 		if as_active:
+			self._session_binding = None #the mixer's sub modes bind session buttons too
 			self._activate_navigation_buttons(True)
 			self._activate_scene_buttons(True)
 			self._activate_matrix(True)
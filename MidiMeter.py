@@ -0,0 +1,70 @@
+import threading
+import time
+
+
+class MidiMeter(object):
+	""" Counts the MIDI messages and bytes sent to the device per source (matrix, side, top, sysex ...)
+	and measures the messages sent per second, updated once a second from the display tick.
+	Messages are also sent from the device strip threads, so the counters are updated under a lock """
+
+	def __init__(self, clock=time.time):
+		self._lock = threading.Lock()
+		self._clock = clock
+		self.messages = {}
+		self.bytes = {}
+		self.total_messages = 0
+		self.total_bytes = 0
+		self.rate = 0.0
+		self.peak_rate = 0.0
+		self._window_start = clock()
+		self._window_messages = 0
+
+	def count(self, source, length):
+		with self._lock:
+			self.messages[source] = self.messages.get(source, 0) + 1
+			self.bytes[source] = self.bytes.get(source, 0) + length
+			self.total_messages += 1
+			self.total_bytes += length
+
+	def tick(self):
+		with self._lock:
+			now = self._clock()
+			elapsed = now - self._window_start
+			if elapsed >= 1.0:
+				self.rate = (self.total_messages - self._window_messages) / elapsed
+				if self.rate > self.peak_rate:
+					self.peak_rate = self.rate
+				self._window_start = now
+				self._window_messages = self.total_messages
+
+	def summary_lines(self):
+		with self._lock:
+			lines = ["midi out: %d messages, %d bytes, %.0f/s, peak %.0f/s" % (self.total_messages, self.total_bytes, self.rate, self.peak_rate)]
+			for source, count in sorted(self.messages.items(), key=lambda item: -item[1]):
+				lines.append("  %-12s %8d messages %9d bytes" % (source, count, self.bytes[source]))
+		return lines
+
+
+class TokenBucket(object):
+	""" Allows rate messages per second on average and bursts of up to burst messages.
+	Safe to use from several threads """
+
+	def __init__(self, rate, burst, clock=time.time):
+		self._lock = threading.Lock()
+		self.rate = float(rate)
+		self.burst = burst
+		self.tokens = float(burst)
+		self._clock = clock
+		self._last = clock()
+
+	def available(self):
+		with self._lock:
+			now = self._clock()
+			self.tokens = min(self.burst, self.tokens + (now - self._last) * self.rate)
+			self._last = now
+			return self.tokens
+
+	def take(self, count=1):
+		# messages that cannot wait are taken anyway: the tokens go negative and later messages wait longer
+		with self._lock:
+			self.tokens -= count
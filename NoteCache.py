@@ -0,0 +1,145 @@
+from bisect import bisect_left, bisect_right
+from itertools import count
+from operator import itemgetter
+
+# a new version for every NoteCache: what is derived from a cache stays valid while its version is current
+_versions = count(1)
+
+
+class NoteCache(object):
+	""" Clip notes (pitch, time, duration, velocity, mute) as returned by get_selected_notes, indexed on demand
+	by step and page, and by time: sorted by start time, a time range of notes is a slice """
+
+	def __init__(self, notes=()):
+		self._notes = tuple(notes)
+		self.version = next(_versions)
+		self._grids = {}
+		self._bounds = None
+		self._by_time = None
+		self._columns = None
+		self._intervals = None
+
+	@property
+	def notes(self):
+		return self._notes
+
+	def __iter__(self):
+		return iter(self._notes)
+
+	def __len__(self):
+		return len(self._notes)
+
+	def __getitem__(self, index):
+		return self._notes[index]
+
+	def __eq__(self, other):
+		if isinstance(other, NoteCache):
+			return self._notes == other._notes
+		if other is None:
+			return False
+		return self._notes == tuple(other)
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	__hash__ = None
+
+	@property
+	def by_time(self):
+		# the notes sorted by start time, notes starting together in clip order
+		if self._by_time == None:
+			self._by_time = sorted(self._notes, key=itemgetter(1))
+		return self._by_time
+
+	@property
+	def columns(self):
+		# by_time as columns: (pitches, times, durations, velocities, mutes)
+		if self._columns == None:
+			if self._notes:
+				self._columns = tuple(list(column) for column in zip(*[note[:5] for note in self.by_time]))
+			else:
+				self._columns = ([], [], [], [], [])
+		return self._columns
+
+	def time_range(self, start, end=None):
+		# (first, last): the notes starting in [start, end) are by_time[first:last]. no end: up to the last note
+		times = self.columns[1]
+		first = bisect_left(times, start)
+		if end == None:
+			return first, len(times)
+		return first, max(first, bisect_left(times, end))
+
+	def pitches_playing_at(self, time):
+		# the pitches of the unmuted notes sounding at time (start <= time <= end)
+		if self._intervals == None:
+			# per pitch: the note starts in order, and the latest end of the notes started so far
+			self._intervals = {}
+			for note in self.by_time:
+				if not note[4]:
+					starts, ends = self._intervals.setdefault(note[0], ([], []))
+					end = note[1] + note[2]
+					starts.append(note[1])
+					ends.append(max(end, ends[-1]) if ends else end)
+		playing = set()
+		for pitch, (starts, ends) in self._intervals.items():
+			index = bisect_right(starts, time)
+			if index > 0 and ends[index - 1] >= time:
+				playing.add(pitch)
+		return playing
+
+	def playing_index(self, time):
+		# changes exactly when the unmuted notes sounding at time (start <= time <= end) do
+		if self._bounds == None:
+			notes = [note for note in self._notes if not note[4]]
+			self._bounds = (sorted(note[1] for note in notes), sorted(note[1] + note[2] for note in notes))
+		starts, ends = self._bounds
+		return (bisect_right(starts, time), bisect_left(ends, time))
+
+	def grid(self, step_length, steps_per_page):
+		# one grid per layout, built the first time that layout is drawn
+		key = (step_length, steps_per_page)
+		grid = self._grids.get(key)
+		if grid == None:
+			grid = NoteGrid(self._notes, step_length, steps_per_page)
+			self._grids[key] = grid
+		return grid
+
+
+class NoteGrid(object):
+	""" Notes bucketed by (pitch, step), by step and by page. Buckets keep the clip's note order """
+
+	def __init__(self, notes, step_length, steps_per_page):
+		self._step_length = step_length
+		self._steps_per_page = steps_per_page
+		self._by_pitch_step = {}
+		self._by_step = {}
+		self._by_page = {}
+		for note in notes:
+			step = int(note[1] / step_length)
+			page = int(step / float(steps_per_page))
+			self._by_pitch_step.setdefault((note[0], step), []).append(note)
+			self._by_step.setdefault(step, []).append(note)
+			self._by_page.setdefault(page, []).append(note)
+
+	@property
+	def step_length(self):
+		return self._step_length
+
+	@property
+	def steps_per_page(self):
+		return self._steps_per_page
+
+	def step(self, time):
+		return int(time / self._step_length)
+
+	def page(self, time):
+		return int(self.step(time) / float(self._steps_per_page))
+
+	def notes_at(self, pitch, step):
+		return self._by_pitch_step.get((pitch, step), ())
+
+	def notes_at_step(self, step):
+		return self._by_step.get(step, ())
+
+	def notes_in_page(self, page):
+		return self._by_page.get(page, ())
@@ -1,6 +1,18 @@
 from _Framework.ControlSurfaceComponent import ControlSurfaceComponent
 from _Framework.ButtonElement import ButtonElement
+from .NoteCache import NoteCache
+from .NoteWriter import ALL_TIME, change_found_notes, notes_at, write_note_changes
+from .SkinTable import color_id
 import time
+from .Instrumentation import timed
+
+# colors of the grid, by skin color id
+DISABLED_COLOR = color_id("DefaultButton.Disabled")
+METRONOME_COLOR = color_id("StepSequencer.NoteEditor.Metronome")
+PAGE_MARKER_COLOR = color_id("StepSequencer.NoteEditor.PageMarker")
+NOTE_MARKER_COLOR = color_id("StepSequencer.NoteEditor.NoteMarker")
+CURRENT_PAGE_MARKER_COLOR = color_id("StepSequencer.NoteEditor.CurrentPageMarker")
+CURRENT_PAGE_MARKER_PLAY_COLOR = color_id("StepSequencer.NoteEditor.CurrentPageMarkerPlay")
 
 class NoteEditorComponent(ControlSurfaceComponent):
 
@@ -15,18 +27,18 @@ class NoteEditorComponent(ControlSurfaceComponent):
 
 		# playback step indicator
 		self.display_metronome = True
-		self.metronome_color = "StepSequencer.NoteEditor.Metronome"
+		self.metronome_color = METRONOME_COLOR
 		
 		# playback page indicator
 		self._current_page = -1
 
 		# Velocity color map. this must remain of length 3. WHY???
 		self.velocity_map = [20, 50, 80, 105, 127]
-		self.velocity_color_map = [	"StepSequencer.NoteEditor.Velocity0", "StepSequencer.NoteEditor.Velocity1", "StepSequencer.NoteEditor.Velocity2", "StepSequencer.NoteEditor.Velocity3", "StepSequencer.NoteEditor.Velocity4"]
+		self.velocity_color_map = [color_id("StepSequencer.NoteEditor.Velocity" + str(index)) for index in range(5)]
 		
 		# other colors
-		self.muted_note_color = "StepSequencer.NoteEditor.Muted"
-		self.playing_note_color = "StepSequencer.NoteEditor.Playing"
+		self.muted_note_color = color_id("StepSequencer.NoteEditor.Muted")
+		self.playing_note_color = color_id("StepSequencer.NoteEditor.Playing")
 
 		#hold button for 500 ms
 		self.long_button_press = 0.500
@@ -54,6 +66,17 @@ class NoteEditorComponent(ControlSurfaceComponent):
 		# quantization
 		self._quantization = 16
 
+		# lookup tables of _update_matrix, see _geometry
+		self._geometry_key = None
+		self._pitch_rows = {}
+		self._step_cells = []
+		self._velocity_colors = []
+
+		# note colours of the displayed page and its neighbours, see _page_frame
+		self._page_frames = {}
+		self._page_frames_key = None
+		self._prerender_scheduled = False
+
 		# velocity
 		self._velocity_index = 3
 		self._velocity = self.velocity_map[self._velocity_index]
@@ -136,21 +159,15 @@ class NoteEditorComponent(ControlSurfaceComponent):
 		self._clip = clip
 
 	def set_note_cache(self, note_cache):
+		if note_cache != None and not isinstance(note_cache, NoteCache):
+			note_cache = NoteCache(note_cache)
 		self._note_cache = note_cache
 
 	def set_playhead(self, playhead): # Playing cursor
 		self._playhead = playhead
 		self._update_matrix()
 
-	def update_notes(self): # Deprecated ???
-		if self._clip != None:
-			self._clip.select_all_notes()
-			note_cache = self._clip.get_selected_notes()
-			self._clip.deselect_all_notes()
-			if self._clip_notes != note_cache:
-				self._clip_notes = note_cache
-		self._update_matrix()
-
+	@timed("NoteEditorComponent.update")
 	def update(self, force=False):
 		if self.is_enabled():
 			if force:
@@ -161,19 +178,19 @@ class NoteEditorComponent(ControlSurfaceComponent):
 	# Display the third amber column to show the current page in multinote mode OK
 	def _display_selected_page(self): # OK
 		for i in range(0, self._height):
-			self._grid_back_buffer[self._page % self.width][i] = "StepSequencer.NoteEditor.PageMarker"
+			self._grid_back_buffer[self._page % self.width][i] = PAGE_MARKER_COLOR
 		
 	# Displays 3 buttons for the root of the scale and 1 for the in scale notes 	
 	def _display_note_markers(self):# (out of scale notes buttons are dark) OK
 		for i in range(0, int(self.height / self.number_of_lines_per_note)):
 			if self._key_index_is_root_note[i]:
 				for j in range(0, self.number_of_lines_per_note):
-					self._grid_back_buffer[0][self.height - i * self.number_of_lines_per_note - j - 1] = "StepSequencer.NoteEditor.NoteMarker"
-					self._grid_back_buffer[1][self.height - i * self.number_of_lines_per_note - j - 1] = "StepSequencer.NoteEditor.NoteMarker"
-					self._grid_back_buffer[2][self.height - i * self.number_of_lines_per_note - j - 1] = "StepSequencer.NoteEditor.NoteMarker"
+					self._grid_back_buffer[0][self.height - i * self.number_of_lines_per_note - j - 1] = NOTE_MARKER_COLOR
+					self._grid_back_buffer[1][self.height - i * self.number_of_lines_per_note - j - 1] = NOTE_MARKER_COLOR
+					self._grid_back_buffer[2][self.height - i * self.number_of_lines_per_note - j - 1] = NOTE_MARKER_COLOR
 			elif self._key_index_is_in_scale[i]:
 				for j in range(0, self.number_of_lines_per_note):
-					self._grid_back_buffer[0][self.height - i * self.number_of_lines_per_note - j - 1] = "StepSequencer.NoteEditor.NoteMarker"
+					self._grid_back_buffer[0][self.height - i * self.number_of_lines_per_note - j - 1] = NOTE_MARKER_COLOR
 
 
 
@@ -201,20 +218,25 @@ class NoteEditorComponent(ControlSurfaceComponent):
 			# clear back buffer
 			for x in range(self.width):
 				for y in range(self.height):
-					self._grid_back_buffer[x][y] = "DefaultButton.Disabled"
+					self._grid_back_buffer[x][y] = DISABLED_COLOR
 
 			# update back buffer
 			if self._clip != None and self._note_cache != None:
 
+				steps_per_page = self._geometry()
+				pitch_rows = self._pitch_rows
+				step_cells = self._step_cells
+
 				# play back position
 				if self._playhead != None:
 					play_position = self._playhead  # position in beats (integer = number of beats, decimal subdivisions)
-					play_page = int(play_position / self.quantization / self.width / self.number_of_lines_per_note)
-					play_row = int(play_position / self.quantization / self.width) % self.number_of_lines_per_note
-					play_x_position = int(play_position / self.quantization) % self.width
-					play_y_position = int(play_position / self.quantization / self.width) % self.height
+					play_step = int(play_position / self.quantization)
+					play_page = play_step // steps_per_page
+					play_x_position, play_row = step_cells[play_step % steps_per_page]
+					play_y_position = (play_step // self.width) % self.height
 				else:
 					play_position = -1
+					play_step = -1
 					play_page = -1
 					play_row = -1
 					play_x_position = -1
@@ -222,7 +244,7 @@ class NoteEditorComponent(ControlSurfaceComponent):
 				# add play positition in amber
 				if(self.display_metronome):
 					if self._clip.is_playing and self.song().is_playing:
-						self._grid_back_buffer[play_x_position][play_y_position] = "StepSequencer.NoteEditor.Metronome"
+						self._grid_back_buffer[play_x_position][play_y_position] = METRONOME_COLOR
 
 				# Display the selected page
 				if(self._display_page):
@@ -240,66 +262,18 @@ class NoteEditorComponent(ControlSurfaceComponent):
 						self._current_page=play_page
 						self._display_current_page()
 
-				# display clip notes
-				for note in self._note_cache:
-					note_position = note[1] # decimal value of a beat (1=beat, same as playhead)
-					note_key = note[0]  # key: 0-127 MIDI note #
-					note_velocity = note[3] # velocity: 0-127 value #
-					note_muted = note[4]#Boolean
-					note_page = int(note_position / self.quantization / self.width / self.number_of_lines_per_note)
-					note_grid_x_position = int(note_position / self.quantization) % self.width
-					note_grid_y_position = int(note_position / self.quantization / self.width) % self.height
-
-					#Calculate note position in the grid (note position to matrix button logic)
-					if self.is_multinote:
-						# compute base note, taking into account number_of_lines_per_note
-						try:
-							note_idx = self.key_indexes.index(note_key)
-						except ValueError:
-							note_idx = -1
-						note_grid_y_base = note_idx * self.number_of_lines_per_note
-						if(note_grid_y_base >= 0):
-							note_grid_y_base = (7 - note_grid_y_base) - (self.number_of_lines_per_note - 1)
-						if(note_grid_y_base < 0):
-							note_grid_y_base = -1
-
-						note_grid_y_offset = int(note_position / self.quantization / self.width) % self.number_of_lines_per_note
-					else:
-						idx = 1
-						try:
-							idx = self.key_indexes.index(note_key)
-						except ValueError:
-							idx = -1
-						
-						if idx == 0:
-							note_grid_y_base = 0
-						else:
-							note_grid_y_base = -1
-					note_grid_y_offset = int(note_position / self.quantization / self.width) % self.number_of_lines_per_note
-
-					if note_grid_y_base != -1 and note_grid_y_base < self.height:
-						note_grid_y_position = note_grid_y_base + note_grid_y_offset
-					else:
-						note_grid_x_position = -1
-						note_grid_y_position = -1
-				
-					#Set note color
-					if (note_grid_x_position >= 0):
-						# compute colors
-						velocity_color = self.velocity_color_map[0]
-						for index in range(len(self.velocity_map)):
-							if note_velocity >= self.velocity_map[index]:
-								velocity_color = self.velocity_color_map[index]
-						# highligh playing notes in red. even if they are from other pages.
-						if not note_muted and note_page == play_page and play_x_position == note_grid_x_position and (play_y_position == note_grid_y_position and not self.is_multinote or self.is_multinote and note_grid_y_offset == play_row) and self.song().is_playing and self._clip.is_playing:
-							self._grid_back_buffer[note_grid_x_position][note_grid_y_position] = self.playing_note_color
-						elif note_page == self._page:  # if note is in current page, then update grid
-							# do not erase current note highlight
-							if self._grid_back_buffer[note_grid_x_position][note_grid_y_position] != self.playing_note_color:
-								if note_muted:
-									self._grid_back_buffer[note_grid_x_position][note_grid_y_position] = self.muted_note_color
-								else:
-									self._grid_back_buffer[note_grid_x_position][note_grid_y_position] = velocity_color
+				# display clip notes of the displayed page, then highlight the notes under the playhead in red,
+				# even if they are from other pages
+				for x, y, color in self._page_frame(self._page, steps_per_page):
+					self._grid_back_buffer[x][y] = color
+				if play_step != -1 and self.song().is_playing and self._clip.is_playing:
+					grid = self._note_cache.grid(self.quantization, steps_per_page)
+					for note in grid.notes_at_step(play_step):
+						note_grid_y_base = pitch_rows.get(note[0])
+						if note_grid_y_base != None and not note[4]:
+							note_grid_x_position, note_row = step_cells[play_step % steps_per_page]
+							self._grid_back_buffer[note_grid_x_position][note_grid_y_base + note_row] = self.playing_note_color
+				self._keep_page_frames()
 
 				#Display the column to show the page for half a second
 				if self._display_page:
@@ -315,6 +289,72 @@ class NoteEditorComponent(ControlSurfaceComponent):
 						self._matrix.get_button(x, y).set_light(self._grid_buffer[x][y])
 			self._force_update = False
 
+	def _geometry(self):
+		# rebuilds the lookup tables of _update_matrix when the layout changed, returns the steps per page:
+		#  _pitch_rows: pitch -> grid row of its first line, for the pitches shown
+		#  _step_cells: step within a page -> (x, line of the note it is on)
+		#  _velocity_colors: velocity -> color
+		key = (self.quantization, self.is_multinote, self.number_of_lines_per_note, self.width, self.height, tuple(self.key_indexes), tuple(self.velocity_map))
+		lines = self.number_of_lines_per_note
+		if key != self._geometry_key:
+			self._geometry_key = key
+			self._pitch_rows = {}
+			if self.is_multinote:
+				for index, pitch in enumerate(self.key_indexes):
+					# a pitch is drawn on the lines of its first key index only
+					if pitch not in self._pitch_rows:
+						self._pitch_rows[pitch] = 8 - (index + 1) * lines
+				for pitch, row in list(self._pitch_rows.items()):
+					if not 0 <= row < self.height:
+						del self._pitch_rows[pitch]
+			elif len(self.key_indexes) > 0:
+				self._pitch_rows[self.key_indexes[0]] = 0
+			self._step_cells = [(step % self.width, (step // self.width) % lines) for step in range(self.width * lines)]
+			self._velocity_colors = []
+			for velocity in range(128):
+				color = self.velocity_color_map[0]
+				for index in range(len(self.velocity_map)):
+					if velocity >= self.velocity_map[index]:
+						color = self.velocity_color_map[index]
+				self._velocity_colors.append(color)
+		return self.width * lines
+
+	def _page_frame(self, page, steps_per_page):
+		# the note colours of a page as (x, y, color), rendered once per note cache version and layout
+		if self._page_frames_key != (self._note_cache.version, self._geometry_key):
+			self._page_frames_key = (self._note_cache.version, self._geometry_key)
+			self._page_frames = {}
+		frame = self._page_frames.get(page)
+		if frame == None:
+			cells = {}
+			for note in self._note_cache.grid(self.quantization, steps_per_page).notes_in_page(page):
+				note_grid_y_base = self._pitch_rows.get(note[0])
+				if note_grid_y_base != None:
+					x, note_row = self._step_cells[int(note[1] / self.quantization) % steps_per_page]
+					cells[(x, note_grid_y_base + note_row)] = self.muted_note_color if note[4] else self._velocity_colors[int(note[3])]
+			frame = [(x, y, color) for (x, y), color in cells.items()]
+			self._page_frames[page] = frame
+		return frame
+
+	def _keep_page_frames(self):
+		# keeps the frames of the displayed page and its neighbours. missing neighbours are rendered on the next tick,
+		# so that paging, or following the playhead with STEPSEQ__AUTO_SCROLL, finds them ready
+		for page in list(self._page_frames):
+			if abs(page - self._page) > 1:
+				del self._page_frames[page]
+		missing = [page for page in (self._page - 1, self._page + 1) if page >= 0 and page not in self._page_frames]
+		if missing and not self._prerender_scheduled and self._control_surface != None:
+			self._prerender_scheduled = True
+			self._control_surface.schedule_message(1, self._prerender_page_frames)
+
+	def _prerender_page_frames(self):
+		self._prerender_scheduled = False
+		if self.is_enabled() and self._clip != None and self._note_cache != None:
+			steps_per_page = self._geometry()
+			for page in (self._page - 1, self._page + 1):
+				if page >= 0:
+					self._page_frame(page, steps_per_page)
+
 	def request_display_page(self): # Reset page column display timer
 		self._display_page = True
 		self._display_page_time = time.time()			
@@ -360,37 +400,26 @@ class NoteEditorComponent(ControlSurfaceComponent):
 				velocity = self._velocity #setted by velocity button
 				duration = self.quantization #setted by quantization button in StepSequencerComponent
 
-				# TODO: use new better way for editing clip
-
-				self._clip.select_all_notes()
-				note_cache = self._clip.get_selected_notes()
-				if self._note_cache != note_cache:
-					self._note_cache = note_cache
-
-				note_cache = list(self._note_cache)
-				for note in note_cache:
-					if pitch == note[0] and time == note[1]:
-						if self._is_velocity_shifted:
-							# update velocity of the note
-							new_velocity_index = 0
-							for index in range(len(self.velocity_map)):
-								if note[3] >= self.velocity_map[index]:
-									new_velocity_index = (index + 1) % len(self.velocity_map)
-							note_cache.append([note[0], note[1], note[2], self.velocity_map[new_velocity_index], note[4]])  # (pitch, time, duration, velocity, mute state)
-						elif not self._is_mute_shifted:
-							note_cache.remove(note)
-						else:
-							# mute / un mute note.
-							note_cache.append([note[0], note[1], note[2], note[3], not note[4]])  # (pitch, time, duration, velocity, mute state)
-						break
+				# the pad's notes are read from the clip: the note cache is only current once the clip's notes
+				# listener has run, which a second press can come before. only the changed note is written
+				found = notes_at(self._clip, pitch, time, self.quantization)
+				if found:
+					note_id, note = found[0]
+					if self._is_velocity_shifted:
+						# update velocity of the note
+						new_velocity_index = 0
+						for index in range(len(self.velocity_map)):
+							if note[3] >= self.velocity_map[index]:
+								new_velocity_index = (index + 1) % len(self.velocity_map)
+						new = [note[0], note[1], note[2], self.velocity_map[new_velocity_index], note[4]]  # (pitch, time, duration, velocity, mute state)
+					elif not self._is_mute_shifted:
+						new = None
+					else:
+						# mute / un mute note.
+						new = [note[0], note[1], note[2], note[3], not note[4]]  # (pitch, time, duration, velocity, mute state)
+					change_found_notes(self._clip, [(note_id, note, new)])
 				else:
-					note_cache.append([pitch, time, duration, velocity, self._is_mute_shifted]) # (pitch, time, duration, velocity, mute state)
-				self._clip.select_all_notes()
-				self._clip.replace_selected_notes(tuple(note_cache))
-
-				note_cache = self._clip.get_selected_notes()
-				if self._note_cache != note_cache:
-					self._note_cache = note_cache
+					write_note_changes(self._clip, added=[[pitch, time, duration, velocity, self._is_mute_shifted]]) # (pitch, time, duration, velocity, mute state)
 
 #*********************VELOCITY/BTN_SHIFT*********************
 
@@ -448,29 +477,16 @@ class NoteEditorComponent(ControlSurfaceComponent):
 
 	# Mute all entries for a given MIDI note OK
 	def mute_lane(self, pitch_to_mute):
-		if self.is_enabled() and self._clip != None:
-			self._clip.select_all_notes()
-			note_cache = self._clip.get_selected_notes()
-			if self._note_cache != note_cache:
-				self._note_cache = note_cache
-			note_cache = list(self._note_cache)
-			notes_changed = 0
-			for note in self._note_cache:
-				if note[0] == pitch_to_mute:
-					notes_changed = notes_changed + 1
-					note_to_mute = note
-					note_cache.remove(note)
-					note_cache.append([note_to_mute[0], note_to_mute[1], note_to_mute[2], note_to_mute[3], not note_to_mute[4]])
-			if notes_changed > 0:
-				self._clip.select_all_notes()
-				self._clip.replace_selected_notes(tuple(note_cache))
-				note_cache = self._clip.get_selected_notes()
+		if self.is_enabled() and self._clip != None and self._note_cache != None:
+			toggled = [(note_id, note, [note[0], note[1], note[2], note[3], not note[4]]) for note_id, note in notes_at(self._clip, pitch_to_mute, 0.0, ALL_TIME)]
+			if toggled:
+				change_found_notes(self._clip, toggled)
 			self.update()
 
 	# Display the third red column to show the current page in multinote mode each time that the metronome goes to new pageOK
 	def _display_current_page(self): # OK
 		for i in range(0, self._height):
 			if(self._page==self._current_page):
-				self._grid_back_buffer[self._current_page % self.width][i] = "StepSequencer.NoteEditor.CurrentPageMarkerPlay"
+				self._grid_back_buffer[self._current_page % self.width][i] = CURRENT_PAGE_MARKER_PLAY_COLOR
 			else:
-				self._grid_back_buffer[self._current_page % self.width][i] = "StepSequencer.NoteEditor.CurrentPageMarker"
+				self._grid_back_buffer[self._current_page % self.width][i] = CURRENT_PAGE_MARKER_COLOR
@@ -1,5 +1,6 @@
 from _Framework.ButtonElement import ButtonElement
 from _Framework.ControlSurfaceComponent import ControlSurfaceComponent
+from .Instrumentation import timed
 
 #Allows to note selection and navigation through note groups and pages
 class NoteSelectorComponent(ControlSurfaceComponent):
@@ -182,12 +183,13 @@ class NoteSelectorComponent(ControlSurfaceComponent):
 
                 self._step_sequencer._scale_updated()
 
+    @timed("NoteSelectorComponent.update")
     def update(self):
         if self.is_enabled():
             self._step_sequencer._track_controller._do_implicit_arm(self._is_velocity_shifted and not self._step_sequencer._is_locked)
             if self._is_velocity_shifted and not self._step_sequencer._is_locked:
                 self._control_surface.set_feedback_channels([11]) # WHY USE Channel 12 to play the notes???
-                self._control_surface._c_instance.set_feedback_velocity(int(self._control_surface._skin['Note.Feedback'])) # What is this???
+                self._control_surface.set_feedback_velocity(int(self._control_surface._skin['Note.Feedback'])) # What is this???
                 self._was_velocity_shifted = True
             elif self.is_drumrack and self._was_velocity_shifted:
                 self._was_velocity_shifted = False
@@ -199,6 +201,7 @@ class NoteSelectorComponent(ControlSurfaceComponent):
 
     def _update_matrix(self):
         if self._enable_offset_button and self.is_enabled():
+            playing = self._playing_notes()
             for i in range(len(self._offset_buttons)):
                 if self._clip == None:
                     self._offset_buttons[i].set_light("DefaultButton.Disabled")
@@ -234,7 +237,7 @@ class NoteSelectorComponent(ControlSurfaceComponent):
                         self._offset_buttons[i].set_enabled(True)
                         self._offset_buttons[i].use_default_message()
 
-                        if self._playhead != None and self.note_is_playing(self._clip, self._note_cache, note, self._playhead):
+                        if note in playing:
                             self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Playing","StepSequencer.NoteSelector.Playing")
 
                     if self.selected_note == note:
@@ -260,17 +263,16 @@ class NoteSelectorComponent(ControlSurfaceComponent):
         for i in range(len(self._scale)):
             self._scale[i] = self._scale[i] - self._key
 
+    # The pitches with a note under the cursor, one query for all the buttons
+    def _playing_notes(self):
+        if self._playhead != None and self._clip != None and self._clip.is_playing and self._note_cache != None:
+            return self._note_cache.pitches_playing_at(self._playhead)
+        return ()
+
     #Is the cursor in the current button range and contain a note
     def note_is_playing(self, clip, note_cache, midi_note, playhead):
         if clip != None and clip.is_playing and note_cache != None:
-            for note in note_cache:
-                note_key = note[0]
-                note_position = note[1]
-                note_length = note[2]
-                # note_velocity = note[3]
-                note_muted = note[4]
-                if midi_note == note_key and note_position <= playhead and note_position + note_length >= playhead and not note_muted:
-                    return True
+            return midi_note in note_cache.pitches_playing_at(playhead)
         return False
 
     def scroll_down(self):
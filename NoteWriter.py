@@ -0,0 +1,161 @@
+import Live
+from collections import Counter
+from .Log import get_logger
+
+log = get_logger(__name__)
+
+# notes are (pitch, time, duration, velocity, mute) as returned by get_selected_notes
+
+# time span of the legacy note range calls reading the notes starting at one time
+NOTE_TIME_SPAN = 0.001
+# notes given by their values are matched on pitch and start time in ticks of NOTE_TIME_SPAN, never on float equality
+KEY_TICKS_PER_BEAT = 1000
+# time span of notes_at covering a whole clip
+ALL_TIME = 1000000.0
+
+
+def _key(pitch, time):
+	return (pitch, int(round(time * KEY_TICKS_PER_BEAT)))
+
+
+def diff_notes(old_notes, new_notes):
+	# returns (removed, added, modified). modified holds (old, new) pairs sharing pitch and time
+	old_counts = Counter(tuple(note) for note in old_notes)
+	new_counts = Counter(tuple(note) for note in new_notes)
+	removed = list((old_counts - new_counts).elements())
+	added = list((new_counts - old_counts).elements())
+	removed_by_key = {}
+	for note in removed:
+		removed_by_key.setdefault(_key(note[0], note[1]), []).append(note)
+	modified = []
+	created = []
+	for note in added:
+		candidates = removed_by_key.get(_key(note[0], note[1]))
+		if candidates:
+			modified.append((candidates.pop(0), note))
+		else:
+			created.append(note)
+	removed = [note for notes in removed_by_key.values() for note in notes]
+	return removed, created, modified
+
+
+def has_note_id_api(clip):
+	# Live 11+
+	return hasattr(clip, "add_new_notes") and hasattr(clip, "apply_note_modifications") and hasattr(Live.Clip, "MidiNoteSpecification")
+
+
+def _note_ids(clip, notes):
+	# maps the key of each (pitch, time) to the ids of the clip notes found there, in time order
+	pitches = [note[0] for note in notes]
+	times = [note[1] for note in notes]
+	from_pitch = min(pitches)
+	from_time = min(times)
+	found = clip.get_notes_extended(from_pitch, max(pitches) - from_pitch + 1, from_time, max(times) - from_time + 1.0)
+	ids = {}
+	for note in found:
+		ids.setdefault(_key(note.pitch, note.start_time), []).append(note.note_id)
+	return ids
+
+
+def write_notes(clip, old_notes, new_notes):
+	# replaces the notes of the clip, known to hold old_notes, by new_notes.
+	# with the note id api only the difference is sent, otherwise the whole clip is rewritten
+	if not has_note_id_api(clip):
+		clip.select_all_notes()
+		clip.replace_selected_notes(tuple(new_notes))
+		return
+	removed, added, modified = diff_notes(old_notes, new_notes)
+	_apply_changes(clip, removed, added, modified)
+
+
+def write_note_changes(clip, removed=(), added=(), modified=()):
+	# write_notes for a caller that knows the difference: nothing is diffed, and only the changed notes are touched
+	removed, added, modified = list(removed), list(added), list(modified)
+	if not has_note_id_api(clip):
+		_apply_legacy_changes(clip, removed, added, modified)
+		return
+	_apply_changes(clip, removed, added, modified)
+
+
+def _apply_legacy_changes(clip, removed, added, modified):
+	# before the note id api: the notes around the removed and modified ones are read, removed and written
+	# back without them. the rest of the clip is neither read nor rewritten
+	notes = added + [new for old, new in modified]
+	touched = removed + [old for old, new in modified]
+	if touched:
+		gone = Counter(tuple(note) for note in touched)
+		pitches = [note[0] for note in touched]
+		times = [note[1] for note in touched]
+		from_pitch = min(pitches)
+		from_time = min(times)
+		pitch_span = max(pitches) - from_pitch + 1
+		time_span = max(times) - from_time + NOTE_TIME_SPAN
+		for note in clip.get_notes(from_time, from_pitch, time_span, pitch_span):
+			if gone[tuple(note)] > 0:
+				gone[tuple(note)] -= 1
+			else:
+				notes.append(note)
+		clip.remove_notes(from_time, from_pitch, time_span, pitch_span)
+	if notes:
+		clip.set_notes(tuple(tuple(note) for note in notes))
+
+
+def _apply_changes(clip, removed, added, modified):
+	added = list(added)
+	if removed or modified:
+		ids = _note_ids(clip, removed + [old for old, new in modified])
+		changes = {}
+		for old, new in modified:
+			found = ids.get(_key(old[0], old[1]))
+			if found:
+				changes[found.pop(0)] = new
+			else:
+				# the note left the clip since it was read: the new one is added in its place
+				log.warning("note to change not in the clip, added instead: %r" % (tuple(old), ))
+				added.append(new)
+		removed_ids = []
+		for note in removed:
+			found = ids.get(_key(note[0], note[1]))
+			if found:
+				removed_ids.append(found.pop(0))
+			else:
+				log.warning("note to remove not in the clip: %r" % (tuple(note), ))
+		if changes:
+			_modify_notes(clip, changes)
+		if removed_ids:
+			clip.remove_notes_by_id(tuple(removed_ids))
+	if added:
+		clip.add_new_notes(tuple(Live.Clip.MidiNoteSpecification(pitch=note[0], start_time=note[1], duration=note[2], velocity=note[3], mute=bool(note[4])) for note in added))
+
+
+def _modify_notes(clip, changes):
+	# changes maps note ids to the new values of their notes
+	notes = clip.get_notes_by_id(tuple(changes))
+	for note in notes:
+		new = changes[note.note_id]
+		note.duration = new[2]
+		note.velocity = new[3]
+		note.mute = bool(new[4])
+	clip.apply_note_modifications(notes)
+
+
+def notes_at(clip, pitch, time, span):
+	# the notes of pitch starting in [time, time + span), read from the clip as (note_id, note).
+	# the note id is None before the note id api
+	if has_note_id_api(clip):
+		return [(note.note_id, (note.pitch, note.start_time, note.duration, note.velocity, note.mute)) for note in clip.get_notes_extended(pitch, 1, time, span)]
+	return [(None, tuple(note)) for note in clip.get_notes(time, pitch, span, 1)]
+
+
+def change_found_notes(clip, changes):
+	# writes (note_id, note, new) changes of notes read with notes_at; new None removes the note.
+	# with the note id api the notes are found by their id, before it by their values
+	if not has_note_id_api(clip):
+		write_note_changes(clip, removed=[note for note_id, note, new in changes if new == None], modified=[(note, new) for note_id, note, new in changes if new != None])
+		return
+	modified = dict((note_id, new) for note_id, note, new in changes if new != None)
+	removed_ids = tuple(note_id for note_id, note, new in changes if new == None)
+	if modified:
+		_modify_notes(clip, modified)
+	if removed_ids:
+		clip.remove_notes_by_id(removed_ids)
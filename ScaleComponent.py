@@ -168,22 +168,22 @@ class ScaleComponent(ControlSurfaceComponent):
 
 	def _update_OSD(self):
 		if self._osd != None:
-			self._osd.attributes[0] = ""
-			self._osd.attribute_names[0] = ""
-			self._osd.attributes[1] = MUSICAL_MODES[self._modus * 2]
-			self._osd.attribute_names[1] = "Scale"
-			self._osd.attributes[2] = KEY_NAMES[self._key % 12]
-			self._osd.attribute_names[2] = "Root Note"
-			self._osd.attributes[3] = self._octave
-			self._osd.attribute_names[3] = "Octave"
-			self._osd.attributes[4] = " "
-			self._osd.attribute_names[4] = " "
-			self._osd.attributes[5] = " "
-			self._osd.attribute_names[5] = " "
-			self._osd.attributes[6] = " "
-			self._osd.attribute_names[6] = " "
-			self._osd.attributes[7] = " "
-			self._osd.attribute_names[7] = " "
+			self._osd.set_attribute(0, "")
+			self._osd.set_attribute_name(0, "")
+			self._osd.set_attribute(1, MUSICAL_MODES[self._modus * 2])
+			self._osd.set_attribute_name(1, "Scale")
+			self._osd.set_attribute(2, KEY_NAMES[self._key % 12])
+			self._osd.set_attribute_name(2, "Root Note")
+			self._osd.set_attribute(3, self._octave)
+			self._osd.set_attribute_name(3, "Octave")
+			self._osd.set_attribute(4, " ")
+			self._osd.set_attribute_name(4, " ")
+			self._osd.set_attribute(5, " ")
+			self._osd.set_attribute_name(5, " ")
+			self._osd.set_attribute(6, " ")
+			self._osd.set_attribute_name(6, " ")
+			self._osd.set_attribute(7, " ")
+			self._osd.set_attribute_name(7, " ")
 			self._osd.update()
 			
 	def update(self):
@@ -0,0 +1,22 @@
+from .Settings import Settings
+
+# settings added after a release: a Settings.py kept from an older version doesn't define them
+DEFAULTS = {
+	"DEVICE_CONTROLLER__MAIN_THREAD_GLIDE": False,
+	"LOG_LEVEL": "DEBUG",
+	"LOG_MODULE_LEVELS": {},
+	"LOG_MAX_BYTES": 1024 * 1024,
+	"LOG_BACKUPS": 2,
+	"INSTRUMENTATION": False,
+	"INSTRUMENTATION__RING_SIZE": 4096,
+	"INSTRUMENTATION__TICK_BUDGET_MS": 10,
+	"INSTRUMENTATION__SHOW_ON_OSD": False,
+	"MIDI_RATE_LIMIT": 0,
+	"MIDI_RATE_BURST": 100,
+	"STEPSEQ__PLAYHEAD_MAX_FPS": 30,
+}
+
+
+def setting(name):
+	# Settings.name, or its default when the user's Settings.py predates it
+	return getattr(Settings, name, DEFAULTS[name])
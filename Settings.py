@@ -15,6 +15,9 @@ class Settings():
     # Should the step sequencer scroll automatically to the currently playing page
     STEPSEQ__AUTO_SCROLL = False
 
+    # redraws of the step sequencer per second at most when the playhead moves to a new step, 0 for no limit
+    STEPSEQ__PLAYHEAD_MAX_FPS = 30
+
     # configure what user modes buttons do.
     # the 3 first value configure the 3 sub modes of button user mode 1,
     # and following ones are for user mode 2 button
@@ -31,6 +34,9 @@ class Settings():
 
     # Device control mode
     DEVICE_CONTROLLER__STEPLESS_MODE = True
+    # move stepless faders from Live's main thread (one step per display tick, ~10 per second)
+    # instead of the device strip server thread
+    DEVICE_CONTROLLER__MAIN_THREAD_GLIDE = False
     # device control stepless fader velocity thresholds
     # if velocity is above threshold, the parameter will be changed instantly
     VELOCITY_THRESHOLD_MAX = 100
@@ -49,6 +55,30 @@ class Settings():
 
     # Logging feature for debugging (creates C:/Users/{USERNAME}/Documents/Ableton/User Library/Remote Scripts/log.txt)
     LOGGING = False
+    # lowest level logged: "DEBUG", "INFO", "WARNING" or "ERROR"
+    LOG_LEVEL = "DEBUG"
+    # levels of single modules, e.g. {"DeviceControllerStripServer": "ERROR"}
+    LOG_MODULE_LEVELS = {}
+    # log.txt is moved to log.txt.1 (and older ones to .2 ...) once it is bigger than this, with 0 backups it is emptied
+    LOG_MAX_BYTES = 1024 * 1024
+    LOG_BACKUPS = 2
+
+    # time the script's entry points, listeners and device strip loops (costs a little on every call)
+    INSTRUMENTATION = False
+    # number of recent calls kept for Instrumentation.dump
+    INSTRUMENTATION__RING_SIZE = 4096
+    # main thread time per display tick (~100 ms) above which a tick counts as over budget
+    INSTRUMENTATION__TICK_BUDGET_MS = 10
+    # show the most expensive entry points on the OSD, once per second
+    INSTRUMENTATION__SHOW_ON_OSD = False
+
+    # messages per second sent to the Launchpad at most, 0 for no limit. Over it, matrix LED changes
+    # wait for the next display tick (the last colour of a pad is always sent). Mode buttons and
+    # config messages are never held back. Try a few hundred for an original Launchpad/S/Mini
+    # whose LEDs get stuck when many clips blink at once
+    MIDI_RATE_LIMIT = 0
+    # messages that can be sent at once before the limit applies
+    MIDI_RATE_BURST = 100
 
     # Map buttons to levels in volume slider. Exactly 7 values must be provided.
     # The lowest button is always set to -inf. Lowest supported value is -69 dB.
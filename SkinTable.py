@@ -0,0 +1,66 @@
+from weakref import WeakKeyDictionary
+from _Framework.ButtonElement import Color
+
+# colour names are interned into small integer ids shared by every skin.
+# id 0 is never handed out, so the 0 filled LED buffers of the components never match a colour
+_ids = {}
+_names = [None]
+_tables = WeakKeyDictionary()
+
+
+class ColorId(int):
+	""" Integer id of a skin colour name. Buttons find the colour of an id with a lookup in their skin's table """
+	__slots__ = ()
+
+	@property
+	def name(self):
+		return _names[self]
+
+
+def color_id(name):
+	# the id of a colour name such as "StepSequencer.NoteEditor.Metronome"
+	id = _ids.get(name)
+	if id is None:
+		id = ColorId(len(_names))
+		_names.append(name)
+		_ids[name] = id
+	return id
+
+
+def find_color_id(value):
+	# the id of a colour given by id or by name, None for anything that is not a colour name
+	if type(value) is ColorId:
+		return value
+	try:
+		return _ids.get(value)
+	except TypeError:
+		return None
+
+
+class SkinTable(object):
+	""" A skin compiled to a flat list of its colours indexed by colour id. Buttons draw the colours
+	with their own draw(), so Blink and Pulse keep drawing over black """
+
+	def __init__(self, skin):
+		self.entries = [None] * len(_names)
+		items = skin.items if hasattr(skin, 'items') else skin.iteritems
+		for name, color in items():
+			id = color_id(name)
+			if id >= len(self.entries):
+				self.entries.extend([None] * (id + 1 - len(self.entries)))
+			# skins may also give plain ints
+			self.entries[id] = color if hasattr(color, 'draw') else Color(int(color))
+
+	def entry(self, id):
+		if id < len(self.entries):
+			return self.entries[id]
+		return None
+
+
+def skin_table(skin):
+	# compiled once per skin
+	table = _tables.get(skin)
+	if table is None:
+		table = SkinTable(skin)
+		_tables[skin] = table
+	return table
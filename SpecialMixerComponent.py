@@ -1,6 +1,8 @@
 from _Framework.MixerComponent import MixerComponent
 from .DefChannelStripComponent import DefChannelStripComponent
 from _Framework.ButtonElement import ButtonElement
+from _Framework.SubjectSlot import subject_slot_group
+from .Instrumentation import timed
 
 
 class SpecialMixerComponent(MixerComponent):
@@ -9,6 +11,10 @@ class SpecialMixerComponent(MixerComponent):
 
 	def __init__(self, num_tracks, num_returns = 0):
 		self._osd = None
+		self._osd_tracks = None
+		self._osd_names = None
+		# the names this component last wrote to the OSD, None once it has to write them again
+		self._osd_shown = None
 		MixerComponent.__init__(self, num_tracks, num_returns)
 		self._unarm_all_button = None
 		self._unsolo_all_button = None
@@ -60,6 +66,7 @@ class SpecialMixerComponent(MixerComponent):
 	def set_osd(self, osd):
 		self._osd = osd
 
+	@timed("SpecialMixerComponent.update")
 	def update(self):
 		MixerComponent.update(self)
 		if self._is_enabled:
@@ -67,32 +74,41 @@ class SpecialMixerComponent(MixerComponent):
 
 	def set_enabled(self, enabled):
 		MixerComponent.set_enabled(self, enabled)
+		# another mode may have written the OSD since
+		self._osd_shown = None
 		if enabled:
 			self._update_OSD()
 
 	def _update_OSD(self):
 		if self._osd != None:
-			self._osd.mode = "Mixer"
+			# only the visible tracks are read: their names are cached until the window moves or one is renamed,
+			# and the OSD is only written when those names differ from the ones this component wrote last
+			offset = max(0, self._track_offset)
+			tracks = tuple(self.tracks_to_use()[offset:offset + 8])
+			if tracks != self._osd_tracks:
+				self._osd_tracks = tracks
+				self._osd_names = None
+				self._on_osd_track_name_changed.replace_subjects(tracks)
+			if self._osd_names == None:
+				names = [str(track.name) if track != None else " " for track in tracks]
+				self._osd_names = names + [" "] * (8 - len(names))
+			if self._osd_names == self._osd_shown:
+				return
+			self._osd_shown = self._osd_names
+			self._osd.draft_mode = "Mixer"
 			for i in range(8):
-				self._osd.attribute_names[i] = " "
-				self._osd.attributes[i] = " "
-
-			tracks = self.tracks_to_use()
-			idx = 0
-			for i in range(len(tracks)):
-				if idx < 8 and len(tracks) > i + self._track_offset:
-					track = tracks[i + self._track_offset]
-					if track != None:
-						self._osd.attribute_names[idx] = str(track.name)
-					else:
-						self._osd.attribute_names[idx] = " "
-					self._osd.attributes[idx] = " "
-				idx += 1
-
-			self._osd.info[0] = " "
-			self._osd.info[1] = " "
+				self._osd.set_attribute_name(i, self._osd_names[i])
+				self._osd.set_attribute(i, " ")
+			self._osd.set_info(0, " ")
+			self._osd.set_info(1, " ")
 			self._osd.update()
 
+	@subject_slot_group('name')
+	def _on_osd_track_name_changed(self, track):
+		self._osd_names = None
+		if self._is_enabled:
+			self._update_OSD()
+
 	def _unarm_all_value(self, value):
 		assert (self._unarm_all_button != None)
 		assert (value in range(128))
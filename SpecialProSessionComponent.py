@@ -14,6 +14,7 @@ import time
 from .SpecialProSessionRecordingComponent import SpecialProSessionRecordingComponent
 from .SpecialSessionComponent import SpecialSessionComponent
 from .TargetTrackComponent import TargetTrackComponent
+from .TrackWindowListeners import TrackWindowListeners
 _Q = Live.Song.Quantization
 Rec_Q = Live.Song.RecordingQuantization
 try:
@@ -95,6 +96,20 @@ class SpecialClipSlotComponent(ClipSlotComponent):
 	def _set_parent(self, parent):		
 		self._parent = parent
 	
+	def update(self):
+		# the framework's update, except that a pad still showing this slot's feedback is not drawn again
+		button = self._launch_button_value.subject
+		shown = None
+		if self._allow_updates and self.is_enabled() and button != None:
+			shown = (self, self._feedback_value())
+			if button.shows(shown):
+				super(ClipSlotComponent, self).update()
+				self._has_fired_slot = False
+				return
+		super(SpecialClipSlotComponent, self).update()
+		if shown != None:
+			button.mark_shown(shown)
+	
 	def _do_select_clip(self, clip_slot):
 		super(SpecialClipSlotComponent, self)._do_select_clip(clip_slot)
 		if self._clip_slot is not None:
@@ -462,6 +477,8 @@ class SpecialProSessionComponent(SpecialSessionComponent):
 
 	def __init__(self, num_tracks, num_scenes, stop_clip_buttons, side_buttons, control_surface, main_selector, livesong = None):
 		self._pro_mode_on = False
+		# what the stop row shows while record, duplicate or delete is held
+		self._track_listeners = TrackWindowListeners((("arm", "can_be_armed"), ("fold_state", "is_foldable"), ("solo", None), ("mute", None)), self._on_window_track_changed)
 		if control_surface._mk2_rgb:
 			#use custom clip colour coding : blink and pulse for trig and play 
 			SceneComponent.clip_slot_component_type = ClipSlotMK2
@@ -567,6 +584,7 @@ class SpecialProSessionComponent(SpecialSessionComponent):
 		self.update()
 		
 	def disconnect(self):
+		self._track_listeners.disconnect()
 		self._song.remove_clip_trigger_quantization_listener(self._on_clip_trigger_quantization_changed_in_live)
 		self._song.remove_midi_recording_quantization_listener(self._on_record_quantization_changed_in_live)
 		self.song().remove_session_record_listener(self._on_session_record_changed_in_live)
@@ -622,6 +640,19 @@ class SpecialProSessionComponent(SpecialSessionComponent):
 	
 	def _set_pro_mode_on(self, pro_mode_on):
 		self._pro_mode_on = pro_mode_on
+		self._update_track_listeners()
+
+	def _reassign_tracks(self):
+		SpecialSessionComponent._reassign_tracks(self)
+		self._update_track_listeners()
+
+	def _update_track_listeners(self):
+		# only the tracks of the window are listened to, and only in pro mode
+		self._track_listeners.set_tracks(self._window_tracks if self._pro_mode_on else ())
+
+	def _on_window_track_changed(self, index):
+		if self.is_enabled() and (self._record_pressed or self._duplicate_pressed or self._delete_pressed):
+			self._update_stop_clips_led(index)
 	
 	def _set_slot_copy_buffer(self, slot):
 		self._slot_copy_buffer = slot
@@ -1086,10 +1117,8 @@ class SpecialProSessionComponent(SpecialSessionComponent):
 			super(SpecialSessionComponent, self)._update_stop_clips_led(index) 
 		elif (self._stop_track_clip_buttons != None) and (index < len(self._stop_track_clip_buttons)):
 			button = self._stop_track_clip_buttons[index]
-			tracks_to_use = self.tracks_to_use()
-			track_index = index + self.track_offset()
-			if 0 <= track_index < len(tracks_to_use):
-				track = tracks_to_use[track_index]
+			if index < len(self._window_tracks):
+				track = self._window_tracks[index]
 				if(self._record_pressed):
 					if track.can_be_armed:
 						if track.arm:
@@ -1260,6 +1289,7 @@ class SpecialProSessionComponent(SpecialSessionComponent):
 					self._set_rec_qntz_value(value, button)
 				elif(self._double_pressed):
 					self._set_fixed_length_value(value, button)
+					self._update_double_button()
 				elif(self._click_pressed):
 					self._set_tempo_value(value, button)					
 				elif(self._shift_pressed):
@@ -1272,7 +1302,8 @@ class SpecialProSessionComponent(SpecialSessionComponent):
 					self._do_mute_track(value, button)
 				else:
 					super(SpecialProSessionComponent, self)._on_stop_track_value(value, button)
-				self.update()
+				# the clip slots and the track state the row shows repaint from their listeners
+				self._update_stop_track_clip_buttons()
 		else:  
 			super(SpecialProSessionComponent, self)._on_stop_track_value(value, button)
 			
@@ -1,7 +1,9 @@
 from _Framework.SessionComponent import SessionComponent
 from .ClipSlotMK2 import ClipSlotMK2
 from _Framework.SceneComponent import SceneComponent
+from _Framework.SubjectSlot import subject_slot_group
 import Live
+from .Instrumentation import timed
 
 class SpecialSessionComponent(SessionComponent):
 
@@ -12,6 +14,11 @@ class SpecialSessionComponent(SessionComponent):
 		self._control_surface = control_surface
 		self._main_selector = main_selector
 		self._osd = None
+		self._osd_tracks = None
+		self._osd_names = None
+		# the names this component last wrote to the OSD, None once it has to write them again
+		self._osd_shown = None
+		self._window_tracks = ()
 		if self._control_surface._lpx or self._control_surface._mk3_rgb or self._control_surface._mk2_rgb:
 			#use custom clip colour coding : blink and pulse for trig and play 
 			SceneComponent.clip_slot_component_type = ClipSlotMK2
@@ -30,10 +37,8 @@ class SpecialSessionComponent(SessionComponent):
 	def _update_stop_clips_led(self, index):
 		if ((self.is_enabled()) and (self._stop_track_clip_buttons != None) and (index < len(self._stop_track_clip_buttons))):
 			button = self._stop_track_clip_buttons[index]
-			tracks_to_use = self.tracks_to_use()
-			track_index = index + self.track_offset()
-			if 0 <= track_index < len(tracks_to_use):
-				track = tracks_to_use[track_index]
+			if index < len(self._window_tracks):
+				track = self._window_tracks[index]
 				if track.fired_slot_index == -2:
 					button.send_value(self._stop_clip_triggered_value)
 				elif track.playing_slot_index >= 0:
@@ -48,31 +53,39 @@ class SpecialSessionComponent(SessionComponent):
 
 	def _update_OSD(self):
 		if self._osd != None:
-			self._osd.mode = "Session"
+			# only the visible tracks are read: their names are cached until the window moves or one is renamed,
+			# and the OSD is only written when those names differ from the ones this component wrote last
+			offset = max(0, self._track_offset)
+			tracks = tuple(self.tracks_to_use()[offset:offset + self._num_tracks])
+			if tracks != self._osd_tracks:
+				self._osd_tracks = tracks
+				self._osd_names = None
+				self._on_osd_track_name_changed.replace_subjects(tracks)
+			if self._osd_names == None:
+				names = [str(track.name) if track != None else " " for track in tracks]
+				self._osd_names = names + [" "] * (self._num_tracks - len(names))
+			if self._osd_names == self._osd_shown:
+				return
+			self._osd_shown = self._osd_names
+			self._osd.draft_mode = "Session"
 			for i in range(self._num_tracks):
-				self._osd.attribute_names[i] = " "
-				self._osd.attributes[i] = " "
-
-			tracks = self.tracks_to_use()
-			idx = 0
-			for i in range(len(tracks)):
-				if idx < self._num_tracks and len(tracks) > i + self._track_offset:
-					track = tracks[i + self._track_offset]
-					if track != None:
-						self._osd.attribute_names[idx] = str(track.name)
-					else:
-						self._osd.attribute_names[idx] = " "
-					self._osd.attributes[idx] = " "
-				idx += 1
-
-			self._osd.info[0] = " "
-			self._osd.info[1] = " "
+				self._osd.set_attribute_name(i, self._osd_names[i])
+				self._osd.set_attribute(i, " ")
+			self._osd.set_info(0, " ")
+			self._osd.set_info(1, " ")
 			self._osd.update()
 
+	@subject_slot_group('name')
+	def _on_osd_track_name_changed(self, track):
+		self._osd_names = None
+		if self._main_selector._main_mode_index == 0:
+			self._update_OSD()
+
 	def unlink(self):
 		if self._is_linked():
 			self._unlink()
 
+	@timed("SpecialSessionComponent.update")
 	def update(self):
 		SessionComponent.update(self)
 		if self._main_selector._main_mode_index == 0:
@@ -80,10 +93,15 @@ class SpecialSessionComponent(SessionComponent):
 
 	def set_enabled(self, enabled):
 		SessionComponent.set_enabled(self, enabled)
+		# another mode may have written the OSD since
+		self._osd_shown = None
 		if self._main_selector._main_mode_index == 0:
 			self._update_OSD()
 
 	def _reassign_tracks(self):
+		# the tracks of the window, read once here rather than from the whole track list for every stop led
+		offset = max(0, self._track_offset)
+		self._window_tracks = tuple(self.tracks_to_use()[offset:offset + self._num_tracks])
 		SessionComponent._reassign_tracks(self)
 		if self._main_selector._main_mode_index == 0:
 			self._update_OSD()
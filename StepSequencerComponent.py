@@ -11,8 +11,11 @@ except ImportError:
     # Python 3...
     imap=map
 from .NoteEditorComponent import NoteEditorComponent
+from .NoteCache import NoteCache
 from .TrackControllerComponent import TrackControllerComponent
 import time
+from .Instrumentation import timed
+from .SettingDefaults import setting
 from .ScaleComponent import ScaleComponent, MUSICAL_MODES, KEY_NAMES
 try:
     from .Settings import Settings
@@ -44,7 +47,7 @@ class StepSequencerComponent(CompoundComponent):
         # clip
         self._clip = None
         self._clip_slot = None
-        self._note_cache = []
+        self._note_cache = NoteCache()
         self._playhead = 0
         self._new_clip_pages = 4
         # mode
@@ -64,6 +67,11 @@ class StepSequencerComponent(CompoundComponent):
         self._diatonic_scale = []
         
         self._beat = 0
+        # the playhead as last drawn by the editor and selectors, see _playhead_frame
+        self._drawn_playhead = None
+        self._playhead_drawn_time = 0
+        self._playhead_redraw_scheduled = False
+        self._beat_flash = False
         # setup
         self._set_loop_selector()
         self._set_note_editor()
@@ -184,57 +192,57 @@ class StepSequencerComponent(CompoundComponent):
                 self._osd.set_mode('Drum Step Sequencer')
 
             if self._clip != None:
-                self._osd.attributes[0] = MUSICAL_MODES[self._scale_selector._modus * 2]
-                self._osd.attribute_names[0] = "Scale"
-                self._osd.attributes[1] = KEY_NAMES[self._scale_selector._key % 12]
-                self._osd.attribute_names[1] = "Root Note"
-                self._osd.attributes[2] = self._scale_selector._octave
-                self._osd.attribute_names[2] = "Octave"
-                self._osd.attributes[3] = QUANTIZATION_NAMES[self._quantization_index]
-                self._osd.attribute_names[3] = "Quantisation"
-                self._osd.attributes[4] = " "
-                self._osd.attribute_names[4] = " "
-                self._osd.attributes[5] = " "
-                self._osd.attribute_names[5] = " "
-                self._osd.attributes[6] = " "
-                self._osd.attribute_names[6] = " "
-                self._osd.attributes[7] = " "
-                self._osd.attribute_names[7] = " "
+                self._osd.set_attribute(0, MUSICAL_MODES[self._scale_selector._modus * 2])
+                self._osd.set_attribute_name(0, "Scale")
+                self._osd.set_attribute(1, KEY_NAMES[self._scale_selector._key % 12])
+                self._osd.set_attribute_name(1, "Root Note")
+                self._osd.set_attribute(2, self._scale_selector._octave)
+                self._osd.set_attribute_name(2, "Octave")
+                self._osd.set_attribute(3, QUANTIZATION_NAMES[self._quantization_index])
+                self._osd.set_attribute_name(3, "Quantisation")
+                self._osd.set_attribute(4, " ")
+                self._osd.set_attribute_name(4, " ")
+                self._osd.set_attribute(5, " ")
+                self._osd.set_attribute_name(5, " ")
+                self._osd.set_attribute(6, " ")
+                self._osd.set_attribute_name(6, " ")
+                self._osd.set_attribute(7, " ")
+                self._osd.set_attribute_name(7, " ")
             else:
-                self._osd.attributes[0] = " "
-                self._osd.attribute_names[0] = " "
-                self._osd.attributes[1] = " "
-                self._osd.attribute_names[1] = " "
-                self._osd.attributes[2] = " "
-                self._osd.attribute_names[2] = " "
-                self._osd.attributes[3] = " "
-                self._osd.attribute_names[3] = " "
-                self._osd.attributes[4] = " "
-                self._osd.attribute_names[4] = " "
-                self._osd.attributes[5] = " "
-                self._osd.attribute_names[5] = " "
-                self._osd.attributes[6] = " "
-                self._osd.attribute_names[6] = " "
-                self._osd.attributes[7] = " "
-                self._osd.attribute_names[7] = " "
+                self._osd.set_attribute(0, " ")
+                self._osd.set_attribute_name(0, " ")
+                self._osd.set_attribute(1, " ")
+                self._osd.set_attribute_name(1, " ")
+                self._osd.set_attribute(2, " ")
+                self._osd.set_attribute_name(2, " ")
+                self._osd.set_attribute(3, " ")
+                self._osd.set_attribute_name(3, " ")
+                self._osd.set_attribute(4, " ")
+                self._osd.set_attribute_name(4, " ")
+                self._osd.set_attribute(5, " ")
+                self._osd.set_attribute_name(5, " ")
+                self._osd.set_attribute(6, " ")
+                self._osd.set_attribute_name(6, " ")
+                self._osd.set_attribute(7, " ")
+                self._osd.set_attribute_name(7, " ")
 
             if self._selected_track != None:
                 if self._lock_to_track and self._is_locked:
-                    self._osd.info[0] = "track : " + self._selected_track.name + " (locked)"
+                    self._osd.set_info(0, "track : " + self._selected_track.name + " (locked)")
                 else:
-                    self._osd.info[0] = "track : " + self._selected_track.name
+                    self._osd.set_info(0, "track : " + self._selected_track.name)
             else:
-                self._osd.info[0] = " "
+                self._osd.set_info(0, " ")
             if self._clip != None:
                 name = self._clip.name
                 if name == "":
                     name = "(unamed clip)"
                 if not self._lock_to_track and self._is_locked:
-                    self._osd.info[1] = "clip : " + name + " (locked)"
+                    self._osd.set_info(1, "clip : " + name + " (locked)")
                 else:
-                    self._osd.info[1] = "clip : " + name
+                    self._osd.set_info(1, "clip : " + name)
             else:
-                self._osd.info[1] = "no clip selected"
+                self._osd.set_info(1, "no clip selected")
             self._osd.update()
 
     @property
@@ -385,6 +393,7 @@ class StepSequencerComponent(CompoundComponent):
         self._update_note_selector()
 
 # UPDATE
+    @timed("StepSequencerComponent.update")
     def update(self):
         if self.is_enabled():
             self._update_track_controller()
@@ -578,9 +587,11 @@ class StepSequencerComponent(CompoundComponent):
         self._note_editor.set_playhead(None)
         self._note_selector.set_playhead(None)
         self._loop_selector.set_playhead(None)
+        self._drawn_playhead = None
         # reload notes
         self._on_notes_changed()
             
+    @timed("StepSequencerComponent._on_notes_changed")
     def _on_notes_changed(self):  # trigger by callback on clip or via _clip_changed.
         if self.is_enabled():
             # get notes
@@ -591,9 +602,9 @@ class StepSequencerComponent(CompoundComponent):
                 note_cache = self._clip.get_selected_notes()
                 self._clip.deselect_all_notes()
 
-            # update if needed
+            # update if needed. the same indexed cache is shared by the editor and selectors
             if note_cache != self._note_cache:
-                self._note_cache = note_cache
+                self._note_cache = NoteCache(note_cache)
                 self._note_editor.set_note_cache(self._note_cache)
                 self._note_selector.set_note_cache(self._note_cache)
                 self._loop_selector.set_note_cache(self._note_cache)
@@ -604,16 +615,46 @@ class StepSequencerComponent(CompoundComponent):
         if self.is_enabled():
             self._on_playing_position_changed()
 
+    @timed("StepSequencerComponent._on_playing_position_changed")
     def _on_playing_position_changed(self):  # playing position changed listener
         if self.is_enabled():
             if self._clip != None and self._clip.is_playing and self.song().is_playing:
                 self._playhead = self._clip.playing_position
             else:
                 self._playhead = None
-            self._loop_selector.set_playhead(self._playhead, Settings.STEPSEQ__AUTO_SCROLL)
-            self._note_selector.set_playhead(self._playhead)
-            self._note_editor.set_playhead(self._playhead)
-            self.updateQuantizationButton()
+            # only a new step, beat or playing note changes what is drawn, at most STEPSEQ__PLAYHEAD_MAX_FPS times a second
+            if self._playhead_frame() != self._drawn_playhead:
+                max_fps = setting("STEPSEQ__PLAYHEAD_MAX_FPS")
+                if max_fps <= 0 or time.time() - self._playhead_drawn_time >= 1.0 / max_fps:
+                    self._draw_playhead()
+                elif not self._playhead_redraw_scheduled:
+                    self._playhead_redraw_scheduled = True
+                    self._control_surface.schedule_message(1, self._on_playhead_redraw_due)
+            elif self._beat_flash:
+                # the quantization button is lit high for a single notification on each beat
+                self._beat_flash = False
+                self.updateQuantizationButton()
+
+    def _playhead_frame(self):
+        # what the playhead shows: its step, its beat and the notes it plays. None when the clip is not playing
+        if self._playhead == None:
+            return None
+        return (int(self._playhead / self._quantization), int(self._playhead), self._note_cache.playing_index(self._playhead))
+
+    def _draw_playhead(self):
+        self._drawn_playhead = self._playhead_frame()
+        self._playhead_drawn_time = time.time()
+        self._loop_selector.set_playhead(self._playhead, Settings.STEPSEQ__AUTO_SCROLL)
+        self._note_selector.set_playhead(self._playhead)
+        self._note_editor.set_playhead(self._playhead)
+        self._beat_flash = self._playhead != None and self._beat != int(self._playhead)
+        self.updateQuantizationButton()
+
+    def _on_playhead_redraw_due(self):
+        # draws the latest playhead when the notifications that changed it came too fast
+        self._playhead_redraw_scheduled = False
+        if self.is_enabled() and self._playhead_frame() != self._drawn_playhead:
+            self._draw_playhead()
 
 # DRUM_GROUP_DEVICE
     def _update_drum_group_device(self):
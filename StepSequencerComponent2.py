@@ -6,8 +6,11 @@ from .LoopSelectorComponent import LoopSelectorComponent
 from .NoteSelectorComponent import NoteSelectorComponent
 from .ScaleComponent import MUSICAL_MODES, KEY_NAMES
 from .TrackControllerComponent import TrackControllerComponent
+from .NoteWriter import write_notes
+from .SkinTable import color_id
 from random import randrange
 import time
+from .Instrumentation import timed
 
 STEPSEQ_MODE_NOTES = 1
 STEPSEQ_MODE_NOTES_OCTAVES = 2
@@ -16,6 +19,24 @@ STEPSEQ_MODE_NOTES_LENGTHS = 4
 
 LONG_BUTTON_PRESS = 1.0
 
+# colors of the step grid, by skin color id
+PITCH_ON_COLOR = color_id("StepSequencer2.Pitch.On")
+PITCH_OFF_COLOR = color_id("StepSequencer2.Pitch.Off")
+OCTAVE_ON_COLOR = color_id("StepSequencer2.Octave.On")
+OCTAVE_OFF_COLOR = color_id("StepSequencer2.Octave.Off")
+OCTAVE_DIM_COLOR = color_id("StepSequencer2.Octave.Dim")
+VELOCITY_ON_COLOR = color_id("StepSequencer2.Velocity.On")
+VELOCITY_OFF_COLOR = color_id("StepSequencer2.Velocity.Off")
+VELOCITY_DIM_COLOR = color_id("StepSequencer2.Velocity.Dim")
+LENGTH_ON_COLOR = color_id("StepSequencer2.Length.On")
+LENGTH_OFF_COLOR = color_id("StepSequencer2.Length.Off")
+LENGTH_DIM_COLOR = color_id("StepSequencer2.Length.Dim")
+METRONOME_IN_PAGE_COLOR = color_id("StepSequencer2.NoteEditor.MetronomeInPage")
+METRONOME_IN_OTHER_PAGE_COLOR = color_id("StepSequencer2.NoteEditor.MetronomeInOtherPage")
+PLAY_IN_PAGE_COLOR = color_id("StepSequencer2.NoteEditor.PlayInPage")
+PLAY_IN_OTHER_PAGE_COLOR = color_id("StepSequencer2.NoteEditor.PlayInOtherPage")
+DISABLED_COLOR = color_id("DefaultButton.Disabled")
+
 # TODO :
 # extend / clear region (possible via drum step seq for now)
 # not even clip lengths (using shift notes ?)
@@ -283,8 +304,7 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 						pitch = self._key_indexes[note_index] + 12 * (self._notes_octaves[x] - 2)
 						if(pitch >= 0 and pitch < 128 and velocity >= 0 and velocity < 128 and length >= 0):
 							note_cache.append([pitch, time, length, velocity, False])
-			self._clip.select_all_notes()
-			self._clip.replace_selected_notes(tuple(note_cache)) # Todo : deprecated
+			write_notes(self._clip, self._note_cache, note_cache)
 			#self._control_surface.schedule_message(1, self._sch_update, ([self._clip,tuple(note_cache)]))
 
 	def _sch_update(self, data):
@@ -296,6 +316,7 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 			else:
 				clip.replace_selected_notes(note_cache)
 				
+	@timed("StepSequencerComponent2.update")
 	def update(self, force=False):
 		if force:
 			self._force_update = True
@@ -363,45 +384,45 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 					for y in range(7):
 						if self._mode == STEPSEQ_MODE_NOTES:
 							if self._notes_pitches[(x + 8 * self._page) * 7 + 6 - y] == 1:
-								self._grid_back_buffer[x][y] = "StepSequencer2.Pitch.On"
+								self._grid_back_buffer[x][y] = PITCH_ON_COLOR
 							else:
-								self._grid_back_buffer[x][y] = "StepSequencer2.Pitch.Off"
+								self._grid_back_buffer[x][y] = PITCH_OFF_COLOR
 
 						elif self._mode == STEPSEQ_MODE_NOTES_OCTAVES:
 							if(has_note):
 								if self._notes_octaves[x + 8 * self._page] == 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Octave.On"
+									self._grid_back_buffer[x][y] = OCTAVE_ON_COLOR
 								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Octave.Off"
+									self._grid_back_buffer[x][y] = OCTAVE_OFF_COLOR
 							else:
 								if self._notes_octaves[x + 8 * self._page] == 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Octave.Dim"
+									self._grid_back_buffer[x][y] = OCTAVE_DIM_COLOR
 								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Octave.Off"
+									self._grid_back_buffer[x][y] = OCTAVE_OFF_COLOR
 
 						elif self._mode == STEPSEQ_MODE_NOTES_VELOCITIES:
 							if(has_note):
 								if self._notes_velocities[x + 8 * self._page] >= 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Velocity.On"
+									self._grid_back_buffer[x][y] = VELOCITY_ON_COLOR
 								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Velocity.Off"
+									self._grid_back_buffer[x][y] = VELOCITY_OFF_COLOR
 							else:
 								if self._notes_velocities[x + 8 * self._page] >= 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Velocity.Dim"
+									self._grid_back_buffer[x][y] = VELOCITY_DIM_COLOR
 								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Velocity.Off"
+									self._grid_back_buffer[x][y] = VELOCITY_OFF_COLOR
 
 						elif self._mode == STEPSEQ_MODE_NOTES_LENGTHS:
 							if has_note:
 								if self._notes_lengths[x + 8 * self._page] >= 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Length.On"
+									self._grid_back_buffer[x][y] = LENGTH_ON_COLOR
 								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Length.Off"
+									self._grid_back_buffer[x][y] = LENGTH_OFF_COLOR
 							else:
 								if self._notes_lengths[x + 8 * self._page] >= 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Length.Dim"
+									self._grid_back_buffer[x][y] = LENGTH_DIM_COLOR
 								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Length.Off"
+									self._grid_back_buffer[x][y] = LENGTH_OFF_COLOR
 				# metronome
 				if self._playhead != None:
 					play_position = int(self._playhead / self.quantization)
@@ -409,14 +430,14 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 					page = int(self._playhead / self.quantization / 8)
 					if self._mode == STEPSEQ_MODE_NOTES_LENGTHS:
 						if page == self._page:
-							metronome_color = "StepSequencer2.NoteEditor.MetronomeInPage"
+							metronome_color = METRONOME_IN_PAGE_COLOR
 						else:
-							metronome_color = "StepSequencer2.NoteEditor.MetronomeInOtherPage"
+							metronome_color = METRONOME_IN_OTHER_PAGE_COLOR
 					else:
 						if page == self._page:
-							metronome_color = "StepSequencer2.NoteEditor.MetronomeInPage"
+							metronome_color = METRONOME_IN_PAGE_COLOR
 						else:
-							metronome_color = "StepSequencer2.NoteEditor.MetronomeInOtherPage"
+							metronome_color = METRONOME_IN_OTHER_PAGE_COLOR
 					self._grid_back_buffer[play_x_position][6] = metronome_color
 
 					# playing notes
@@ -424,14 +445,14 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 						for y in range(7):
 							if self._notes_pitches[play_position * 7 + 6 - y] == 1:
 								if page == self._page:
-									self._grid_back_buffer[play_x_position][y] = "StepSequencer2.NoteEditor.PlayInPage"
+									self._grid_back_buffer[play_x_position][y] = PLAY_IN_PAGE_COLOR
 								else:
-									self._grid_back_buffer[play_x_position][y] = "StepSequencer2.NoteEditor.PlayInOtherPage"
+									self._grid_back_buffer[play_x_position][y] = PLAY_IN_OTHER_PAGE_COLOR
 
 			else:
 				for x in range(8):
 					for y in range(7):
-						self._grid_back_buffer[x][y] = "DefaultButton.Disabled"
+						self._grid_back_buffer[x][y] = DISABLED_COLOR
 
 			# caching : compare back buffer to buffer and update grid. this should minimize midi traffic quite a bit.
 			for x in range(8):
@@ -789,69 +810,69 @@ class StepSequencerComponent2(StepSequencerComponent):
 		if self._osd != None:
 			self._osd.set_mode('Melodic Step Sequencer')
 			if self._clip != None:
-				self._osd.attributes[0] = MUSICAL_MODES[self._scale_selector._modus * 2]
-				self._osd.attribute_names[0] = "Scale"
-				self._osd.attributes[1] = KEY_NAMES[self._scale_selector._key % 12]
-				self._osd.attribute_names[1] = "Root Note"
-				self._osd.attributes[2] = self._scale_selector._octave
-				self._osd.attribute_names[2] = "Octave"
-				self._osd.attributes[3] = QUANTIZATION_NAMES[self._quantization_index]
-				self._osd.attribute_names[3] = "Quantisation"
+				self._osd.set_attribute(0, MUSICAL_MODES[self._scale_selector._modus * 2])
+				self._osd.set_attribute_name(0, "Scale")
+				self._osd.set_attribute(1, KEY_NAMES[self._scale_selector._key % 12])
+				self._osd.set_attribute_name(1, "Root Note")
+				self._osd.set_attribute(2, self._scale_selector._octave)
+				self._osd.set_attribute_name(2, "Octave")
+				self._osd.set_attribute(3, QUANTIZATION_NAMES[self._quantization_index])
+				self._osd.set_attribute_name(3, "Quantisation")
 				if self._note_editor._is_monophonic:
-					self._osd.attributes[4] = "Mono"
+					self._osd.set_attribute(4, "Mono")
 				else:
-					self._osd.attributes[4] = "Poly"
-				self._osd.attribute_names[4] = "Polyphony"
+					self._osd.set_attribute(4, "Poly")
+				self._osd.set_attribute_name(4, "Polyphony")
 
-				self._osd.attribute_names[5] = "Page"
+				self._osd.set_attribute_name(5, "Page")
 				if self._note_editor._mode == STEPSEQ_MODE_NOTES:
-					self._osd.attributes[5] = "Notes"
+					self._osd.set_attribute(5, "Notes")
 				elif self._note_editor._mode == STEPSEQ_MODE_NOTES_OCTAVES:
-					self._osd.attributes[5] = "Octave"
+					self._osd.set_attribute(5, "Octave")
 				elif self._note_editor._mode == STEPSEQ_MODE_NOTES_VELOCITIES:
-					self._osd.attributes[5] = "Velocity"
+					self._osd.set_attribute(5, "Velocity")
 				elif self._note_editor._mode == STEPSEQ_MODE_NOTES_LENGTHS:
-					self._osd.attributes[5] = "Length"
+					self._osd.set_attribute(5, "Length")
 
-				self._osd.attributes[6] = " "
-				self._osd.attribute_names[6] = " "
-				self._osd.attributes[7] = " "
-				self._osd.attribute_names[7] = " "
+				self._osd.set_attribute(6, " ")
+				self._osd.set_attribute_name(6, " ")
+				self._osd.set_attribute(7, " ")
+				self._osd.set_attribute_name(7, " ")
 			else:
-				self._osd.attributes[0] = " "
-				self._osd.attribute_names[0] = " "
-				self._osd.attributes[1] = " "
-				self._osd.attribute_names[1] = " "
-				self._osd.attributes[2] = " "
-				self._osd.attribute_names[2] = " "
-				self._osd.attributes[3] = " "
-				self._osd.attribute_names[3] = " "
-				self._osd.attributes[4] = " "
-				self._osd.attribute_names[4] = " "
-				self._osd.attributes[5] = " "
-				self._osd.attribute_names[5] = " "
-				self._osd.attributes[6] = " "
-				self._osd.attribute_names[6] = " "
-				self._osd.attributes[7] = " "
-				self._osd.attribute_names[7] = " "
+				self._osd.set_attribute(0, " ")
+				self._osd.set_attribute_name(0, " ")
+				self._osd.set_attribute(1, " ")
+				self._osd.set_attribute_name(1, " ")
+				self._osd.set_attribute(2, " ")
+				self._osd.set_attribute_name(2, " ")
+				self._osd.set_attribute(3, " ")
+				self._osd.set_attribute_name(3, " ")
+				self._osd.set_attribute(4, " ")
+				self._osd.set_attribute_name(4, " ")
+				self._osd.set_attribute(5, " ")
+				self._osd.set_attribute_name(5, " ")
+				self._osd.set_attribute(6, " ")
+				self._osd.set_attribute_name(6, " ")
+				self._osd.set_attribute(7, " ")
+				self._osd.set_attribute_name(7, " ")
 
 			if self._selected_track != None:
 				if self._lock_to_track and self._is_locked:
-					self._osd.info[0] = "track : " + self._selected_track.name + " (locked)"
+					self._osd.set_info(0, "track : " + self._selected_track.name + " (locked)")
 				else:
-					self._osd.info[0] = "track : " + self._selected_track.name
+					self._osd.set_info(0, "track : " + self._selected_track.name)
 			else:
-				self._osd.info[0] = " "
+				self._osd.set_info(0, " ")
 			if self._clip != None:
 				name = self._clip.name
 				if name == "":
 					name = "(unamed clip)"
 				if not self._lock_to_track and self._is_locked:
-					self._osd.info[1] = "clip : " + name + " (locked)"
+					self._osd.set_info(1, "clip : " + name + " (locked)")
 				else:
-					self._osd.info[1] = "clip : " + name
+					self._osd.set_info(1, "clip : " + name)
 			else:
-				self._osd.info[1] = "no clip selected"
+				self._osd.set_info(1, "no clip selected")
 			self._osd.update()
 
 	def _update_mode_button(self):
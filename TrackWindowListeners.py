@@ -0,0 +1,65 @@
+class TrackWindowListeners(object):
+	""" Listens to properties of the tracks shown in a window of the session and calls back with the index
+	of the track in the window. When the window moves, only the tracks that enter or leave it are
+	subscribed or unsubscribed: the ones that stay keep their listeners and get their new index.
+	properties are (property, condition) pairs, a property is only listened to on the tracks
+	whose condition attribute is true, or on all of them when it is None """
+
+	def __init__(self, properties, callback):
+		self._properties = properties
+		self._callback = callback
+		# [track, index, ((property, listener), ...)] in window order
+		self._entries = []
+		self.subscriptions = 0
+
+	def set_tracks(self, tracks):
+		previous = self._entries
+		entries = []
+		for index, track in enumerate(tracks):
+			if track == None:
+				continue
+			entry = None
+			for position, candidate in enumerate(previous):
+				if candidate[0] == track:
+					entry = previous.pop(position)
+					break
+			if entry == None:
+				entry = self._subscribe(track)
+			entry[1] = index
+			entries.append(entry)
+		for entry in previous:
+			self._unsubscribe(entry)
+		self._entries = entries
+
+	def disconnect(self):
+		for entry in self._entries:
+			self._unsubscribe(entry)
+		self._entries = []
+
+	def _subscribe(self, track):
+		entry = [track, None, ()]
+		listeners = []
+		for name, condition in self._properties:
+			if condition == None or getattr(track, condition):
+				listener = self._listener(entry)
+				getattr(track, "add_" + name + "_listener")(listener)
+				listeners.append((name, listener))
+		entry[2] = tuple(listeners)
+		self.subscriptions += len(listeners)
+		return entry
+
+	def _unsubscribe(self, entry):
+		track = entry[0]
+		if track == None:
+			# deleted tracks compare equal to None, their listeners went with them
+			entry[2] = ()
+			return
+		for name, listener in entry[2]:
+			remove = getattr(track, "remove_" + name + "_listener")
+			if getattr(track, name + "_has_listener")(listener):
+				remove(listener)
+		entry[2] = ()
+
+	def _listener(self, entry):
+		# the index is read when notified, the window may have moved since the listener was added
+		return lambda: self._callback(entry[1])
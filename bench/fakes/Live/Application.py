@@ -0,0 +1,91 @@
+import random
+
+from .Base import LiveObject
+
+_random = random.Random(95)
+_application = None
+
+
+def encrypt_challenge2(challenge):
+    h = (challenge * 2654435761) & 0xFFFFFFFF
+    return (h & 127) | ((h >> 7 & 127) << 8)
+
+
+def encrypt_challenge(challenge):
+    return encrypt_challenge2(challenge)
+
+
+def get_random_int(min_value, max_value):
+    return _random.randint(min_value, max_value)
+
+
+def combine_apcs():
+    return False
+
+
+class ApplicationView(LiveObject):
+    """ Tracks which views are visible; listeners take a view name. """
+
+    def __init__(self):
+        LiveObject.__init__(self)
+        self._visible = set(['Session', 'Detail', 'Detail/Clip'])
+        self._view_listeners = {}
+
+    def is_view_visible(self, name):
+        return name in self._visible
+
+    def show_view(self, name):
+        self._set_visible(name, True)
+
+    def hide_view(self, name):
+        self._set_visible(name, False)
+
+    def focus_view(self, name):
+        self._set_visible(name, True)
+
+    def _set_visible(self, name, visible):
+        if (name in self._visible) != visible:
+            if visible:
+                self._visible.add(name)
+            else:
+                self._visible.discard(name)
+            for callback in list(self._view_listeners.get(name, ())):
+                callback()
+
+    def add_is_view_visible_listener(self, name, callback):
+        self._view_listeners.setdefault(name, []).append(callback)
+
+    def remove_is_view_visible_listener(self, name, callback):
+        callbacks = self._view_listeners.get(name, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def is_view_visible_has_listener(self, name, callback):
+        return callback in self._view_listeners.get(name, ())
+
+
+class Application(LiveObject):
+
+    def __init__(self):
+        LiveObject.__init__(self)
+        self._view = ApplicationView()
+
+    @property
+    def view(self):
+        return self._view
+
+    def get_major_version(self):
+        return 11
+
+    def get_minor_version(self):
+        return 3
+
+    def get_bugfix_version(self):
+        return 0
+
+
+def get_application():
+    global _application
+    if _application is None:
+        _application = Application()
+    return _application
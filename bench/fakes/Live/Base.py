@@ -0,0 +1,77 @@
+"""
+In-memory stand-in for Live.Base plus the listenable object used by every
+fake Live class.
+
+Live objects expose properties with add_<prop>_listener,
+remove_<prop>_listener and <prop>_has_listener accessors. LiveObject
+generates these on demand and fires the listeners whenever a public
+attribute is assigned a different value.
+"""
+from functools import partial
+
+_MISSING = object()
+
+
+class LimitationError(Exception):
+    pass
+
+
+def log(*a):
+    pass
+
+
+class LiveObject(object):
+    _next_live_ptr = [1]
+
+    def __init__(self, **props):
+        object.__setattr__(self, '_listeners', {})
+        object.__setattr__(self, '_live_ptr', LiveObject._next_live_ptr[0])
+        LiveObject._next_live_ptr[0] += 1
+        for name, value in props.items():
+            object.__setattr__(self, name, value)
+
+    def __getattr__(self, name):
+        if name.startswith('add_') and name.endswith('_listener'):
+            return partial(self._add_listener, name[4:-9])
+        if name.startswith('remove_') and name.endswith('_listener'):
+            return partial(self._remove_listener, name[7:-9])
+        if name.endswith('_has_listener'):
+            return partial(self._has_listener, name[:-13])
+        raise AttributeError("%s has no attribute '%s'" % (type(self).__name__, name))
+
+    def __setattr__(self, name, value):
+        if name.startswith('_') or isinstance(getattr(type(self), name, None), property):
+            object.__setattr__(self, name, value)
+            return
+        old = getattr(self, name, _MISSING)
+        object.__setattr__(self, name, value)
+        if old is _MISSING or old != value:
+            self.notify(name)
+
+    def _add_listener(self, prop, callback):
+        callbacks = self._listeners.setdefault(prop, [])
+        if callback in callbacks:
+            raise RuntimeError('Listener already connected')
+        callbacks.append(callback)
+
+    def _remove_listener(self, prop, callback):
+        callbacks = self._listeners.get(prop, [])
+        if callback not in callbacks:
+            raise RuntimeError('Listener not connected')
+        callbacks.remove(callback)
+
+    def _has_listener(self, prop, callback):
+        return callback in self._listeners.get(prop, ())
+
+    def listener_count(self, prop=None):
+        if prop is not None:
+            return len(self._listeners.get(prop, ()))
+        return sum(len(callbacks) for callbacks in self._listeners.values())
+
+    def notify(self, prop):
+        for callback in list(self._listeners.get(prop, ())):
+            callback()
+
+    def set_silently(self, name, value):
+        """ Assigns a property without firing its listeners. """
+        object.__setattr__(self, name, value)
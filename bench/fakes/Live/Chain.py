@@ -0,0 +1,9 @@
+from .Base import LiveObject
+
+
+class Chain(LiveObject):
+
+    def __init__(self, name='Chain', devices=(), canonical_parent=None):
+        LiveObject.__init__(self, name=name, mute=False, solo=False,
+                            canonical_parent=canonical_parent)
+        self.devices = tuple(devices)
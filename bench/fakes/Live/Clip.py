@@ -0,0 +1,239 @@
+"""
+Fake Live.Clip with both the legacy selection based note API and the
+Live 11 note-ID API. Every call is counted in `stats` so the harness can
+report how many notes crossed the script/Live boundary.
+"""
+from collections import Counter
+
+from .Base import LiveObject
+
+
+class MidiNoteSpecification(object):
+
+    def __init__(self, pitch, start_time, duration, velocity=100, mute=False,
+                 probability=1.0, velocity_deviation=0.0, release_velocity=64):
+        self.pitch = pitch
+        self.start_time = start_time
+        self.duration = duration
+        self.velocity = velocity
+        self.mute = mute
+        self.probability = probability
+        self.velocity_deviation = velocity_deviation
+        self.release_velocity = release_velocity
+
+
+class MidiNote(object):
+
+    def __init__(self, note_id, pitch, start_time, duration, velocity=100,
+                 mute=False, probability=1.0, velocity_deviation=0.0,
+                 release_velocity=64):
+        self.note_id = note_id
+        self.pitch = pitch
+        self.start_time = start_time
+        self.duration = duration
+        self.velocity = velocity
+        self.mute = mute
+        self.probability = probability
+        self.velocity_deviation = velocity_deviation
+        self.release_velocity = release_velocity
+
+    def copy(self):
+        return MidiNote(self.note_id, self.pitch, self.start_time,
+                        self.duration, self.velocity, self.mute,
+                        self.probability, self.velocity_deviation,
+                        self.release_velocity)
+
+    def as_tuple(self):
+        return (self.pitch, self.start_time, self.duration, self.velocity,
+                self.mute)
+
+
+class ClipView(LiveObject):
+
+    def __init__(self):
+        LiveObject.__init__(self, grid_quantization=0, grid_is_triplet=False)
+
+    def show_loop(self):
+        pass
+
+    def hide_envelope(self):
+        pass
+
+
+class Clip(LiveObject):
+
+    def __init__(self, length=4.0, name='', color=None, is_midi_clip=True,
+                 canonical_parent=None):
+        LiveObject.__init__(
+            self, name=name, color=color, length=length,
+            loop_start=0.0, loop_end=length, start_marker=0.0,
+            end_marker=length, looping=True, is_midi_clip=is_midi_clip,
+            is_audio_clip=not is_midi_clip, is_playing=False,
+            is_triggered=False, is_recording=False,
+            will_record_on_start=False, playing_position=0.0,
+            playing_status=0, muted=False, signature_numerator=4,
+            signature_denominator=4, canonical_parent=canonical_parent)
+        self._notes = {}
+        self._next_note_id = 1
+        self._selection = None
+        self._view = ClipView()
+        self.stats = Counter()
+
+    @property
+    def view(self):
+        return self._view
+
+    # internal helpers
+    def _sorted(self, notes):
+        return sorted(notes, key=lambda n: (n.start_time, n.pitch))
+
+    def _add(self, pitch, start_time, duration, velocity=100, mute=False,
+             probability=1.0, velocity_deviation=0.0, release_velocity=64):
+        note_id = self._next_note_id
+        self._next_note_id += 1
+        self._notes[note_id] = MidiNote(note_id, pitch, start_time, duration,
+                                        velocity, mute, probability,
+                                        velocity_deviation, release_velocity)
+        return note_id
+
+    def _changed(self):
+        self.notify('notes')
+
+    def load_notes(self, notes):
+        """ Harness helper: replaces the clip content without notifying. """
+        self._notes = {}
+        for note in notes:
+            self._add(*note[:5])
+
+    def note_count(self):
+        return len(self._notes)
+
+    # legacy selection based API
+    def select_all_notes(self):
+        self.stats['select_all_notes'] += 1
+        self._selection = set(self._notes)
+
+    def deselect_all_notes(self):
+        self.stats['deselect_all_notes'] += 1
+        self._selection = set()
+
+    def get_selected_notes(self):
+        self.stats['get_selected_notes'] += 1
+        selected = [self._notes[i] for i in (self._selection or ())
+                    if i in self._notes]
+        self.stats['notes_read'] += len(selected)
+        return tuple(n.as_tuple() for n in self._sorted(selected))
+
+    def replace_selected_notes(self, notes):
+        self.stats['replace_selected_notes'] += 1
+        self.stats['notes_written'] += len(notes)
+        for note_id in list(self._selection or ()):
+            self._notes.pop(note_id, None)
+        self._selection = set(self._add(*note[:5]) for note in notes)
+        self._changed()
+
+    def set_notes(self, notes):
+        self.stats['set_notes'] += 1
+        self.stats['notes_written'] += len(notes)
+        for note in notes:
+            self._add(*note[:5])
+        self._changed()
+
+    def _in_range(self, note, from_time, from_pitch, time_span, pitch_span):
+        return (from_pitch <= note.pitch < from_pitch + pitch_span and
+                from_time <= note.start_time < from_time + time_span)
+
+    def get_notes(self, from_time, from_pitch, time_span, pitch_span):
+        self.stats['get_notes'] += 1
+        notes = [n for n in self._notes.values()
+                 if self._in_range(n, from_time, from_pitch, time_span, pitch_span)]
+        self.stats['notes_read'] += len(notes)
+        return tuple(n.as_tuple() for n in self._sorted(notes))
+
+    def remove_notes(self, from_time, from_pitch, time_span, pitch_span):
+        self.stats['remove_notes'] += 1
+        for note_id, note in list(self._notes.items()):
+            if self._in_range(note, from_time, from_pitch, time_span, pitch_span):
+                del self._notes[note_id]
+        self._changed()
+
+    # Live 11 note-ID API
+    def get_notes_extended(self, from_pitch, pitch_span, from_time, time_span):
+        self.stats['get_notes_extended'] += 1
+        notes = [n.copy() for n in self._notes.values()
+                 if self._in_range(n, from_time, from_pitch, time_span, pitch_span)]
+        self.stats['notes_read'] += len(notes)
+        return self._sorted(notes)
+
+    def get_all_notes_extended(self):
+        self.stats['get_all_notes_extended'] += 1
+        self.stats['notes_read'] += len(self._notes)
+        return self._sorted(n.copy() for n in self._notes.values())
+
+    def get_notes_by_id(self, note_ids):
+        self.stats['get_notes_by_id'] += 1
+        notes = [self._notes[i].copy() for i in note_ids if i in self._notes]
+        self.stats['notes_read'] += len(notes)
+        return notes
+
+    def add_new_notes(self, specifications):
+        self.stats['add_new_notes'] += 1
+        self.stats['notes_written'] += len(specifications)
+        ids = tuple(self._add(s.pitch, s.start_time, s.duration, s.velocity,
+                              s.mute, s.probability, s.velocity_deviation,
+                              s.release_velocity) for s in specifications)
+        self._changed()
+        return ids
+
+    def remove_notes_by_id(self, note_ids):
+        self.stats['remove_notes_by_id'] += 1
+        self.stats['notes_written'] += len(note_ids)
+        for note_id in note_ids:
+            self._notes.pop(note_id, None)
+        self._changed()
+
+    def remove_notes_extended(self, from_pitch, pitch_span, from_time, time_span):
+        self.stats['remove_notes_extended'] += 1
+        for note_id, note in list(self._notes.items()):
+            if self._in_range(note, from_time, from_pitch, time_span, pitch_span):
+                del self._notes[note_id]
+        self._changed()
+
+    def apply_note_modifications(self, notes):
+        self.stats['apply_note_modifications'] += 1
+        self.stats['notes_written'] += len(notes)
+        for note in notes:
+            if note.note_id in self._notes:
+                self._notes[note.note_id] = note.copy()
+        self._changed()
+
+    # transport
+    def fire(self, *a, **k):
+        self.is_triggered = True
+
+    def stop(self):
+        self.is_playing = False
+        self.is_triggered = False
+
+    def set_fire_button_state(self, state):
+        pass
+
+    def quantize(self, grid, amount):
+        pass
+
+    def duplicate_loop(self):
+        self.loop_end = self.loop_start + (self.loop_end - self.loop_start) * 2
+        self.length = self.loop_end - self.loop_start
+
+
+class LegacyClip(Clip):
+    """ A clip as seen by Live 10 and older: no note-ID API. """
+
+    _live11_api = ('get_notes_extended', 'get_all_notes_extended',
+                   'get_notes_by_id', 'add_new_notes', 'remove_notes_by_id',
+                   'remove_notes_extended', 'apply_note_modifications')
+
+    def __getattribute__(self, name):
+        if name in LegacyClip._live11_api:
+            raise AttributeError(name)
+        return Clip.__getattribute__(self, name)
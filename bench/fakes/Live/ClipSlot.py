@@ -0,0 +1,46 @@
+from .Base import LiveObject
+from .Clip import Clip
+
+
+class ClipSlot(LiveObject):
+
+    def __init__(self, canonical_parent=None, has_stop_button=True):
+        LiveObject.__init__(self, clip=None, has_clip=False, is_playing=False,
+                            is_triggered=False, is_recording=False,
+                            is_group_slot=False, controls_other_clips=False,
+                            playing_status=0, has_stop_button=has_stop_button,
+                            will_record_on_start=False, color=None,
+                            canonical_parent=canonical_parent)
+
+    def set_clip(self, clip):
+        if clip is not None:
+            clip.set_silently('canonical_parent', self)
+        self.clip = clip
+        self.has_clip = clip is not None
+
+    def create_clip(self, length):
+        if self.has_clip:
+            raise RuntimeError('Clip slot is not empty')
+        self.set_clip(Clip(length=length))
+
+    def delete_clip(self):
+        self.set_clip(None)
+
+    def fire(self, *a, **k):
+        if self.has_clip:
+            self.clip.fire()
+        self.is_triggered = True
+
+    def stop(self):
+        self.is_triggered = False
+        if self.has_clip:
+            self.clip.stop()
+
+    def set_fire_button_state(self, state):
+        pass
+
+    def duplicate_clip_to(self, target):
+        if self.has_clip:
+            clip = Clip(length=self.clip.length, name=self.clip.name)
+            clip.load_notes(n.as_tuple() for n in self.clip._notes.values())
+            target.set_clip(clip)
@@ -0,0 +1,69 @@
+from .Base import LiveObject
+from .DeviceParameter import DeviceParameter
+
+
+class DeviceType(object):
+    undefined = 0
+    instrument = 1
+    audio_effect = 2
+    midi_effect = 4
+
+
+class DeviceView(LiveObject):
+
+    def __init__(self):
+        LiveObject.__init__(self, is_collapsed=False, selected_drum_pad=None,
+                            selected_chain=None, drum_pads_scroll_position=0)
+
+
+class DrumPad(LiveObject):
+
+    def __init__(self, note, chains=(), canonical_parent=None):
+        LiveObject.__init__(self, note=note, name='Pad %d' % note, mute=False,
+                            solo=False, canonical_parent=canonical_parent)
+        self.chains = tuple(chains)
+
+
+class Device(LiveObject):
+
+    def __init__(self, name='Device', class_name='OriginalSimpler',
+                 type=DeviceType.instrument, parameter_count=17,
+                 canonical_parent=None):
+        LiveObject.__init__(self, name=name, class_name=class_name,
+                            class_display_name=class_name, type=type,
+                            is_active=True, can_have_chains=False,
+                            can_have_drum_pads=False, has_drum_pads=False,
+                            canonical_parent=canonical_parent)
+        self._view = DeviceView()
+        params = [DeviceParameter('Device On', 1.0, 0.0, 1.0,
+                                  is_quantized=True, canonical_parent=self)]
+        for index in range(parameter_count - 1):
+            params.append(DeviceParameter('%s P%d' % (name, index + 1),
+                                          0.0, 0.0, 1.0, canonical_parent=self))
+        self.parameters = tuple(params)
+        self.chains = ()
+        self.drum_pads = ()
+        self.visible_drum_pads = ()
+
+    @property
+    def view(self):
+        return self._view
+
+    def store_chosen_bank(self, script_index, bank_index):
+        pass
+
+
+class RackDevice(Device):
+
+    def __init__(self, name='Drum Rack', drum=True, **k):
+        Device.__init__(self, name=name, class_name='DrumGroupDevice', **k)
+        self.set_silently('can_have_chains', True)
+        self.set_silently('can_have_drum_pads', drum)
+        self.set_silently('has_drum_pads', drum)
+        if drum:
+            from .Chain import Chain
+            self.drum_pads = tuple(
+                DrumPad(note, chains=(Chain(canonical_parent=self),) if 36 <= note < 52 else ())
+                for note in range(128))
+            self.visible_drum_pads = self.drum_pads[36:52]
+            self._view.set_silently('selected_drum_pad', self.drum_pads[36])
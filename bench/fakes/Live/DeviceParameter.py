@@ -0,0 +1,53 @@
+from .Base import LiveObject
+
+
+class ParameterState(object):
+    enabled = 0
+    irrelevant = 1
+    disabled = 2
+
+
+class DeviceParameter(LiveObject):
+    """ Parameter with range checking; writes are counted per instance. """
+
+    def __init__(self, name='Param', value=0.0, min=0.0, max=1.0,
+                 is_quantized=False, default_value=None,
+                 canonical_parent=None):
+        LiveObject.__init__(self, name=name, original_name=name, min=min,
+                            max=max, is_quantized=is_quantized,
+                            is_enabled=True, state=ParameterState.enabled,
+                            automation_state=0,
+                            canonical_parent=canonical_parent)
+        self._value = float(value)
+        self._default_value = float(min if default_value is None else default_value)
+        self.set_silently('default_value', self._default_value)
+        self.value_items = ()
+        self.writes = 0
+
+    def _get_value(self):
+        return self._value
+
+    def _set_value(self, value):
+        if value < self.min or value > self.max:
+            raise RuntimeError('Invalid value')
+        self.writes += 1
+        if value != self._value:
+            self._value = value
+            self.notify('value')
+
+    value = property(_get_value, _set_value)
+
+    def __str__(self):
+        return '%.2f' % self._value
+
+    def str_for_value(self, value):
+        return '%.2f' % value
+
+    def begin_gesture(self):
+        pass
+
+    def end_gesture(self):
+        pass
+
+    def re_enable_automation(self):
+        pass
@@ -0,0 +1,31 @@
+class MapMode(object):
+    absolute = 0
+    absolute_14_bit = 1
+    relative_signed_bit = 2
+    relative_binary_offset = 3
+    relative_two_compliment = 4
+    relative_signed_bit2 = 5
+    relative_smooth_signed_bit = 6
+    relative_smooth_binary_offset = 7
+    relative_smooth_two_compliment = 8
+    relative_smooth_signed_bit2 = 9
+
+
+def forward_midi_cc(script_handle, midi_map_handle, channel, cc):
+    return midi_map_handle.forward('cc', channel, cc)
+
+
+def forward_midi_note(script_handle, midi_map_handle, channel, note):
+    return midi_map_handle.forward('note', channel, note)
+
+
+def map_midi_cc(midi_map_handle, parameter, channel, cc, map_mode, avoid_takeover):
+    return midi_map_handle.map_parameter('cc', channel, cc, parameter)
+
+
+def map_midi_note(midi_map_handle, parameter, channel, note):
+    return midi_map_handle.map_parameter('note', channel, note, parameter)
+
+
+def send_feedback_for_parameter(midi_map_handle, parameter):
+    pass
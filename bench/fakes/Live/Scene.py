@@ -0,0 +1,19 @@
+from .Base import LiveObject
+
+
+class Scene(LiveObject):
+
+    def __init__(self, name='', clip_slots=(), canonical_parent=None):
+        LiveObject.__init__(self, name=name, color=None, is_triggered=False,
+                            is_empty=False, tempo=-1.0,
+                            canonical_parent=canonical_parent)
+        self.clip_slots = tuple(clip_slots)
+
+    def fire(self, *a, **k):
+        self.is_triggered = True
+
+    def fire_as_selected(self, *a, **k):
+        self.fire()
+
+    def set_fire_button_state(self, state):
+        pass
@@ -0,0 +1,153 @@
+from .Base import LiveObject
+
+
+class Quantization(object):
+    q_no_q = 0
+    q_8_bars = 1
+    q_4_bars = 2
+    q_2_bars = 3
+    q_bar = 4
+    q_half = 5
+    q_half_triplet = 6
+    q_quarter = 7
+    q_quarter_triplet = 8
+    q_eight = 9
+    q_eight_triplet = 10
+    q_sixtenth = 11
+    q_sixtenth_triplet = 12
+    q_thirtytwoth = 13
+
+
+class RecordingQuantization(object):
+    rec_q_no_q = 0
+    rec_q_quarter = 1
+    rec_q_eight = 2
+    rec_q_eight_triplet = 3
+    rec_q_eight_eight_triplet = 4
+    rec_q_sixtenth = 5
+    rec_q_sixtenth_triplet = 6
+    rec_q_sixtenth_sixtenth_triplet = 7
+    rec_q_thirtysecond = 8
+
+
+class CaptureMode(object):
+    all = 0
+    all_except_selected = 1
+
+
+class SessionRecordStatus(object):
+    off = 0
+    transition = 1
+    on = 2
+
+
+_SCALES = (
+    ('Major', (0, 2, 4, 5, 7, 9, 11)),
+    ('Minor', (0, 2, 3, 5, 7, 8, 10)),
+    ('Dorian', (0, 2, 3, 5, 7, 9, 10)),
+    ('Mixolydian', (0, 2, 4, 5, 7, 9, 10)),
+    ('Lydian', (0, 2, 4, 6, 7, 9, 11)),
+    ('Phrygian', (0, 1, 3, 5, 7, 8, 10)),
+    ('Locrian', (0, 1, 3, 5, 6, 8, 10)),
+    ('Whole Tone', (0, 2, 4, 6, 8, 10)),
+    ('Half-whole Dim.', (0, 1, 3, 4, 6, 7, 9, 10)),
+    ('Whole-half Dim.', (0, 2, 3, 5, 6, 8, 9, 11)),
+    ('Minor Blues', (0, 3, 5, 6, 7, 10)),
+    ('Minor Pentatonic', (0, 3, 5, 7, 10)),
+    ('Major Pentatonic', (0, 2, 4, 7, 9)),
+    ('Harmonic Minor', (0, 2, 3, 5, 7, 8, 11)),
+    ('Melodic Minor', (0, 2, 3, 5, 7, 9, 11)),
+    ('Chromatic', (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11)),
+)
+
+
+def get_all_scales_ordered():
+    return _SCALES
+
+
+class SongView(LiveObject):
+
+    def __init__(self, song):
+        LiveObject.__init__(self, selected_track=None, selected_scene=None,
+                            detail_clip=None, highlighted_clip_slot=None,
+                            selected_parameter=None, selected_chain=None)
+        self._song = song
+
+    def select_device(self, device):
+        self._song.appointed_device = device
+        track = device.canonical_parent if device is not None else None
+        if track is not None and hasattr(track, 'view'):
+            track.view.selected_device = device
+
+
+class Song(LiveObject):
+
+    def __init__(self):
+        LiveObject.__init__(
+            self, tracks=(), visible_tracks=(), return_tracks=(),
+            master_track=None, scenes=(), tempo=120.0, metronome=False,
+            is_playing=False, current_song_time=0.0,
+            clip_trigger_quantization=Quantization.q_bar,
+            midi_recording_quantization=RecordingQuantization.rec_q_no_q,
+            session_record=False,
+            session_record_status=SessionRecordStatus.off,
+            root_note=0, scale_name='Major', signature_numerator=4,
+            signature_denominator=4, can_undo=False, can_redo=False,
+            exclusive_arm=True, select_on_launch=True, swing_amount=0.0,
+            appointed_device=None, overdub=False, record_mode=False,
+            nudge_up=False, nudge_down=False, groove_amount=1.0)
+        self._view = SongView(self)
+        self.undo_steps = 0
+
+    @property
+    def view(self):
+        return self._view
+
+    def set_content(self, tracks, return_tracks, master_track, scenes):
+        self.set_silently('tracks', tuple(tracks))
+        self.set_silently('visible_tracks', tuple(tracks))
+        self.set_silently('return_tracks', tuple(return_tracks))
+        self.set_silently('master_track', master_track)
+        self.set_silently('scenes', tuple(scenes))
+        self._view.set_silently('selected_track', tracks[0] if tracks else None)
+        self._view.set_silently('selected_scene', scenes[0] if scenes else None)
+
+    def undo(self):
+        pass
+
+    def redo(self):
+        pass
+
+    def begin_undo_step(self):
+        self.undo_steps += 1
+
+    def end_undo_step(self):
+        pass
+
+    def tap_tempo(self):
+        pass
+
+    def continue_playing(self):
+        self.is_playing = True
+
+    def start_playing(self):
+        self.is_playing = True
+
+    def stop_playing(self):
+        self.is_playing = False
+
+    def stop_all_clips(self, quantized=True):
+        for track in self.tracks:
+            track.stop_all_clips()
+
+    def trigger_session_record(self, record_length=None):
+        self.session_record = True
+
+    def capture_and_insert_scene(self, mode=CaptureMode.all):
+        pass
+
+    def create_scene(self, index):
+        pass
+
+    def capture_midi(self, destination=0):
+        pass
@@ -0,0 +1,73 @@
+from .Base import LiveObject
+from .ClipSlot import ClipSlot
+from .DeviceParameter import DeviceParameter
+
+
+class TrackView(LiveObject):
+
+    def __init__(self):
+        LiveObject.__init__(self, selected_device=None, is_collapsed=False,
+                            device_insert_mode=0)
+
+    def select_instrument(self):
+        return False
+
+
+class MixerDevice(LiveObject):
+
+    def __init__(self, send_count=2, canonical_parent=None):
+        LiveObject.__init__(self, canonical_parent=canonical_parent,
+                            crossfade_assign=1)
+        self.volume = DeviceParameter('Track Volume', 0.85, 0.0, 1.0,
+                                      canonical_parent=self)
+        self.panning = DeviceParameter('Track Panning', 0.0, -1.0, 1.0,
+                                       canonical_parent=self)
+        self.track_activator = DeviceParameter('Speaker On', 1.0, 0.0, 1.0,
+                                               is_quantized=True,
+                                               canonical_parent=self)
+        self.sends = tuple(DeviceParameter('Send %s' % chr(65 + i), 0.0, 0.0,
+                                           1.0, canonical_parent=self)
+                           for i in range(send_count))
+
+
+class Track(LiveObject):
+
+    def __init__(self, name='Track', num_scenes=8, has_midi_input=True,
+                 send_count=2, is_return=False, canonical_parent=None):
+        LiveObject.__init__(
+            self, name=name, color=0, arm=False, solo=False, mute=False,
+            can_be_armed=not is_return, has_midi_input=has_midi_input,
+            has_audio_input=not has_midi_input, has_midi_output=False,
+            has_audio_output=True, is_foldable=False, fold_state=False,
+            is_grouped=False, is_visible=True, is_frozen=False,
+            implicit_arm=False, fired_slot_index=-1, playing_slot_index=-1,
+            output_meter_level=0.0, output_meter_left=0.0,
+            output_meter_right=0.0, muted_via_solo=False,
+            current_monitoring_state=1, canonical_parent=canonical_parent)
+        self._view = TrackView()
+        self.mixer_device = MixerDevice(send_count, canonical_parent=self)
+        self.clip_slots = tuple(ClipSlot(canonical_parent=self)
+                                for _ in range(0 if is_return else num_scenes))
+        self.devices = ()
+
+    @property
+    def view(self):
+        return self._view
+
+    def set_devices(self, devices):
+        for device in devices:
+            device.set_silently('canonical_parent', self)
+        self.devices = tuple(devices)
+        if devices:
+            self._view.set_silently('selected_device', devices[0])
+
+    def stop_all_clips(self, quantized=True):
+        for slot in self.clip_slots:
+            slot.stop()
+        self.playing_slot_index = -1
+        self.fired_slot_index = -1
+
+    def duplicate_clip_slot(self, index):
+        if index + 1 < len(self.clip_slots):
+            self.clip_slots[index].duplicate_clip_to(self.clip_slots[index + 1])
+        return index + 1
@@ -0,0 +1,15 @@
+"""
+In-memory stand-in for the subset of Ableton's Live module used by the
+Launchpad95 scripts. Only the behaviour the scripts rely on is modelled.
+"""
+from . import Base
+from . import Application
+from . import DeviceParameter
+from . import Clip
+from . import ClipSlot
+from . import Chain
+from . import Device
+from . import Scene
+from . import Track
+from . import Song
+from . import MidiMap
@@ -0,0 +1,100 @@
+from .InputControlElement import InputControlElement, MIDI_NOTE_TYPE
+from .Skin import Skin, SkinColorMissingError
+
+
+class ButtonValue(object):
+
+    def __init__(self, midi_value):
+        self.midi_value = midi_value
+
+    def __int__(self):
+        return self.midi_value
+
+    def __eq__(self, other):
+        try:
+            return int(other) == self.midi_value
+        except (TypeError, ValueError):
+            return False
+
+    def __hash__(self):
+        return hash(self.midi_value)
+
+
+ON_VALUE = ButtonValue(127)
+OFF_VALUE = ButtonValue(0)
+
+
+class Color(object):
+    """ A drawable colour: sends its midi value to the interface. """
+
+    def __init__(self, midi_value=0, *a, **k):
+        super(Color, self).__init__(*a, **k)
+        self._midi_value = midi_value
+
+    @property
+    def midi_value(self):
+        return self._midi_value
+
+    def __int__(self):
+        return self._midi_value
+
+    def draw(self, interface):
+        interface.send_value(self.midi_value)
+
+
+class ButtonElement(InputControlElement):
+
+    def __init__(self, is_momentary, msg_type, channel, identifier,
+                 skin=None, optimized_send_midi=True, *a, **k):
+        super(ButtonElement, self).__init__(
+            msg_type, channel, identifier,
+            optimized_send_midi=optimized_send_midi, *a, **k)
+        self._is_momentary = bool(is_momentary)
+        self._is_pressed = False
+        self._skin = skin if skin is not None else Skin()
+
+    def is_momentary(self):
+        return self._is_momentary
+
+    def is_pressed(self):
+        return self._is_pressed
+
+    def receive_value(self, value):
+        self._is_pressed = value != 0
+        super(ButtonElement, self).receive_value(value)
+
+    def turn_on(self):
+        self.send_value(ON_VALUE)
+
+    def turn_off(self):
+        self.send_value(OFF_VALUE)
+
+    def set_light(self, value):
+        if value is True:
+            self.turn_on()
+        elif value is False:
+            self.turn_off()
+        elif isinstance(value, str):
+            self._skin[value].draw(self)
+        else:
+            super(ButtonElement, self).set_light(value)
+
+    def send_value(self, value, **k):
+        if value is ON_VALUE:
+            self._do_send_on_value(**k)
+        elif value is OFF_VALUE:
+            self._do_send_off_value(**k)
+        else:
+            super(ButtonElement, self).send_value(value, **k)
+
+    def _do_send_on_value(self, **k):
+        try:
+            self._skin['DefaultButton.On'].draw(self)
+        except SkinColorMissingError:
+            super(ButtonElement, self).send_value(127, **k)
+
+    def _do_send_off_value(self, **k):
+        try:
+            self._skin['DefaultButton.Off'].draw(self)
+        except SkinColorMissingError:
+            super(ButtonElement, self).send_value(0, **k)
@@ -0,0 +1,81 @@
+from . import Dependency
+
+
+class ButtonMatrixElement(object):
+    """ Grid of buttons; listeners get (value, x, y, is_momentary). """
+
+    def __init__(self, rows=None, name='', *a, **k):
+        super(ButtonMatrixElement, self).__init__(*a, **k)
+        self.name = name
+        self._buttons = []
+        self._button_coordinates = {}
+        self._value_listeners = []
+        self._max_row_width = 0
+        surface = Dependency.current()
+        if surface is not None:
+            surface._register_control(self)
+        for row in rows or ():
+            self.add_row(row)
+
+    def add_row(self, buttons):
+        y = len(self._buttons)
+        for x, button in enumerate(buttons):
+            self._button_coordinates[button] = (x, y)
+            if button is not None:
+                button.add_value_listener(self._button_value, identify_sender=True)
+        self._buttons.append(list(buttons))
+        self._max_row_width = max(self._max_row_width, len(buttons))
+
+    def width(self):
+        return self._max_row_width
+
+    def height(self):
+        return len(self._buttons)
+
+    def get_button(self, column, row):
+        return self._buttons[row][column]
+
+    def iterbuttons(self):
+        for y, row in enumerate(self._buttons):
+            for x, button in enumerate(row):
+                yield (button, (x, y))
+
+    def __iter__(self):
+        for row in self._buttons:
+            for button in row:
+                yield button
+
+    def _button_value(self, value, sender):
+        x, y = self._button_coordinates[sender]
+        is_momentary = sender.is_momentary()
+        for callback in list(self._value_listeners):
+            callback(value, x, y, is_momentary)
+
+    def add_value_listener(self, callback, identify_sender=False):
+        if callback not in self._value_listeners:
+            self._value_listeners.append(callback)
+
+    def remove_value_listener(self, callback):
+        if callback in self._value_listeners:
+            self._value_listeners.remove(callback)
+
+    def value_has_listener(self, callback):
+        return callback in self._value_listeners
+
+    def value_listener_count(self):
+        return len(self._value_listeners)
+
+    def reset(self):
+        for button in self:
+            if button is not None:
+                button.reset()
+
+    def clear_send_cache(self):
+        pass
+
+    def install_connections(self, install_translation, install_mapping,
+                            install_forwarding):
+        pass
+
+    def disconnect(self):
+        self._value_listeners = []
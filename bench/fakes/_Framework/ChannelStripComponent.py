@@ -0,0 +1,168 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+from .SubjectSlot import SubjectSlot
+
+
+class ChannelStripComponent(ControlSurfaceComponent):
+    """ Connects one track's mixer controls and mute/solo/arm buttons. """
+
+    def __init__(self, *a, **k):
+        super(ChannelStripComponent, self).__init__(*a, **k)
+        self._track = None
+        self._send_controls = []
+        self._pan_control = None
+        self._volume_control = None
+        self._select_button = None
+        self._mute_button = None
+        self._solo_button = None
+        self._arm_button = None
+        self._invert_mute_feedback = False
+        self._track_slots = []
+
+    def set_track(self, track):
+        for slot in self._track_slots:
+            slot.disconnect()
+        self._track_slots = []
+        self._track = track
+        if track is not None:
+            self._track_slots.append(SubjectSlot(track, self._on_mute_changed, 'mute'))
+            self._track_slots.append(SubjectSlot(track, self._on_solo_changed, 'solo'))
+            if track.can_be_armed:
+                self._track_slots.append(SubjectSlot(track, self._on_arm_changed, 'arm'))
+        self.update()
+
+    def _set_button(self, attr, listener, button):
+        old = getattr(self, attr)
+        if old is not button:
+            if old is not None:
+                old.remove_value_listener(listener)
+            setattr(self, attr, button)
+            if button is not None:
+                button.add_value_listener(listener)
+            self.update()
+
+    def set_select_button(self, button):
+        self._set_button('_select_button', self._select_value, button)
+
+    def set_mute_button(self, button):
+        self._set_button('_mute_button', self._mute_value, button)
+
+    def set_solo_button(self, button):
+        self._set_button('_solo_button', self._solo_value, button)
+
+    def set_arm_button(self, button):
+        self._set_button('_arm_button', self._arm_value, button)
+
+    def set_volume_control(self, control):
+        if control is not self._volume_control:
+            self._release(self._volume_control)
+            self._volume_control = control
+            self.update()
+
+    def set_pan_control(self, control):
+        if control is not self._pan_control:
+            self._release(self._pan_control)
+            self._pan_control = control
+            self.update()
+
+    def set_send_controls(self, controls):
+        if controls != self._send_controls:
+            for control in self._send_controls or ():
+                self._release(control)
+            self._send_controls = controls
+            self.update()
+
+    def set_invert_mute_feedback(self, invert_feedback):
+        self._invert_mute_feedback = invert_feedback
+        self.update()
+
+    def _release(self, control):
+        if control is not None:
+            control.release_parameter()
+
+    def _pressed(self, value, button):
+        return self.is_enabled() and self._track is not None and (value != 0 or not button.is_momentary())
+
+    def _select_value(self, value):
+        if self._pressed(value, self._select_button):
+            self.song().view.selected_track = self._track
+
+    def _mute_value(self, value):
+        if self._pressed(value, self._mute_button):
+            self._track.mute = not self._track.mute
+
+    def _solo_value(self, value):
+        if self._pressed(value, self._solo_button):
+            self._track.solo = not self._track.solo
+
+    def _arm_value(self, value):
+        if self._pressed(value, self._arm_button) and self._track.can_be_armed:
+            self._track.arm = not self._track.arm
+
+    def _connect_parameters(self):
+        mixer = self._track.mixer_device
+        if self._volume_control is not None:
+            self._volume_control.connect_to(mixer.volume)
+        if self._pan_control is not None:
+            self._pan_control.connect_to(mixer.panning)
+        for index, control in enumerate(self._send_controls or ()):
+            if control is not None:
+                if index < len(mixer.sends):
+                    control.connect_to(mixer.sends[index])
+                else:
+                    control.release_parameter()
+
+    def _release_parameters(self):
+        for control in (self._volume_control, self._pan_control) + tuple(self._send_controls or ()):
+            self._release(control)
+
+    def update(self):
+        super(ChannelStripComponent, self).update()
+        if self._allow_updates:
+            if self.is_enabled():
+                if self._track is not None:
+                    self._connect_parameters()
+                else:
+                    self._release_parameters()
+                self._on_mute_changed()
+                self._on_solo_changed()
+                self._on_arm_changed()
+            else:
+                self._release_parameters()
+        else:
+            self._update_requests += 1
+
+    def _on_mute_changed(self):
+        if self.is_enabled() and self._mute_button is not None:
+            if self._track is not None and self._track.mute != self._invert_mute_feedback:
+                self._mute_button.turn_on()
+            else:
+                self._mute_button.turn_off()
+
+    def _on_solo_changed(self):
+        if self.is_enabled() and self._solo_button is not None:
+            if self._track is not None and self._track.solo:
+                self._solo_button.turn_on()
+            else:
+                self._solo_button.turn_off()
+
+    def _on_arm_changed(self):
+        if self.is_enabled() and self._arm_button is not None:
+            if self._track is not None and self._track.can_be_armed and self._track.arm:
+                self._arm_button.turn_on()
+            else:
+                self._arm_button.turn_off()
+
+    def disconnect(self):
+        for slot in self._track_slots:
+            slot.disconnect()
+        self._track_slots = []
+        for attr, listener in (('_select_button', self._select_value),
+                               ('_mute_button', self._mute_value),
+                               ('_solo_button', self._solo_value),
+                               ('_arm_button', self._arm_value)):
+            button = getattr(self, attr)
+            if button is not None:
+                button.remove_value_listener(listener)
+        self._release_parameters()
+        self._track = None
+        super(ChannelStripComponent, self).disconnect()
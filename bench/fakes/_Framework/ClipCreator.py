@@ -0,0 +1,12 @@
+class ClipCreator(object):
+
+    def __init__(self, *a, **k):
+        super(ClipCreator, self).__init__(*a, **k)
+        self.fixed_length = None
+        self.legato_launch = False
+
+    def create(self, slot, length=None, launch_quantization=None):
+        if length is None:
+            length = self.fixed_length or 4.0
+        slot.create_clip(length)
+        return slot.clip
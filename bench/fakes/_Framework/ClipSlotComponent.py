@@ -0,0 +1,175 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+from .SubjectSlot import subject_slot, SubjectSlot
+from .Util import in_range
+
+
+def _color_distance(a, b):
+    dr = (a >> 16 & 255) - (b >> 16 & 255)
+    dg = (a >> 8 & 255) - (b >> 8 & 255)
+    db = (a & 255) - (b & 255)
+    return dr * dr + dg * dg + db * db
+
+
+class ClipSlotComponent(ControlSurfaceComponent):
+
+    def __init__(self, *a, **k):
+        super(ClipSlotComponent, self).__init__(*a, **k)
+        self._clip_slot = None
+        self._triggered_to_play_value = 126
+        self._triggered_to_record_value = 121
+        self._started_value = 127
+        self._recording_value = 120
+        self._stopped_value = 0
+        self._record_button_value = None
+        self._clip_palette = {}
+        self._clip_rgb_table = None
+        self._has_fired_slot = False
+        self._slot_slots = []
+
+    def _enable_skinning(self):
+        self.set_triggered_to_play_value('Session.ClipTriggeredPlay')
+        self.set_triggered_to_record_value('Session.ClipTriggeredRecord')
+        self.set_started_value('Session.ClipStarted')
+        self.set_recording_value('Session.ClipRecording')
+        self.set_stopped_value('Session.ClipStopped')
+        self.set_record_button_value('Session.RecordButton')
+
+    def set_rgb_mode(self, color_palette, color_table, clip_slots_only=False):
+        self._clip_palette = color_palette
+        self._clip_rgb_table = color_table
+
+    def set_clip_slot(self, clip_slot):
+        self._clip_slot = clip_slot
+        self._connect_listeners()
+        self.update()
+
+    def _connect_listeners(self):
+        for slot in self._slot_slots:
+            slot.disconnect()
+        self._slot_slots = []
+        clip_slot = self._clip_slot
+        if clip_slot is None:
+            return
+        listen = lambda subject, event, cb: self._slot_slots.append(SubjectSlot(subject, cb, event))
+        for event in ('has_clip', 'controls_other_clips', 'is_triggered',
+                      'playing_status', 'has_stop_button', 'color'):
+            listen(clip_slot, event, self._on_slot_changed)
+        track = clip_slot.canonical_parent
+        if track is not None and getattr(track, 'can_be_armed', False):
+            listen(track, 'arm', self._on_slot_changed)
+        clip = clip_slot.clip if clip_slot.has_clip else None
+        if clip is not None:
+            for event in ('color', 'playing_status', 'is_recording'):
+                listen(clip, event, self._on_slot_changed)
+
+    def _on_slot_changed(self):
+        if self._clip_slot is not None:
+            has_clip = self._clip_slot.has_clip
+            if has_clip != getattr(self, '_had_clip', None):
+                self._had_clip = has_clip
+                self._connect_listeners()
+        self.update()
+
+    def set_launch_button(self, button):
+        if button != self._launch_button_value.subject:
+            self._launch_button_value.subject = button
+            self.update()
+
+    def set_triggered_to_play_value(self, value):
+        self._triggered_to_play_value = value
+
+    def set_triggered_to_record_value(self, value):
+        self._triggered_to_record_value = value
+
+    def set_started_value(self, value):
+        self._started_value = value
+
+    def set_recording_value(self, value):
+        self._recording_value = value
+
+    def set_stopped_value(self, value):
+        self._stopped_value = value
+        self._clip_palette = {}
+
+    def set_record_button_value(self, value):
+        self._record_button_value = value
+
+    def has_clip(self):
+        return self._clip_slot.has_clip
+
+    def update(self):
+        super(ClipSlotComponent, self).update()
+        self._has_fired_slot = False
+        button = self._launch_button_value.subject
+        if self._allow_updates:
+            if self.is_enabled() and button is not None:
+                value_to_send = self._feedback_value()
+                if value_to_send in (None, -1):
+                    button.turn_off()
+                elif in_range(value_to_send, 0, 128):
+                    button.send_value(value_to_send)
+                else:
+                    button.set_light(value_to_send)
+        else:
+            self._update_requests += 1
+
+    def _color_value(self, color):
+        value = None
+        if self._clip_palette:
+            value = self._clip_palette.get(color)
+        if value is None and self._clip_rgb_table is not None:
+            distances = [_color_distance(color, entry[1]) for entry in self._clip_rgb_table]
+            value = self._clip_rgb_table[distances.index(min(distances))][0]
+        return value
+
+    def _track_is_armed(self, track):
+        return track is not None and getattr(track, 'can_be_armed', False) and track.arm
+
+    def _feedback_value(self):
+        if self._clip_slot is not None:
+            track = self._clip_slot.canonical_parent
+            slot_or_clip = self._clip_slot.clip if self.has_clip() else self._clip_slot
+            if slot_or_clip.is_triggered:
+                if slot_or_clip.will_record_on_start:
+                    return self._triggered_to_record_value
+                return self._triggered_to_play_value
+            if slot_or_clip.is_playing:
+                if slot_or_clip.is_recording:
+                    return self._recording_value
+                return self._started_value
+            if slot_or_clip.color is not None:
+                color = self._color_value(slot_or_clip.color)
+                if color is not None:
+                    return color
+            if getattr(slot_or_clip, 'controls_other_clips', True) and self._stopped_value is not None:
+                return self._stopped_value
+            if self._track_is_armed(track) and self._clip_slot.has_stop_button and self._record_button_value is not None:
+                return self._record_button_value
+
+    @subject_slot('value')
+    def _launch_button_value(self, value):
+        if self.is_enabled():
+            self._do_launch_clip(value)
+
+    def _do_launch_clip(self, value):
+        button = self._launch_button_value.subject
+        launch_pressed = value or not button.is_momentary()
+        if self._clip_slot is not None:
+            if launch_pressed:
+                self._clip_slot.fire()
+            else:
+                self._clip_slot.set_fire_button_state(False)
+            if launch_pressed and self.song().select_on_launch:
+                self.song().view.highlighted_clip_slot = self._clip_slot
+
+    def _do_select_clip(self, clip_slot):
+        if self._clip_slot is not None:
+            if self.song().view.highlighted_clip_slot != self._clip_slot:
+                self.song().view.highlighted_clip_slot = self._clip_slot
+
+    def disconnect(self):
+        for slot in self._slot_slots:
+            slot.disconnect()
+        self._slot_slots = []
+        self._launch_button_value.subject = None
+        super(ClipSlotComponent, self).disconnect()
@@ -0,0 +1,36 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class CompoundComponent(ControlSurfaceComponent):
+
+    def __init__(self, *a, **k):
+        self._sub_components = []
+        super(CompoundComponent, self).__init__(*a, **k)
+
+    def register_components(self, *components):
+        for component in components:
+            self.register_component(component)
+        return components
+
+    def register_component(self, component):
+        if component not in self._sub_components:
+            self._sub_components.append(component)
+            component._is_sub_component = True
+            component._set_enabled_recursive(self.is_enabled())
+        return component
+
+    def _update_is_enabled(self):
+        super(CompoundComponent, self)._update_is_enabled()
+        is_enabled = self.is_enabled()
+        for component in getattr(self, '_sub_components', ()):
+            component._set_enabled_recursive(is_enabled)
+
+    def set_allow_update(self, allow_updates):
+        for component in self._sub_components:
+            component.set_allow_update(allow_updates)
+        super(CompoundComponent, self).set_allow_update(allow_updates)
+
+    def disconnect(self):
+        for component in self._sub_components:
+            component.disconnect()
+        super(CompoundComponent, self).disconnect()
@@ -0,0 +1,286 @@
+"""
+ControlSurface modelled on the Live 9/10 _Framework class: owns controls
+and components, accumulates optimized MIDI sends inside component_guard,
+installs forwarding/translation on build_midi_map and runs the task group
+from update_display (one tick per call, 100ms delta).
+"""
+import threading
+from contextlib import contextmanager
+
+import Live
+
+from . import Dependency
+from . import Task
+from .InputControlElement import MIDI_NOTE_TYPE, MIDI_CC_TYPE
+from .SubjectSlot import SubjectSlot
+
+
+class ControlSurface(object):
+
+    def __init__(self, c_instance=None, publish_self=True, *a, **k):
+        super(ControlSurface, self).__init__(*a, **k)
+        self._c_instance = c_instance
+        self.controls = []
+        self._components = []
+        self._device_component = None
+        self._forwarding_registry = {}
+        self._task_group = Task.TaskGroup(auto_kill=False, auto_remove=True)
+        self._in_guard = 0
+        self._rebuild_requests = 0
+        self._suppress_rebuild_requests = 0
+        self._midi_message_dict = None
+        self._midi_message_list = None
+        self._midi_lock = threading.RLock()
+        self._suggested_input_port = ''
+        self._suggested_output_port = ''
+        self._highlighting_session_component = None
+        song = self.song()
+        self._song_slots = [
+            SubjectSlot(song, self._on_track_list_changed, 'visible_tracks'),
+            SubjectSlot(song, self._on_scene_list_changed, 'scenes'),
+            SubjectSlot(song.view, self._on_selected_track_changed, 'selected_track'),
+            SubjectSlot(song.view, self._on_selected_scene_changed, 'selected_scene'),
+        ]
+
+    # environment
+    def song(self):
+        return self._c_instance.song()
+
+    def application(self):
+        return Live.Application.get_application()
+
+    def instance_identifier(self):
+        return self._c_instance.instance_identifier()
+
+    def log_message(self, *message):
+        self._c_instance.log_message(' '.join(str(m) for m in message))
+
+    def show_message(self, message):
+        self._c_instance.show_message(message)
+
+    # registration
+    def _register_control(self, control):
+        self.controls.append(control)
+
+    def _register_component(self, component):
+        self._components.append(component)
+
+    @property
+    def components(self):
+        return tuple(self._components)
+
+    def root_components(self):
+        return [c for c in self._components if not getattr(c, '_is_sub_component', False)]
+
+    # guard
+    @contextmanager
+    def component_guard(self):
+        if self._in_guard:
+            self._in_guard += 1
+            try:
+                yield
+            finally:
+                self._in_guard -= 1
+            return
+        self._in_guard = 1
+        Dependency.push(self)
+        self._suppress_rebuild_requests += 1
+        with self._midi_lock:
+            self._midi_message_dict = {}
+            self._midi_message_list = []
+        try:
+            yield
+        finally:
+            Dependency.pop()
+            self._in_guard = 0
+            self._flush_midi_messages()
+            self._suppress_rebuild_requests -= 1
+            if self._rebuild_requests > 0 and self._suppress_rebuild_requests == 0:
+                self._rebuild_requests = 0
+                self._c_instance.request_rebuild_midi_map()
+
+    def _flush_midi_messages(self):
+        with self._midi_lock:
+            messages = self._midi_message_dict
+            order = self._midi_message_list
+            self._midi_message_dict = None
+            self._midi_message_list = None
+        if messages:
+            for key in order:
+                self._do_send_midi(messages[key])
+
+    def request_rebuild_midi_map(self):
+        if self._suppress_rebuild_requests > 0:
+            self._rebuild_requests += 1
+        else:
+            self._c_instance.request_rebuild_midi_map()
+
+    # MIDI output
+    def _send_midi(self, midi_event_bytes, optimized=True):
+        with self._midi_lock:
+            if (optimized and self._midi_message_dict is not None and
+                    len(midi_event_bytes) == 3 and midi_event_bytes[0] != 240):
+                key = (midi_event_bytes[0], midi_event_bytes[1])
+                if key not in self._midi_message_dict:
+                    self._midi_message_list.append(key)
+                self._midi_message_dict[key] = midi_event_bytes
+                return True
+        return self._do_send_midi(midi_event_bytes)
+
+    def _do_send_midi(self, midi_event_bytes):
+        self._c_instance.send_midi(tuple(midi_event_bytes))
+        return True
+
+    # MIDI map
+    def build_midi_map(self, midi_map_handle):
+        self._forwarding_registry.clear()
+        self._midi_map_handle = midi_map_handle
+        for control in self.controls:
+            control.install_connections(self._translate_message,
+                                        self._install_mapping,
+                                        self._install_forwarding)
+
+    def _translate_message(self, type, from_identifier, from_channel,
+                           to_identifier, to_channel):
+        if type == MIDI_NOTE_TYPE:
+            self._c_instance.set_note_translation(from_identifier, from_channel,
+                                                  to_identifier, to_channel)
+        elif type == MIDI_CC_TYPE:
+            self._c_instance.set_cc_translation(from_identifier, from_channel,
+                                                to_identifier, to_channel)
+
+    def _install_mapping(self, control, parameter):
+        return Live.MidiMap.map_midi_cc(self._midi_map_handle, parameter, control.message_channel(),
+                                        control.message_identifier(), 0, True)
+
+    def _install_forwarding(self, control):
+        success = False
+        handle = self._c_instance.handle()
+        for status, identifier in control.identifier_bytes():
+            channel = status & 15
+            if status & 240 == 144:
+                success = Live.MidiMap.forward_midi_note(handle, self._midi_map_handle, channel, identifier)
+            elif status & 240 == 176:
+                success = Live.MidiMap.forward_midi_cc(handle, self._midi_map_handle, channel, identifier)
+            else:
+                success = True
+            if success:
+                self._forwarding_registry[(status, identifier)] = control
+        return success
+
+    # MIDI input
+    def receive_midi(self, midi_bytes):
+        with self.component_guard():
+            if len(midi_bytes) == 3 and midi_bytes[0] & 240 in (128, 144, 176, 224):
+                status, identifier, value = midi_bytes
+                if status & 240 == 128:
+                    status = 144 + (status & 15)
+                    value = 0
+                control = self._forwarding_registry.get((status, identifier))
+                if control is not None:
+                    control.receive_value(value)
+            else:
+                self.handle_sysex(midi_bytes)
+
+    def handle_sysex(self, midi_bytes):
+        pass
+
+    # lifecycle
+    def refresh_state(self):
+        with self.component_guard():
+            for control in self.controls:
+                control.clear_send_cache()
+            for component in self._components:
+                if component.is_enabled():
+                    component.update()
+
+    def update_display(self):
+        with self.component_guard():
+            self._task_group.update(0.1)
+
+    def schedule_message(self, delay_in_ticks, callback, parameter=None):
+
+        def message(delta):
+            if parameter:
+                callback(parameter)
+            else:
+                callback()
+
+        self._task_group.add(Task.SequenceTask([Task.delay(delay_in_ticks), message]))
+
+    def set_enabled(self, enable):
+        with self.component_guard():
+            for component in self.root_components():
+                component._set_enabled_recursive(enable)
+
+    def connect_script_instances(self, instanciated_scripts):
+        pass
+
+    def can_lock_to_devices(self):
+        return False
+
+    def suggest_input_port(self):
+        return self._suggested_input_port
+
+    def suggest_output_port(self):
+        return self._suggested_output_port
+
+    def suggest_map_mode(self, cc_no, channel):
+        return -1
+
+    def supports_pad_translation(self):
+        return False
+
+    # song listeners
+    def _on_track_list_changed(self):
+        with self.component_guard():
+            for component in list(self._components):
+                component.on_track_list_changed()
+
+    def _on_scene_list_changed(self):
+        with self.component_guard():
+            for component in list(self._components):
+                component.on_scene_list_changed()
+
+    def _on_selected_track_changed(self):
+        with self.component_guard():
+            for component in list(self._components):
+                component.on_selected_track_changed()
+
+    def _on_selected_scene_changed(self):
+        with self.component_guard():
+            for component in list(self._components):
+                component.on_selected_scene_changed()
+
+    # c_instance wrappers
+    def set_highlighting_session_component(self, session_component):
+        self._highlighting_session_component = session_component
+        session_component.set_highlighting_callback(self._set_session_highlight)
+
+    def _set_session_highlight(self, track_offset, scene_offset, width, height,
+                               include_return_tracks):
+        self._c_instance.set_session_highlight(track_offset, scene_offset, width,
+                                               height, include_return_tracks)
+
+    def set_device_component(self, device_component):
+        self._device_component = device_component
+
+    def set_feedback_channels(self, channels):
+        self._c_instance.set_feedback_channels(channels)
+
+    def set_controlled_track(self, track):
+        self._c_instance.set_controlled_track(track)
+
+    def release_controlled_track(self):
+        self._c_instance.release_controlled_track()
+
+    def disconnect(self):
+        for slot in self._song_slots:
+            slot.disconnect()
+        for component in list(self._components):
+            component.disconnect()
+        for control in self.controls:
+            control.disconnect()
+        self._task_group.clear()
+        self._components = []
+        self.controls = []
@@ -0,0 +1,97 @@
+from . import Dependency
+from . import Task
+
+
+class ControlSurfaceComponent(object):
+    """ Base component: enable state, allow-update batching and tasks. """
+
+    name = ''
+
+    def __init__(self, name='', is_enabled=True, is_root=False, *a, **k):
+        super(ControlSurfaceComponent, self).__init__(*a, **k)
+        self.name = name
+        self._explicit_is_enabled = is_enabled
+        self._recursive_is_enabled = True
+        self._allow_updates = True
+        self._update_requests = 0
+        self._tasks_group = None
+        self._is_root = is_root
+        self._last_is_enabled = self.is_enabled()
+        surface = Dependency.current()
+        self._control_surface_ref = surface
+        self._song = surface.song() if surface is not None else None
+        if surface is not None:
+            surface._register_component(self)
+
+    @property
+    def _is_enabled(self):
+        return self.is_enabled()
+
+    @property
+    def _tasks(self):
+        if self._tasks_group is None:
+            self._tasks_group = Task.TaskGroup()
+            surface = self._control_surface_ref
+            if surface is not None:
+                surface._task_group.add(self._tasks_group)
+        return self._tasks_group
+
+    def song(self):
+        return self._song
+
+    def application(self):
+        import Live
+        return Live.Application.get_application()
+
+    def is_enabled(self, explicit=False):
+        if explicit:
+            return self._explicit_is_enabled
+        return self._explicit_is_enabled and self._recursive_is_enabled
+
+    def set_enabled(self, enable):
+        self._explicit_is_enabled = bool(enable)
+        self._update_is_enabled()
+
+    def _set_enabled_recursive(self, enable):
+        self._recursive_is_enabled = bool(enable)
+        self._update_is_enabled()
+
+    def _update_is_enabled(self):
+        is_enabled = self.is_enabled()
+        if self._last_is_enabled != is_enabled:
+            self._last_is_enabled = is_enabled
+            self.on_enabled_changed()
+
+    def on_enabled_changed(self):
+        self.update()
+
+    def set_allow_update(self, allow_updates):
+        allow = bool(allow_updates)
+        if self._allow_updates != allow:
+            self._allow_updates = allow
+            if self._allow_updates and self._update_requests > 0:
+                self._update_requests = 0
+                self.update()
+
+    def update(self):
+        pass
+
+    def control_surface(self):
+        return self._control_surface_ref
+
+    def on_track_list_changed(self):
+        pass
+
+    def on_scene_list_changed(self):
+        pass
+
+    def on_selected_track_changed(self):
+        pass
+
+    def on_selected_scene_changed(self):
+        pass
+
+    def disconnect(self):
+        if self._tasks_group is not None:
+            self._tasks_group.kill()
+            self._tasks_group.clear()
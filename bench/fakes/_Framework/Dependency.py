@@ -0,0 +1,17 @@
+"""
+Stand-in for _Framework.Dependency: elements and components created inside
+ControlSurface.component_guard() find their surface here.
+"""
+_stack = []
+
+
+def push(surface):
+    _stack.append(surface)
+
+
+def pop():
+    _stack.pop()
+
+
+def current():
+    return _stack[-1] if _stack else None
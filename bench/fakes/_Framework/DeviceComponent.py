@@ -0,0 +1,107 @@
+import math
+
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class DeviceComponent(ControlSurfaceComponent):
+    """ Maps the selected bank of a device's parameters to 8 controls. """
+
+    def __init__(self, *a, **k):
+        super(DeviceComponent, self).__init__(*a, **k)
+        self._device = getattr(self, '_device', None)
+        self._parameter_controls = None
+        self._bank_up_button = None
+        self._bank_down_button = None
+        self._bank_index = 0
+        self._bank_name = '<No Bank>'
+        self._on_off_button = getattr(self, '_on_off_button', None)
+        self._lock_button = None
+        self._locked_to_device = False
+
+    def set_device(self, device):
+        if self._locked_to_device:
+            return
+        if device != getattr(self, '_last_device', None):
+            self._last_device = device
+            self._device = device
+            self._bank_index = 0
+            self.update()
+
+    def set_parameter_controls(self, controls):
+        if self._parameter_controls is not None:
+            for control in self._parameter_controls:
+                if self._device is not None:
+                    control.release_parameter()
+        self._parameter_controls = controls
+        self.update()
+
+    def set_bank_nav_buttons(self, down_button, up_button):
+        for attr, listener, button in (('_bank_down_button', self._bank_down_value, down_button),
+                                       ('_bank_up_button', self._bank_up_value, up_button)):
+            old = getattr(self, attr)
+            if old is not None:
+                old.remove_value_listener(listener)
+            setattr(self, attr, button)
+            if button is not None:
+                button.add_value_listener(listener)
+        self.update()
+
+    def set_on_off_button(self, button):
+        if self._on_off_button is not None:
+            self._on_off_button.remove_value_listener(self._on_off_value)
+        self._on_off_button = button
+        if button is not None:
+            button.add_value_listener(self._on_off_value)
+        self.update()
+
+    def _bank_down_value(self, value):
+        if self.is_enabled() and value and self._device is not None and self._bank_index > 0:
+            self._bank_index -= 1
+            self.update()
+
+    def _bank_up_value(self, value):
+        if self.is_enabled() and value and self._device is not None:
+            if self._bank_index + 1 < self._number_of_parameter_banks():
+                self._bank_index += 1
+                self.update()
+
+    def _on_off_value(self, value):
+        if self.is_enabled() and (value != 0 or not self._on_off_button.is_momentary()):
+            parameter = self._on_off_parameter()
+            if parameter is not None and parameter.is_enabled:
+                parameter.value = float(int(parameter.value == 0.0))
+
+    def _on_off_parameter(self):
+        if self._device is not None:
+            for parameter in self._device.parameters:
+                if str(parameter.name).startswith('Device On'):
+                    return parameter
+
+    def _number_of_parameter_banks(self):
+        if self._device is None:
+            return 0
+        return int(math.ceil((len(self._device.parameters) - 1) / 8.0))
+
+    def _assign_parameters(self):
+        parameters = list(self._device.parameters[1:])
+        start = self._bank_index * 8
+        bank = parameters[start:start + 8]
+        for index, control in enumerate(self._parameter_controls):
+            if index < len(bank):
+                control.connect_to(bank[index])
+            else:
+                control.release_parameter()
+        self._bank_name = 'Bank %d' % (self._bank_index + 1)
+
+    def update(self):
+        super(DeviceComponent, self).update()
+        if self.is_enabled() and self._device is not None:
+            if self._parameter_controls is not None:
+                self._assign_parameters()
+        elif self._parameter_controls is not None:
+            for control in self._parameter_controls:
+                control.release_parameter()
+
+    def disconnect(self):
+        self._device = None
+        super(DeviceComponent, self).disconnect()
@@ -0,0 +1,233 @@
+"""
+MIDI input control with feedback, modelled on _Framework's
+InputControlElement. Feedback is sent through the surface that was current
+(see Dependency) when the element was created.
+"""
+from . import Dependency
+
+MIDI_NOTE_TYPE = 0
+MIDI_CC_TYPE = 1
+MIDI_PB_TYPE = 2
+MIDI_SYSEX_TYPE = 3
+MIDI_INVALID_TYPE = 4
+MIDI_MSG_TYPES = (MIDI_NOTE_TYPE, MIDI_CC_TYPE, MIDI_PB_TYPE, MIDI_SYSEX_TYPE,
+                  MIDI_INVALID_TYPE)
+MIDI_NOTE_ON_STATUS = 144
+MIDI_NOTE_OFF_STATUS = 128
+MIDI_CC_STATUS = 176
+MIDI_PB_STATUS = 224
+
+_STATUS = {MIDI_NOTE_TYPE: MIDI_NOTE_ON_STATUS, MIDI_CC_TYPE: MIDI_CC_STATUS,
+           MIDI_PB_TYPE: MIDI_PB_STATUS}
+
+
+class ControlElement(object):
+    """ Base element: knows its surface and can be registered with it. """
+
+    name = ''
+
+    def __init__(self, name='', *a, **k):
+        super(ControlElement, self).__init__(*a, **k)
+        self.name = name
+        surface = Dependency.current()
+        self._surface = surface
+        if surface is not None:
+            surface._register_control(self)
+
+    def _send_midi(self, midi_bytes, optimized=True):
+        if self._surface is None:
+            return False
+        return self._surface._send_midi(midi_bytes, optimized=optimized)
+
+    def _request_rebuild(self):
+        if self._surface is not None:
+            self._surface.request_rebuild_midi_map()
+
+    def disconnect(self):
+        pass
+
+    def reset(self):
+        pass
+
+    def clear_send_cache(self):
+        pass
+
+    def install_connections(self, install_translation, install_mapping,
+                            install_forwarding):
+        pass
+
+
+class InputControlElement(ControlElement):
+    send_depends_on_forwarding = True
+
+    def __init__(self, msg_type=MIDI_INVALID_TYPE, channel=0, identifier=0,
+                 optimized_send_midi=True, *a, **k):
+        super(InputControlElement, self).__init__(*a, **k)
+        self._msg_type = msg_type
+        self._original_channel = channel
+        self._original_identifier = identifier
+        self._msg_channel = channel
+        self._msg_identifier = identifier
+        self._optimized_send_midi = optimized_send_midi
+        self._last_sent_message = None
+        self._force_next_send = False
+        self._is_being_forwarded = True
+        self._suppress_script_forwarding = False
+        self._parameter_to_map_to = None
+        self._value_listeners = []
+
+    # message routing
+    def message_type(self):
+        return self._msg_type
+
+    def message_channel(self):
+        return self._msg_channel
+
+    def message_identifier(self):
+        return self._msg_identifier
+
+    def original_channel(self):
+        return self._original_channel
+
+    def original_identifier(self):
+        return self._original_identifier
+
+    def message_map_mode(self):
+        return 0
+
+    def _status_byte(self, channel):
+        return _STATUS.get(self._msg_type, MIDI_CC_STATUS) + channel
+
+    def identifier_bytes(self):
+        return [(self._status_byte(self._msg_channel), self._msg_identifier)]
+
+    def set_channel(self, channel):
+        if self._msg_channel != channel:
+            self._msg_channel = channel
+            self._request_rebuild()
+
+    def set_identifier(self, identifier):
+        if self._msg_identifier != identifier:
+            self._msg_identifier = identifier
+            self._request_rebuild()
+
+    def use_default_message(self):
+        if (self._msg_channel, self._msg_identifier) != (self._original_channel, self._original_identifier):
+            self._msg_channel = self._original_channel
+            self._msg_identifier = self._original_identifier
+            self._request_rebuild()
+
+    def _get_suppress_script_forwarding(self):
+        return self._suppress_script_forwarding
+
+    def _set_suppress_script_forwarding(self, value):
+        if self._suppress_script_forwarding != value:
+            self._suppress_script_forwarding = value
+            self._request_rebuild()
+
+    suppress_script_forwarding = property(_get_suppress_script_forwarding,
+                                          _set_suppress_script_forwarding)
+
+    def script_wants_forwarding(self):
+        return not self._suppress_script_forwarding
+
+    def is_momentary(self):
+        return False
+
+    # parameter mapping
+    def connect_to(self, parameter):
+        if self._parameter_to_map_to is not parameter:
+            self._parameter_to_map_to = parameter
+            self._request_rebuild()
+
+    def release_parameter(self):
+        if self._parameter_to_map_to is not None:
+            self._parameter_to_map_to = None
+            self._request_rebuild()
+
+    def mapped_parameter(self):
+        return self._parameter_to_map_to
+
+    def install_connections(self, install_translation, install_mapping,
+                            install_forwarding):
+        self._is_being_forwarded = False
+        if self._msg_type == MIDI_INVALID_TYPE:
+            return
+        if (self._msg_channel, self._msg_identifier) != (self._original_channel, self._original_identifier):
+            install_translation(self._msg_type, self._original_identifier,
+                                self._original_channel, self._msg_identifier,
+                                self._msg_channel)
+        if self._parameter_to_map_to is not None:
+            install_mapping(self, self._parameter_to_map_to)
+        if self.script_wants_forwarding():
+            self._is_being_forwarded = install_forwarding(self)
+
+    # value listeners
+    def add_value_listener(self, callback, identify_sender=False):
+        if not self.value_has_listener(callback):
+            self._value_listeners.append((callback, identify_sender))
+
+    def remove_value_listener(self, callback):
+        for entry in self._value_listeners:
+            if entry[0] == callback:
+                self._value_listeners.remove(entry)
+                return
+
+    def value_has_listener(self, callback):
+        return any(entry[0] == callback for entry in self._value_listeners)
+
+    def value_listener_count(self):
+        return len(self._value_listeners)
+
+    def notify_value(self, value):
+        for entry in list(self._value_listeners):
+            # listeners removed by an earlier listener are skipped
+            if entry not in self._value_listeners:
+                continue
+            callback, identify_sender = entry
+            if identify_sender:
+                callback(value, self)
+            else:
+                callback(value)
+
+    def receive_value(self, value):
+        self.notify_value(value)
+
+    # feedback
+    def clear_send_cache(self):
+        self._last_sent_message = None
+
+    def reset(self):
+        self.send_value(0)
+
+    def reset_state(self):
+        self.use_default_message()
+        self.suppress_script_forwarding = False
+
+    def send_value(self, value, force=False, channel=None):
+        value = int(value)
+        if (force or self._force_next_send or
+                ((value, channel) != self._last_sent_message and
+                 (self._is_being_forwarded or not self.send_depends_on_forwarding))):
+            self._do_send_value(value, channel)
+        self._force_next_send = False
+
+    def _do_send_value(self, value, channel=None):
+        if self._msg_type in _STATUS:
+            status = self._status_byte(self._original_channel if channel is None else channel)
+            if self._send_midi((status, self._original_identifier, value),
+                               optimized=self._optimized_send_midi):
+                self._last_sent_message = (value, channel)
+
+    def set_light(self, value):
+        if hasattr(value, 'draw'):
+            value.draw(self)
+        elif value is True or value is False:
+            self.send_value(127 if value else 0)
+        else:
+            self.send_value(value)
+
+    def disconnect(self):
+        self._value_listeners = []
+        self._parameter_to_map_to = None
+        super(InputControlElement, self).disconnect()
@@ -0,0 +1,69 @@
+from .CompoundComponent import CompoundComponent
+from .ChannelStripComponent import ChannelStripComponent
+
+
+class MixerComponent(CompoundComponent):
+
+    def __init__(self, num_tracks=0, num_returns=0, *a, **k):
+        super(MixerComponent, self).__init__(*a, **k)
+        self._track_offset = -1
+        self._channel_strips = []
+        self._return_strips = []
+        for _ in range(num_tracks):
+            self._channel_strips.append(self.register_component(self._create_strip()))
+        for _ in range(num_returns):
+            self._return_strips.append(self.register_component(self._create_strip()))
+        self._master_strip = self.register_component(self._create_strip())
+        self._master_strip.set_track(self.song().master_track)
+        self._selected_strip = self.register_component(self._create_strip())
+        self.on_selected_track_changed()
+        self.set_track_offset(0)
+        self._reassign_returns()
+
+    def _create_strip(self):
+        return ChannelStripComponent()
+
+    def channel_strip(self, index):
+        return self._channel_strips[index]
+
+    def return_strip(self, index):
+        return self._return_strips[index]
+
+    def master_strip(self):
+        return self._master_strip
+
+    def selected_strip(self):
+        return self._selected_strip
+
+    def tracks_to_use(self):
+        return self.song().visible_tracks
+
+    def set_track_offset(self, new_offset):
+        if new_offset != self._track_offset:
+            self._track_offset = new_offset
+            self._reassign_tracks()
+
+    def _reassign_tracks(self):
+        tracks = self.tracks_to_use()
+        for index, strip in enumerate(self._channel_strips):
+            track_index = self._track_offset + index
+            strip.set_track(tracks[track_index] if len(tracks) > track_index else None)
+
+    def _reassign_returns(self):
+        returns = self.song().return_tracks
+        for index, strip in enumerate(self._return_strips):
+            strip.set_track(returns[index] if index < len(returns) else None)
+
+    def on_selected_track_changed(self):
+        selected_track = self.song().view.selected_track
+        if self._selected_strip is not None:
+            self._selected_strip.set_track(selected_track)
+
+    def on_track_list_changed(self):
+        self._reassign_tracks()
+
+    def update(self):
+        super(MixerComponent, self).update()
+
+    def disconnect(self):
+        super(MixerComponent, self).disconnect()
@@ -0,0 +1,75 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class ModeSelectorComponent(ControlSurfaceComponent):
+
+    def __init__(self, *a, **k):
+        super(ModeSelectorComponent, self).__init__(*a, **k)
+        self._modes_buttons = []
+        self._mode_toggle = None
+        self._mode_listeners = []
+        self._mode_index = -1
+        self._modes_heap = []
+
+    def disconnect(self):
+        for button in self._modes_buttons:
+            button.remove_value_listener(self._mode_value)
+        self._modes_buttons = []
+        self._mode_listeners = []
+        super(ModeSelectorComponent, self).disconnect()
+
+    def mode_index(self):
+        return self._mode_index
+
+    def number_of_modes(self):
+        raise NotImplementedError
+
+    def set_mode_buttons(self, buttons):
+        for button in self._modes_buttons:
+            button.remove_value_listener(self._mode_value)
+        self._modes_buttons = []
+        if buttons is not None:
+            for button in buttons:
+                button.add_value_listener(self._mode_value, True)
+                self._modes_buttons.append(button)
+
+    def set_mode(self, mode):
+        self._clean_heap()
+        self._modes_heap = [(mode, None, None)]
+        if self._mode_index != mode:
+            self._update_mode()
+
+    def _clean_heap(self):
+        self._modes_heap = [entry for entry in self._modes_heap if entry[1] is None]
+
+    def _update_mode(self):
+        mode = self._modes_heap[-1][0]
+        if self._mode_index != mode:
+            self._mode_index = mode
+            self.update()
+            for listener in list(self._mode_listeners):
+                listener()
+
+    def _mode_value(self, value, sender):
+        if not self.is_enabled():
+            return
+        mode = list(self._modes_buttons).index(sender)
+        if sender.is_momentary():
+            if value > 0:
+                self._modes_heap.append((mode, sender, self))
+                self._update_mode()
+            elif self._modes_heap and self._modes_heap[-1][1] == sender:
+                self.set_mode(mode)
+            else:
+                self._clean_heap()
+        else:
+            self.set_mode(mode)
+
+    def add_mode_index_listener(self, listener):
+        self._mode_listeners.append(listener)
+
+    def remove_mode_index_listener(self, listener):
+        self._mode_listeners.remove(listener)
+
+    def mode_index_has_listener(self, listener):
+        return listener in self._mode_listeners
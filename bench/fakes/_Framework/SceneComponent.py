@@ -0,0 +1,123 @@
+from .CompoundComponent import CompoundComponent
+from .ClipSlotComponent import ClipSlotComponent
+from .SubjectSlot import subject_slot, SubjectSlot
+from .Util import in_range
+
+
+class SceneComponent(CompoundComponent):
+    clip_slot_component_type = ClipSlotComponent
+
+    def __init__(self, num_slots=0, tracks_to_use_callback=None, *a, **k):
+        super(SceneComponent, self).__init__(*a, **k)
+        self._scene = None
+        self._clip_slots = []
+        self._tracks_to_use_callback = tracks_to_use_callback
+        self._triggered_value = 127
+        self._scene_value = None
+        self._no_scene_value = None
+        self._track_offset = 0
+        self._scene_slots = []
+        for _ in range(num_slots):
+            new_slot = self._create_clip_slot()
+            self._clip_slots.append(new_slot)
+            self.register_components(new_slot)
+
+    def _create_clip_slot(self):
+        return self.clip_slot_component_type()
+
+    def _enable_skinning(self):
+        self.set_triggered_value('Session.SceneTriggered')
+        self.set_scene_value('Session.Scene')
+        self.set_no_scene_value('Session.NoScene')
+        for slot in self._clip_slots:
+            slot._enable_skinning()
+
+    def set_scene(self, scene):
+        if scene != self._scene or type(self._scene) != type(scene):
+            self._scene = scene
+            for slot in self._scene_slots:
+                slot.disconnect()
+            self._scene_slots = []
+            if scene is not None:
+                self._scene_slots.append(SubjectSlot(scene, self.update, 'is_triggered'))
+            self._reassign_clip_slots()
+            self.update()
+
+    def set_track_offset(self, offset):
+        if offset != self._track_offset:
+            self._track_offset = offset
+            self._reassign_clip_slots()
+
+    def _reassign_clip_slots(self):
+        tracks = list(self._tracks_to_use_callback()) if self._tracks_to_use_callback else []
+        clip_slots = []
+        if self._scene is not None:
+            scene_index = self._scene_index()
+            clip_slots = [track.clip_slots[scene_index] if scene_index is not None and scene_index < len(track.clip_slots) else None
+                          for track in tracks]
+        for index, slot in enumerate(self._clip_slots):
+            track_index = index + self._track_offset
+            if in_range(track_index, 0, len(clip_slots)):
+                slot.set_clip_slot(clip_slots[track_index])
+            else:
+                slot.set_clip_slot(None)
+
+    def _scene_index(self):
+        scenes = list(self.song().scenes)
+        return scenes.index(self._scene) if self._scene in scenes else None
+
+    def clip_slot(self, index):
+        return self._clip_slots[index]
+
+    def set_launch_button(self, button):
+        if button != self._launch_button_value.subject:
+            self._launch_button_value.subject = button
+            self.update()
+
+    def set_triggered_value(self, value):
+        self._triggered_value = value
+
+    def set_scene_value(self, value):
+        self._scene_value = value
+
+    def set_no_scene_value(self, value):
+        self._no_scene_value = value
+
+    def update(self):
+        super(SceneComponent, self).update()
+        if self._allow_updates:
+            button = self._launch_button_value.subject
+            if self.is_enabled() and button is not None:
+                if self._scene is not None:
+                    if self._scene.is_triggered:
+                        button.send_value(self._triggered_value)
+                    elif self._scene_value is not None:
+                        button.send_value(self._scene_value)
+                    else:
+                        button.turn_off()
+                elif self._no_scene_value is not None:
+                    button.send_value(self._no_scene_value)
+                else:
+                    button.turn_off()
+        else:
+            self._update_requests += 1
+
+    @subject_slot('value')
+    def _launch_button_value(self, value):
+        if self.is_enabled():
+            self._do_launch_scene(value)
+
+    def _do_launch_scene(self, value):
+        button = self._launch_button_value.subject
+        launched = False
+        if self._scene is not None and (value or not button.is_momentary()):
+            self._scene.fire()
+            launched = True
+        if launched and self.song().select_on_launch:
+            self.song().view.selected_scene = self._scene
+
+    def disconnect(self):
+        for slot in self._scene_slots:
+            slot.disconnect()
+        self._launch_button_value.subject = None
+        super(SceneComponent, self).disconnect()
@@ -0,0 +1,331 @@
+from .CompoundComponent import CompoundComponent
+from .SceneComponent import SceneComponent
+from .SubjectSlot import subject_slot, subject_slot_group
+from .Util import in_range
+
+
+class SessionComponent(CompoundComponent):
+    """ Box of num_tracks x num_scenes clip slots over the song. """
+
+    scene_component_type = SceneComponent
+    _linked_session_instances = []
+    _minimal_track_offset = -1
+    _minimal_scene_offset = -1
+    _highlighting_callback = None
+
+    def __init__(self, num_tracks=0, num_scenes=0, auto_name=False,
+                 enable_skinning=False, *a, **k):
+        super(SessionComponent, self).__init__(*a, **k)
+        self._track_offset = 0
+        self._scene_offset = 0
+        self._num_tracks = num_tracks
+        self._num_scenes = num_scenes
+        self._stop_track_clip_buttons = None
+        self._stop_clip_value = 127
+        self._stop_clip_triggered_value = 127
+        self._stop_all_button = None
+        self._mixer = None
+        self._track_banking_increment = 1
+        self._show_highlight = num_tracks > 0 and num_scenes > 0
+        self._scenes = [self.register_component(self._create_scene())
+                        for _ in range(num_scenes)]
+        self._selected_scene = self.register_component(self._create_scene())
+        if enable_skinning:
+            self._enable_skinning()
+        self._reassign_scenes()
+        self._reassign_tracks()
+
+    def _create_scene(self):
+        return self.scene_component_type(num_slots=self._num_tracks,
+                                         tracks_to_use_callback=self.tracks_to_use)
+
+    def _enable_skinning(self):
+        self.set_stop_clip_triggered_value('Session.StopClipTriggered')
+        self.set_stop_clip_value('Session.StopClip')
+        for scene in self._scenes:
+            scene._enable_skinning()
+        self._selected_scene._enable_skinning()
+
+    def set_stop_clip_value(self, value):
+        self._stop_clip_value = value
+
+    def set_stop_clip_triggered_value(self, value):
+        self._stop_clip_triggered_value = value
+
+    def set_rgb_mode(self, color_palette, color_table, clip_slots_only=False):
+        for scene in self._scenes + [self._selected_scene]:
+            for index in range(self._num_tracks):
+                scene.clip_slot(index).set_rgb_mode(color_palette, color_table)
+
+    def scene(self, index):
+        return self._scenes[index]
+
+    def selected_scene(self):
+        return self._selected_scene
+
+    def width(self):
+        return self._num_tracks
+
+    def height(self):
+        return len(self._scenes)
+
+    def track_offset(self):
+        return self._track_offset
+
+    def scene_offset(self):
+        return self._scene_offset
+
+    def tracks_to_use(self):
+        return self.song().visible_tracks
+
+    def set_mixer(self, mixer):
+        self._mixer = mixer
+        if mixer is not None:
+            mixer.set_track_offset(self.track_offset())
+
+    # navigation
+    def set_track_bank_buttons(self, right_button, left_button):
+        self._bank_right_button_value.subject = right_button
+        self._bank_left_button_value.subject = left_button
+        self._update_track_bank_buttons()
+
+    def set_scene_bank_buttons(self, down_button, up_button):
+        self._bank_down_button_value.subject = down_button
+        self._bank_up_button_value.subject = up_button
+        self._update_scene_bank_buttons()
+
+    def _can_bank_right(self):
+        return len(self.tracks_to_use()) > self._track_offset + 1
+
+    def _can_bank_left(self):
+        return self._track_offset > 0
+
+    def _can_bank_down(self):
+        return len(self.song().scenes) > self._scene_offset + 1
+
+    def _can_bank_up(self):
+        return self._scene_offset > 0
+
+    def _update_track_bank_buttons(self):
+        if self.is_enabled():
+            for button, can in ((self._bank_right_button_value.subject, self._can_bank_right()),
+                                (self._bank_left_button_value.subject, self._can_bank_left())):
+                if button is not None:
+                    if can:
+                        button.turn_on()
+                    else:
+                        button.turn_off()
+
+    def _update_scene_bank_buttons(self):
+        if self.is_enabled():
+            for button, can in ((self._bank_down_button_value.subject, self._can_bank_down()),
+                                (self._bank_up_button_value.subject, self._can_bank_up())):
+                if button is not None:
+                    if can:
+                        button.turn_on()
+                    else:
+                        button.turn_off()
+
+    def _bank_pressed(self, value, button):
+        return self.is_enabled() and (value != 0 or not button.is_momentary())
+
+    @subject_slot('value')
+    def _bank_right_button_value(self, value):
+        if self._bank_pressed(value, self._bank_right_button_value.subject) and self._can_bank_right():
+            self.set_offsets(self._track_offset + self._track_banking_increment, self._scene_offset)
+
+    @subject_slot('value')
+    def _bank_left_button_value(self, value):
+        if self._bank_pressed(value, self._bank_left_button_value.subject) and self._can_bank_left():
+            self.set_offsets(max(0, self._track_offset - self._track_banking_increment), self._scene_offset)
+
+    @subject_slot('value')
+    def _bank_down_button_value(self, value):
+        if self._bank_pressed(value, self._bank_down_button_value.subject) and self._can_bank_down():
+            self.set_offsets(self._track_offset, self._scene_offset + 1)
+
+    @subject_slot('value')
+    def _bank_up_button_value(self, value):
+        if self._bank_pressed(value, self._bank_up_button_value.subject) and self._can_bank_up():
+            self.set_offsets(self._track_offset, self._scene_offset - 1)
+
+    # offsets
+    def set_offsets(self, track_offset, scene_offset):
+        track_increment = 0
+        scene_increment = 0
+        if self._is_linked():
+            SessionComponent._perform_offset_change(track_offset - self._track_offset,
+                                                    scene_offset - self._scene_offset)
+        else:
+            if len(self.tracks_to_use()) > track_offset:
+                track_increment = track_offset - self._track_offset
+            if len(self.song().scenes) > scene_offset:
+                scene_increment = scene_offset - self._scene_offset
+            self._change_offsets(track_increment, scene_increment)
+
+    def _change_offsets(self, track_increment, scene_increment):
+        offsets_changed = track_increment != 0 or scene_increment != 0
+        if offsets_changed:
+            self._track_offset += track_increment
+            self._scene_offset += scene_increment
+            if self._mixer is not None:
+                self._mixer.set_track_offset(self.track_offset())
+            self._reassign_tracks()
+            if scene_increment != 0:
+                self._reassign_scenes()
+            self.notify_offset()
+            if self.width() > 0 and self.height() > 0:
+                self._do_show_highlight()
+
+    def notify_offset(self):
+        pass
+
+    def _reassign_scenes(self):
+        scenes = self.song().scenes
+        for index, scene in enumerate(self._scenes):
+            scene_index = self._scene_offset + index
+            scene.set_scene(scenes[scene_index] if len(scenes) > scene_index else None)
+            scene.set_track_offset(self._track_offset)
+        if self._selected_scene is not None:
+            self._selected_scene.set_scene(self.song().view.selected_scene)
+            self._selected_scene.set_track_offset(self._track_offset)
+        self._update_scene_bank_buttons()
+
+    def _reassign_tracks(self):
+        tracks_to_use = self.tracks_to_use()
+        tracks = list(tracks_to_use[self._track_offset:self._track_offset + self._num_tracks])
+        self._on_fired_slot_index_changed.replace_subjects(tracks, range(len(tracks)))
+        self._on_playing_slot_index_changed.replace_subjects(tracks, range(len(tracks)))
+        for scene in self._scenes:
+            scene.set_track_offset(self._track_offset)
+        if self._selected_scene is not None:
+            self._selected_scene.set_track_offset(self._track_offset)
+        self._update_stop_track_clip_buttons()
+        self._update_track_bank_buttons()
+
+    @subject_slot_group('fired_slot_index')
+    def _on_fired_slot_index_changed(self, index):
+        self._update_stop_clips_led(index)
+
+    @subject_slot_group('playing_slot_index')
+    def _on_playing_slot_index_changed(self, index):
+        self._update_stop_clips_led(index)
+
+    # stop buttons
+    def set_stop_all_clips_button(self, button):
+        self._stop_all_button = button
+        self._stop_all_value.subject = button
+        if button is not None:
+            button.turn_off()
+
+    @subject_slot('value')
+    def _stop_all_value(self, value):
+        if self.is_enabled() and (value != 0 or not self._stop_all_value.subject.is_momentary()):
+            self.song().stop_all_clips()
+
+    def set_stop_track_clip_buttons(self, buttons):
+        self._stop_track_clip_buttons = buttons
+        self._on_stop_track_value.replace_subjects(buttons or [])
+        self._update_stop_track_clip_buttons()
+
+    @subject_slot_group('value')
+    def _on_stop_track_value(self, value, button):
+        if self.is_enabled():
+            if value != 0 or not button.is_momentary():
+                tracks = self.tracks_to_use()
+                track_index = list(self._stop_track_clip_buttons).index(button) + self.track_offset()
+                if in_range(track_index, 0, len(tracks)) and tracks[track_index] in self.song().tracks:
+                    tracks[track_index].stop_all_clips()
+
+    def _update_stop_track_clip_buttons(self):
+        if self.is_enabled():
+            for index in range(self._num_tracks):
+                self._update_stop_clips_led(index)
+
+    def _update_stop_clips_led(self, index):
+        if self.is_enabled() and self._stop_track_clip_buttons is not None and index < len(self._stop_track_clip_buttons):
+            button = self._stop_track_clip_buttons[index]
+            tracks_to_use = self.tracks_to_use()
+            track_index = index + self.track_offset()
+            if 0 <= track_index < len(tracks_to_use) and button is not None:
+                track = tracks_to_use[track_index]
+                if track.fired_slot_index == -2:
+                    button.send_value(self._stop_clip_triggered_value)
+                elif track.playing_slot_index >= 0:
+                    button.send_value(self._stop_clip_value)
+                else:
+                    button.turn_off()
+            elif button is not None:
+                button.turn_off()
+
+    # highlight
+    def set_highlighting_callback(self, callback):
+        if self._highlighting_callback != callback:
+            self._highlighting_callback = callback
+            self._do_show_highlight()
+
+    def set_show_highlight(self, show_highlight):
+        if self._show_highlight != show_highlight:
+            self._show_highlight = show_highlight
+            self._do_show_highlight()
+
+    def _do_show_highlight(self):
+        if self._highlighting_callback is not None:
+            return_tracks = self.song().return_tracks
+            include_returns = len(return_tracks) > 0 and return_tracks[0] in self.tracks_to_use()
+            if self._show_highlight:
+                self._highlighting_callback(self._track_offset, self._scene_offset,
+                                            self.width(), self.height(), include_returns)
+            else:
+                self._highlighting_callback(-1, -1, -1, -1, include_returns)
+
+    # linking
+    def _is_linked(self):
+        return self in SessionComponent._linked_session_instances
+
+    def _link(self):
+        SessionComponent._linked_session_instances.append(self)
+
+    def _unlink(self):
+        SessionComponent._linked_session_instances.remove(self)
+
+    @staticmethod
+    def _perform_offset_change(track_increment, scene_increment):
+        for instance in SessionComponent._linked_session_instances:
+            instance._change_offsets(track_increment, scene_increment)
+
+    # song listeners forwarded by the surface
+    def on_track_list_changed(self):
+        self._reassign_tracks()
+
+    def on_scene_list_changed(self):
+        self._reassign_scenes()
+
+    def on_selected_scene_changed(self):
+        if self._selected_scene is not None:
+            self._selected_scene.set_scene(self.song().view.selected_scene)
+
+    def on_enabled_changed(self):
+        self.update()
+
+    def update(self):
+        super(SessionComponent, self).update()
+        if self._allow_updates:
+            self._update_track_bank_buttons()
+            self._update_scene_bank_buttons()
+            self._update_stop_track_clip_buttons()
+            if self._stop_all_button is not None and self.is_enabled():
+                self._stop_all_button.turn_off()
+        else:
+            self._update_requests += 1
+
+    def set_allow_update(self, allow_updates):
+        super(SessionComponent, self).set_allow_update(allow_updates)
+
+    def disconnect(self):
+        if self._is_linked():
+            self._unlink()
+        self._on_fired_slot_index_changed.disconnect()
+        self._on_playing_slot_index_changed.disconnect()
+        self._on_stop_track_value.disconnect()
+        super(SessionComponent, self).disconnect()
@@ -0,0 +1,65 @@
+from .CompoundComponent import CompoundComponent
+from .SubjectSlot import subject_slot
+
+
+def track_playing_slot(track):
+    try:
+        playing_slot_index = track.playing_slot_index
+    except RuntimeError:
+        return None
+    if playing_slot_index >= 0:
+        return track.clip_slots[playing_slot_index]
+
+
+def track_is_recording(track):
+    playing_slot = track_playing_slot(track)
+    return playing_slot is not None and playing_slot.is_recording
+
+
+def track_will_record(track):
+    return track.fired_slot_index >= 0
+
+
+class SessionRecordingComponent(CompoundComponent):
+
+    def __init__(self, clip_creator, view_controller, *a, **k):
+        super(SessionRecordingComponent, self).__init__(*a, **k)
+        self._clip_creator = clip_creator
+        self._view_controller = view_controller
+
+    def set_record_button(self, button):
+        self._record_button_value_slot.subject = button
+
+    @subject_slot('value')
+    def _record_button_value_slot(self, value):
+        if value or not self._record_button_value_slot.subject.is_momentary():
+            self._on_record_button_value()
+
+    def _on_record_button_value(self):
+        if self.is_enabled():
+            if not self._stop_recording():
+                self._start_recording()
+
+    def _track_can_record(self, track):
+        return track.can_be_armed and (track.arm or track.implicit_arm)
+
+    def _stop_recording(self):
+        song = self.song()
+        status = song.session_record_status
+        was_recording = status != 0 or song.session_record
+        if was_recording:
+            song.session_record = False
+        return was_recording
+
+    def _start_recording(self):
+        song = self.song()
+        song.overdub = True
+        selected_scene = song.view.selected_scene
+        scene_index = list(song.scenes).index(selected_scene) if selected_scene in song.scenes else 0
+        for track in song.tracks:
+            if self._track_can_record(track) and scene_index < len(track.clip_slots):
+                slot = track.clip_slots[scene_index]
+                if not slot.has_clip:
+                    slot.fire()
+        if not song.is_playing:
+            song.is_playing = True
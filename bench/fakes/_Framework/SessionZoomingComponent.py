@@ -0,0 +1,88 @@
+from .CompoundComponent import CompoundComponent
+from .SubjectSlot import subject_slot
+
+
+class DeprecatedSessionZoomingComponent(CompoundComponent):
+    """ Session overview shown while the zoom button is held. """
+
+    def __init__(self, session, enable_skinning=False, *a, **k):
+        super(DeprecatedSessionZoomingComponent, self).__init__(*a, **k)
+        self._session = session
+        self._buttons = None
+        self._scene_bank_buttons = None
+        self._nav_buttons = (None, None, None, None)
+        self._is_zoomed = False
+        self._empty_value = 0
+        self._stopped_value = 100
+        self._playing_value = 127
+        self._selected_value = 64
+        if enable_skinning:
+            self._empty_value = 'Zooming.Empty'
+            self._stopped_value = 'Zooming.Stopped'
+            self._playing_value = 'Zooming.Playing'
+            self._selected_value = 'Zooming.Selected'
+
+    def set_empty_value(self, value):
+        self._empty_value = value
+
+    def set_stopped_value(self, value):
+        self._stopped_value = value
+
+    def set_playing_value(self, value):
+        self._playing_value = value
+
+    def set_selected_value(self, value):
+        self._selected_value = value
+
+    def set_zoom_button(self, button):
+        if button != self._zoom_value.subject:
+            self._zoom_value.subject = button
+            if button is None:
+                self._is_zoomed = False
+
+    def set_button_matrix(self, buttons):
+        self._buttons = buttons
+
+    def set_scene_bank_buttons(self, buttons):
+        self._scene_bank_buttons = buttons
+
+    def set_nav_buttons(self, up, down, left, right):
+        self._nav_buttons = (up, down, left, right)
+
+    @subject_slot('value')
+    def _zoom_value(self, value):
+        if self.is_enabled():
+            button = self._zoom_value.subject
+            if button.is_momentary():
+                self._is_zoomed = value > 0
+            else:
+                self._is_zoomed = not self._is_zoomed
+            if not self._is_zoomed:
+                self._session.update()
+            self.update()
+
+    def update(self):
+        if not self._allow_updates:
+            self._update_requests += 1
+            return
+        if self.is_enabled() and self._is_zoomed and self._buttons is not None:
+            tracks = self._session.tracks_to_use()
+            scenes = self._session.song().scenes
+            width = self._session.width()
+            height = self._session.height()
+            for button, (x, y) in self._buttons.iterbuttons():
+                if button is None:
+                    continue
+                track_offset = x * width
+                scene_offset = y * height
+                if track_offset < len(tracks) and scene_offset < len(scenes):
+                    if (track_offset, scene_offset) == (self._session.track_offset(), self._session.scene_offset()):
+                        button.set_light(self._selected_value)
+                    else:
+                        button.set_light(self._stopped_value)
+                else:
+                    button.set_light(self._empty_value)
+
+    def disconnect(self):
+        self._zoom_value.subject = None
+        super(DeprecatedSessionZoomingComponent, self).disconnect()
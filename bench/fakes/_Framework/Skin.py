@@ -0,0 +1,42 @@
+class SkinColorMissingError(Exception):
+    pass
+
+
+class Skin(object):
+    """ Flattens nested colour classes into 'Outer.Inner.Name' keys. """
+
+    def __init__(self, colors=None, *a, **k):
+        super(Skin, self).__init__(*a, **k)
+        self._colors = {}
+        if colors is not None:
+            self._fill_colors(colors)
+
+    def _fill_colors(self, colors, pathname=''):
+        for base in getattr(colors, '__bases__', ()):
+            if base is not object:
+                self._fill_colors(base, pathname)
+        for name, value in vars(colors).items():
+            if name.startswith('_'):
+                continue
+            if isinstance(value, type):
+                self._fill_colors(value, pathname + name + '.')
+            else:
+                self._colors[pathname + name] = value
+
+    def __getitem__(self, key):
+        try:
+            return self._colors[key]
+        except (KeyError, TypeError):
+            raise SkinColorMissingError('Skin color missing: %s' % str(key))
+
+    def __contains__(self, key):
+        try:
+            return key in self._colors
+        except TypeError:
+            return False
+
+    def keys(self):
+        return self._colors.keys()
+
+    def items(self):
+        return self._colors.items()
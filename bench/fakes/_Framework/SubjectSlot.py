@@ -0,0 +1,227 @@
+"""
+Listener plumbing modelled on _Framework.SubjectSlot: Subject generates
+add/remove/notify methods for __subject_events__, SubjectSlot binds one
+listener to a (replaceable) subject and subject_slot/subject_slot_group
+are the method decorators used by components.
+"""
+from functools import partial
+
+
+class SubjectSlotError(Exception):
+    pass
+
+
+class Subject(object):
+    __subject_events__ = ()
+
+    def __init_subclass__(cls, **k):
+        super(Subject, cls).__init_subclass__(**k)
+        for event in cls.__dict__.get('__subject_events__', ()):
+            cls._make_event(event)
+
+    @classmethod
+    def _make_event(cls, event):
+
+        def listeners(self):
+            store = self.__dict__.setdefault('_subject_listeners', {})
+            return store.setdefault(event, [])
+
+        def add(self, listener, *a, **k):
+            if listener not in listeners(self):
+                listeners(self).append(listener)
+
+        def remove(self, listener):
+            if listener in listeners(self):
+                listeners(self).remove(listener)
+
+        def has(self, listener):
+            return listener in listeners(self)
+
+        def notify(self, *a, **k):
+            for listener in list(listeners(self)):
+                listener(*a, **k)
+
+        setattr(cls, 'add_%s_listener' % event, add)
+        setattr(cls, 'remove_%s_listener' % event, remove)
+        setattr(cls, '%s_has_listener' % event, has)
+        setattr(cls, 'notify_%s' % event, notify)
+
+
+class SubjectSlot(object):
+    """ Keeps `listener` connected to `event` of whatever `subject` is. """
+
+    def __init__(self, subject=None, listener=None, event=None,
+                 extra_kws=None, *a, **k):
+        super(SubjectSlot, self).__init__(*a, **k)
+        self._subject = None
+        self._listener = listener
+        self._event = event
+        self._extra_kws = extra_kws or {}
+        self.subject = subject
+
+    def _get_subject(self):
+        return self._subject
+
+    def _set_subject(self, subject):
+        if subject is not self._subject:
+            self.disconnect()
+            self._subject = subject
+            self.connect()
+
+    subject = property(_get_subject, _set_subject)
+
+    @property
+    def listener(self):
+        return self._listener
+
+    def _add_method(self):
+        return getattr(self._subject, 'add_%s_listener' % self._event)
+
+    def connect(self):
+        if self._subject is not None and self._listener is not None:
+            if not self.is_connected:
+                self._add_method()(self._listener, **self._extra_kws)
+
+    def disconnect(self):
+        if self.is_connected:
+            getattr(self._subject, 'remove_%s_listener' % self._event)(self._listener)
+
+    @property
+    def is_connected(self):
+        if self._subject is None or self._listener is None:
+            return False
+        return getattr(self._subject, '%s_has_listener' % self._event)(self._listener)
+
+    def soft_disconnect(self):
+        self.disconnect()
+        self._subject = None
+
+
+class SlotManager(object):
+
+    def __init__(self, *a, **k):
+        super(SlotManager, self).__init__(*a, **k)
+        self._registered_slots = []
+
+    def register_slot(self, subject=None, listener=None, event=None,
+                      extra_kws=None):
+        if not hasattr(self, '_registered_slots'):
+            self._registered_slots = []
+        slot = SubjectSlot(subject, listener, event, extra_kws)
+        self._registered_slots.append(slot)
+        return slot
+
+    def register_slot_manager(self):
+        if not hasattr(self, '_registered_slots'):
+            self._registered_slots = []
+        manager = SlotManager()
+        self._registered_slots.append(manager)
+        return manager
+
+    def disconnect(self):
+        for slot in getattr(self, '_registered_slots', ()):
+            slot.disconnect()
+        self._registered_slots = []
+        parent = super(SlotManager, self)
+        if hasattr(parent, 'disconnect'):
+            parent.disconnect()
+
+
+class _BoundSlot(SubjectSlot):
+    """ Per-instance slot created by the subject_slot decorator. """
+
+    def __init__(self, function, obj, event):
+        self._function = function
+        self._obj = obj
+        super(_BoundSlot, self).__init__(None, self, event)
+
+    def __call__(self, *a, **k):
+        return self._function(self._obj, *a, **k)
+
+    def __eq__(self, other):
+        return self is other
+
+    __hash__ = object.__hash__
+
+
+class _SlotGroup(object):
+    """ Same listener connected to many subjects; the subject (or the
+    supplied identifier) is passed as the last listener argument. """
+
+    def __init__(self, function, obj, event):
+        self._function = function
+        self._obj = obj
+        self._event = event
+        self._slots = []
+
+    def __call__(self, *a, **k):
+        return self._function(self._obj, *a, **k)
+
+    def replace_subjects(self, subjects, identifiers=None):
+        self.disconnect()
+        subjects = list(subjects)
+        if identifiers is None:
+            identifiers = subjects
+        for subject, identifier in zip(subjects, identifiers):
+            if subject is not None:
+                listener = partial(self._notify, identifier)
+                self._slots.append(SubjectSlot(subject, listener, self._event))
+
+    def _notify(self, identifier, *a):
+        return self._function(self._obj, *(a + (identifier,)))
+
+    def add_subject(self, subject, identifier=None):
+        identifier = subject if identifier is None else identifier
+        listener = partial(self._notify, identifier)
+        self._slots.append(SubjectSlot(subject, listener, self._event))
+
+    def has_subject(self, subject):
+        return any(slot.subject is subject for slot in self._slots)
+
+    @property
+    def subjects(self):
+        return [slot.subject for slot in self._slots]
+
+    def disconnect(self):
+        for slot in self._slots:
+            slot.disconnect()
+        self._slots = []
+
+
+class _SlotDescriptor(object):
+
+    slot_type = _BoundSlot
+
+    def __init__(self, event, function):
+        self._event = event
+        self._function = function
+        self._key = '__slot_%d' % id(self)
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        slot = obj.__dict__.get(self._key)
+        if slot is None:
+            slot = self.slot_type(self._function, obj, self._event)
+            obj.__dict__[self._key] = slot
+        return slot
+
+
+class _SlotGroupDescriptor(_SlotDescriptor):
+    slot_type = _SlotGroup
+
+
+def subject_slot(event):
+
+    def decorator(function):
+        return _SlotDescriptor(event, function)
+
+    return decorator
+
+
+def subject_slot_group(event):
+
+    def decorator(function):
+        return _SlotGroupDescriptor(event, function)
+
+    return decorator
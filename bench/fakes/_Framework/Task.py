@@ -0,0 +1,205 @@
+"""
+Task scheduler modelled on _Framework.Task. Tasks are advanced by
+TaskGroup.update(delta) which the ControlSurface calls from update_display
+with a fixed 100ms delta.
+"""
+import inspect
+
+RUNNING = 0
+KILLED = 1
+
+
+class TaskError(Exception):
+    pass
+
+
+class Task(object):
+
+    def __init__(self, *a, **k):
+        super(Task, self).__init__(*a, **k)
+        self._state = RUNNING
+        self._next_state = None
+        self.parent_task = None
+
+    @property
+    def is_running(self):
+        return self._state == RUNNING
+
+    @property
+    def is_killed(self):
+        return self._state == KILLED
+
+    def kill(self):
+        self._state = KILLED
+        return self
+
+    def restart(self):
+        self._state = RUNNING
+        self.do_restart()
+        return self
+
+    def do_restart(self):
+        pass
+
+    def update(self, delta):
+        if self._state == RUNNING:
+            self.do_update(delta)
+        return self._state
+
+    def do_update(self, delta):
+        pass
+
+
+class FuncTask(Task):
+    """ Calls func(delta) (or func()) every tick until it returns falsy. """
+
+    def __init__(self, func, *a, **k):
+        super(FuncTask, self).__init__(*a, **k)
+        self._func = func
+        try:
+            self._wants_delta = len(inspect.signature(func).parameters) > 0
+        except (TypeError, ValueError):
+            self._wants_delta = True
+
+    def do_update(self, delta):
+        action = self._func(delta) if self._wants_delta else self._func()
+        if not action:
+            self.kill()
+
+
+class RunTask(Task):
+
+    def __init__(self, func, *a, **k):
+        super(RunTask, self).__init__(*a, **k)
+        self._func = func
+
+    def do_update(self, delta):
+        self._func()
+        self.kill()
+
+
+class WaitTask(Task):
+
+    def __init__(self, duration, *a, **k):
+        super(WaitTask, self).__init__(*a, **k)
+        self._duration = duration
+        self._remaining = duration
+
+    def do_restart(self):
+        self._remaining = self._duration
+
+    def do_update(self, delta):
+        self._remaining -= delta
+        if self._remaining <= 0:
+            self.kill()
+
+
+class DelayTask(Task):
+
+    def __init__(self, ticks, *a, **k):
+        super(DelayTask, self).__init__(*a, **k)
+        self._ticks = ticks
+        self._remaining = ticks
+
+    def do_restart(self):
+        self._remaining = self._ticks
+
+    def do_update(self, delta):
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self.kill()
+
+
+def totask(task):
+    if isinstance(task, Task):
+        return task
+    if not callable(task):
+        raise TaskError('Not a task: %r' % (task,))
+    return FuncTask(task)
+
+
+class SequenceTask(Task):
+
+    def __init__(self, tasks, *a, **k):
+        super(SequenceTask, self).__init__(*a, **k)
+        self._tasks = [totask(t) for t in tasks]
+        self._index = 0
+
+    def do_restart(self):
+        self._index = 0
+        for task in self._tasks:
+            task.restart()
+
+    def do_update(self, delta):
+        while self._index < len(self._tasks):
+            task = self._tasks[self._index]
+            task.update(delta)
+            if task.is_running:
+                return
+            self._index += 1
+            delta = 0
+        self.kill()
+
+
+class TaskGroup(Task):
+
+    def __init__(self, tasks=(), auto_kill=False, auto_remove=True, *a, **k):
+        super(TaskGroup, self).__init__(*a, **k)
+        self._tasks = []
+        self._auto_kill = auto_kill
+        self._auto_remove = auto_remove
+        for task in tasks:
+            self.add(task)
+
+    @property
+    def tasks(self):
+        return self._tasks
+
+    def add(self, task):
+        task = totask(task)
+        task.parent_task = self
+        self._tasks.append(task)
+        return task
+
+    def clear(self):
+        del self._tasks[:]
+
+    @property
+    def count(self):
+        return len(self._tasks)
+
+    def do_update(self, delta):
+        for task in list(self._tasks):
+            task.update(delta)
+        if self._auto_remove:
+            self._tasks = [t for t in self._tasks if not t.is_killed or isinstance(t, _Persistent)]
+        if self._auto_kill and not self._tasks:
+            self.kill()
+
+
+class _Persistent(object):
+    """ Marker: killed tasks that may be restarted stay in their group. """
+
+
+class _RestartableSequence(SequenceTask, _Persistent):
+    pass
+
+
+class _RestartableWait(WaitTask, _Persistent):
+    pass
+
+
+def sequence(*tasks):
+    return _RestartableSequence(tasks)
+
+
+def wait(seconds):
+    return _RestartableWait(seconds)
+
+
+def delay(ticks):
+    return DelayTask(ticks)
+
+
+def run(func, *a, **k):
+    return RunTask(lambda: func(*a, **k))
@@ -0,0 +1,53 @@
+def in_range(value, lower_bound, upper_open_bound):
+    if not isinstance(value, int) or isinstance(value, bool):
+        return False
+    return lower_bound <= value < upper_open_bound
+
+
+def find_if(predicate, seq):
+    for item in seq:
+        if predicate(item):
+            return item
+
+
+def clamp(value, minv, maxv):
+    return max(minv, min(value, maxv))
+
+
+def nop(*a, **k):
+    pass
+
+
+def const(value):
+    return lambda *a, **k: value
+
+
+def flatten(list_):
+    for item in list_:
+        if isinstance(item, (list, tuple)):
+            for sub in flatten(item):
+                yield sub
+        else:
+            yield item
+
+
+class BooleanContext(object):
+    """ Re-entrant flag usable as `with ctx():` and in boolean tests. """
+
+    def __init__(self, default_value=False):
+        self._depth = 0
+
+    def __bool__(self):
+        return self._depth > 0
+
+    __nonzero__ = __bool__
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
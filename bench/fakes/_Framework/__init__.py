@@ -0,0 +1,9 @@
+"""
+Minimal in-memory re-implementation of Ableton's _Framework package, good
+enough to boot and drive the Launchpad95 scripts outside of Live.
+
+Behaviour mirrors the Live 10/11 framework where the scripts depend on it:
+component enabling, allow-update batching, MIDI accumulation inside the
+component guard, script forwarding and translation tables, subject slots
+and the task based scheduler that backs schedule_message.
+"""
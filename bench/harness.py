@@ -0,0 +1,440 @@
+"""
+Host side of the offline benchmark harness.
+
+Plays the part of Ableton Live towards the script: owns the fake song,
+implements the c_instance interface the script talks to, rebuilds the
+MIDI map when asked and drives update_display ticks. A fake Launchpad
+answers the identification challenge exactly like the real hardware of
+the chosen model would, and keeps track of the LED state it was sent.
+"""
+import importlib.util
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+FAKES = os.path.join(HERE, 'fakes')
+if FAKES not in sys.path:
+    sys.path.insert(0, FAKES)
+
+import Live  # noqa: E402
+
+MODELS = ('mk1', 'mk2', 'mk3', 'lpx')
+
+_NOTE_ON = 144
+_NOTE_OFF = 128
+_CC = 176
+
+
+def load_script(package_name='Launchpad95'):
+    """ Imports the repository as a package, the way Live loads it. """
+    if package_name in sys.modules:
+        return sys.modules[package_name]
+    spec = importlib.util.spec_from_file_location(
+        package_name, os.path.join(REPO, '__init__.py'),
+        submodule_search_locations=[REPO])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[package_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class MidiMapHandle(object):
+    """ Collects what the script installs during one build_midi_map. """
+
+    def __init__(self):
+        self.forwarded = set()
+        self.mapped = {}
+
+    def forward(self, kind, channel, identifier):
+        self.forwarded.add((kind, channel, identifier))
+        return True
+
+    def map_parameter(self, kind, channel, identifier, parameter):
+        self.mapped[(kind, channel, identifier)] = parameter
+        return True
+
+
+class NoteRepeat(object):
+
+    def __init__(self):
+        self.enabled = False
+        self.repeat_rate = 1.0
+        self.shuffle = 0.0
+        self.swing = 0.0
+
+
+class MidiCounter(object):
+    """ Counts messages and bytes the script sent to the device. """
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+        self.sysex = 0
+
+    def add(self, midi_bytes):
+        self.messages += 1
+        self.bytes += len(midi_bytes)
+        if midi_bytes[0] == 240:
+            self.sysex += 1
+
+    def snapshot(self):
+        return (self.messages, self.bytes, self.sysex)
+
+
+class FakeCInstance(object):
+    """ The object Live hands to create_instance. """
+
+    def __init__(self, song, device=None):
+        self._song = song
+        self.device = device
+        self.midi = MidiCounter()
+        self.note_repeat = NoteRepeat()
+        self.rebuild_requested = False
+        self.rebuild_requests = 0
+        self.note_translations = {}
+        self.cc_translations = {}
+        self.messages = []
+        self.session_highlight = None
+        self.feedback_velocity = None
+        self.controlled_track = None
+        self._handle = object()
+
+    def song(self):
+        return self._song
+
+    def handle(self):
+        return self._handle
+
+    def instance_identifier(self):
+        return 0
+
+    def send_midi(self, midi_bytes):
+        midi_bytes = tuple(midi_bytes)
+        self.midi.add(midi_bytes)
+        if self.device is not None:
+            self.device.receive(midi_bytes)
+
+    def request_rebuild_midi_map(self):
+        self.rebuild_requested = True
+        self.rebuild_requests += 1
+
+    def set_note_translation(self, from_identifier, from_channel,
+                             to_identifier, to_channel):
+        self.note_translations[(from_channel, from_identifier)] = (to_channel, to_identifier)
+
+    def set_cc_translation(self, from_identifier, from_channel,
+                           to_identifier, to_channel):
+        self.cc_translations[(from_channel, from_identifier)] = (to_channel, to_identifier)
+
+    def show_message(self, message):
+        self.messages.append(message)
+
+    def log_message(self, message):
+        pass
+
+    def set_session_highlight(self, track_offset, scene_offset, width,
+                              height, include_return_tracks):
+        self.session_highlight = (track_offset, scene_offset, width, height)
+
+    def set_feedback_channels(self, channels):
+        pass
+
+    def set_feedback_velocity(self, velocity):
+        self.feedback_velocity = velocity
+
+    def set_controlled_track(self, track):
+        self.controlled_track = track
+
+    def release_controlled_track(self):
+        self.controlled_track = None
+
+    def update_locks(self):
+        pass
+
+
+class FakeLaunchpad(object):
+    """
+    Hardware stand-in. Replies only to the identification message its
+    model understands; replies are queued and delivered on the next tick,
+    as a real device would answer asynchronously.
+    """
+
+    def __init__(self, model):
+        assert model in MODELS
+        self.model = model
+        self.outbox = []
+        self.leds = {}
+        self._mk1_challenge = {}
+        # mk1 double buffering: leds is the displayed one of the two buffers
+        self._buffers = (self.leds, {})
+        self._display = 0
+        self._update = 0
+        self._rapid_cursor = 0
+
+    def _response_bytes(self, challenge):
+        response = Live.Application.encrypt_challenge2(challenge)
+        return (response & 127, response >> 8 & 127)
+
+    def receive(self, midi_bytes):
+        if midi_bytes[0] == 240:
+            self._receive_sysex(midi_bytes)
+            return
+        status = midi_bytes[0] & 240
+        channel = midi_bytes[0] & 15
+        if self.model == 'mk1' and status == _CC and 17 <= midi_bytes[1] <= 20:
+            self._mk1_challenge[midi_bytes[1] - 17] = midi_bytes[2]
+            if len(self._mk1_challenge) == 4:
+                challenge = sum(byte << 8 * index
+                                for index, byte in self._mk1_challenge.items())
+                self._mk1_challenge = {}
+                self.outbox.append((240, 0, 32, 41, 6) +
+                                   self._response_bytes(challenge) + (247,))
+            return
+        if self.model == 'mk1' and len(midi_bytes) == 3:
+            self._receive_mk1(status, channel, midi_bytes)
+            return
+        if status in (_NOTE_ON, _NOTE_OFF, _CC) and len(midi_bytes) == 3:
+            value = midi_bytes[2] if status != _NOTE_OFF else 0
+            self.leds[(status == _CC, channel, midi_bytes[1])] = value
+
+    # rapid update order: grid row by row, side buttons, top buttons
+    _MK1_RAPID_KEYS = tuple([(False, 0, row * 16 + column)
+                             for row in range(8) for column in range(8)] +
+                            [(False, 0, row * 16 + 8) for row in range(8)] +
+                            [(True, 0, 104 + index) for index in range(8)])
+
+    def _receive_mk1(self, status, channel, midi_bytes):
+        if status == _CC and channel == 0 and midi_bytes[1] == 0:
+            value = midi_bytes[2]
+            if value == 0:
+                self._buffers[0].clear()
+                self._buffers[1].clear()
+                self._display = self._update = 0
+                self._rapid_cursor = 0
+            elif value in (1, 2):
+                self._rapid_cursor = 0
+            elif 32 <= value <= 61:
+                self._display = value & 1
+                self._update = value >> 2 & 1
+                if value & 16:
+                    self._buffers[self._update].clear()
+                    self._buffers[self._update].update(self._buffers[self._display])
+            self.leds = self._buffers[self._display]
+            return
+        if status == _NOTE_ON and channel == 2:
+            for value in midi_bytes[1:]:
+                self._write_mk1(self._MK1_RAPID_KEYS[self._rapid_cursor], value)
+                self._rapid_cursor = (self._rapid_cursor + 1) % len(self._MK1_RAPID_KEYS)
+            return
+        key = (status == _CC, channel, midi_bytes[1])
+        if status in (_NOTE_ON, _NOTE_OFF, _CC) and key in self._MK1_RAPID_KEYS:
+            self._write_mk1(key, midi_bytes[2] if status != _NOTE_OFF else 0)
+
+    def _write_mk1(self, key, value):
+        # velocity bit 2 copies to both buffers, bit 3 clears the other buffer
+        colour = value & 51
+        self._buffers[self._update][key] = colour
+        other = self._buffers[1 - self._update]
+        if value & 4:
+            other[key] = colour
+        elif value & 8:
+            other[key] = 0
+
+    _LED_SYSEX = {'mk2': (240, 0, 32, 41, 2, 24, 10),
+                  'mk3': (240, 0, 32, 41, 2, 13, 3),
+                  'lpx': (240, 0, 32, 41, 2, 12, 3)}
+    # bytes of lighting data per lighting type in the mk3/lpx LED sysex
+    _LIGHTING_DATA = {0: 1, 1: 2, 2: 1, 3: 3}
+
+    def _led_key(self, led):
+        if self.model == 'mk2':
+            is_cc = led >= 104
+        else:
+            is_cc = led >= 91 or led % 10 == 9
+        return (is_cc, 0, led)
+
+    def _receive_led_sysex(self, data):
+        index = 0
+        while index < len(data):
+            if self.model == 'mk2':
+                led, colour = data[index], data[index + 1]
+                index += 2
+            else:
+                kind, led = data[index], data[index + 1]
+                colour = data[index + 2]
+                index += 2 + self._LIGHTING_DATA[kind]
+                if kind != 0:
+                    continue
+            self.leds[self._led_key(led)] = colour
+
+    def _receive_sysex(self, midi_bytes):
+        header = self._LED_SYSEX.get(self.model)
+        if header is not None and midi_bytes[:len(header)] == header:
+            self._receive_led_sysex(midi_bytes[len(header):-1])
+            return
+        if midi_bytes == (240, 126, 127, 6, 1, 247):
+            if self.model == 'mk3':
+                self.outbox.append((240, 126, 0, 6, 2, 0, 32, 41, 19, 1, 0, 0,
+                                    0, 0, 0, 0, 247))
+            elif self.model == 'lpx':
+                self.outbox.append((240, 126, 0, 6, 2, 0, 32, 41, 3, 1, 0, 0,
+                                    0, 0, 0, 0, 247))
+        elif self.model == 'mk2' and midi_bytes[:7] == (240, 0, 32, 41, 2, 24, 64) \
+                and len(midi_bytes) == 12:
+            challenge = sum(byte << 8 * index
+                            for index, byte in enumerate(midi_bytes[7:11]))
+            self.outbox.append((240, 0, 32, 41, 2, 24, 64) +
+                               self._response_bytes(challenge) + (247,))
+
+    def lit_pads(self):
+        return sum(1 for value in self.leds.values() if value)
+
+
+class Host(object):
+    """ Owns one script instance and drives it like Live does. """
+
+    def __init__(self, model, song):
+        self.model = model
+        self.song = song
+        self.device = FakeLaunchpad(model)
+        self.c_instance = FakeCInstance(song, self.device)
+        self.surface = None
+        self.midi_map = None
+        self.rebuilds = 0
+
+    # lifecycle
+    def boot(self, max_ticks=50):
+        script = load_script()
+        self.surface = script.create_instance(self.c_instance)
+        self.rebuild_midi_map()
+        self.surface.refresh_state()
+        for _ in range(max_ticks):
+            self.tick()
+            if self.surface._init_done:
+                break
+        else:
+            raise RuntimeError('%s did not answer the challenge' % self.model)
+        self.tick()
+        return self.surface
+
+    def disconnect(self):
+        if self.surface is not None:
+            self.surface.disconnect()
+            self.surface = None
+
+    # main loop
+    def rebuild_midi_map(self):
+        self.c_instance.rebuild_requested = False
+        self.c_instance.note_translations.clear()
+        self.c_instance.cc_translations.clear()
+        self.midi_map = MidiMapHandle()
+        self.surface.build_midi_map(self.midi_map)
+        self.rebuilds += 1
+
+    def tick(self):
+        self.surface.update_display()
+        if self.c_instance.rebuild_requested:
+            self.rebuild_midi_map()
+        replies, self.device.outbox = self.device.outbox, []
+        for midi_bytes in replies:
+            self.surface.receive_midi(midi_bytes)
+
+    def settle(self):
+        """ Flushes pending rebuild requests without advancing time. """
+        if self.c_instance.rebuild_requested:
+            self.rebuild_midi_map()
+
+    # hardware input
+    def send(self, status, identifier, value, channel=0):
+        """ Sends a message as the pad would, applying Live's translations. """
+        if status == _CC:
+            table, kind = self.c_instance.cc_translations, 'cc'
+        else:
+            table, kind = self.c_instance.note_translations, 'note'
+        channel, identifier = table.get((channel, identifier), (channel, identifier))
+        if (kind, channel, identifier) not in self.midi_map.forwarded:
+            return False
+        self.surface.receive_midi((status | channel, identifier, value))
+        return True
+
+    def press(self, button, value=127):
+        status = _CC if button._msg_type == 1 else _NOTE_ON
+        return self.send(status, button._original_identifier, value,
+                         button._original_channel)
+
+    def release(self, button):
+        return self.press(button, 0)
+
+    @property
+    def selector(self):
+        return self.surface._selector
+
+    def matrix_button(self, column, row):
+        return self.selector._matrix.get_button(column, row)
+
+
+def build_song(num_tracks=16, num_scenes=16, dense_notes=10000, seed=95):
+    """
+    Builds a session with drum and melodic tracks. Track 0 holds a drum
+    rack and a clip with `dense_notes` notes in scene 0, track 1 a dense
+    eight bar melodic clip.
+    """
+    import random
+    rand = random.Random(seed)
+    song = Live.Song.Song()
+    tracks = []
+    for index in range(num_tracks):
+        track = Live.Track.Track('Track %d' % (index + 1), num_scenes,
+                                 canonical_parent=song)
+        track.set_silently('color', rand.randint(0, 0xFFFFFF))
+        if index == 0:
+            track.set_devices([Live.Device.RackDevice('Drum Rack')])
+        else:
+            track.set_devices([Live.Device.Device('Synth %d' % index),
+                               Live.Device.Device('Filter %d' % index,
+                                                  'AutoFilter',
+                                                  Live.Device.DeviceType.audio_effect)])
+        for scene in range(num_scenes):
+            if (index + scene) % 3 == 0 or scene == 0:
+                clip = Live.Clip.Clip(4.0, 'Clip %d-%d' % (index, scene),
+                                      rand.randint(0, 0xFFFFFF),
+                                      canonical_parent=track.clip_slots[scene])
+                clip.load_notes(_random_notes(rand, 64, 16, 36, 4.0))
+                track.clip_slots[scene].set_clip(clip)
+        tracks.append(track)
+    _fill_dense_clip(tracks[0].clip_slots[0].clip, rand, dense_notes, 36, 16)
+    # the melodic sequencer addresses at most 128 sixteenth steps
+    _fill_dense_clip(tracks[1].clip_slots[0].clip, rand, min(dense_notes, 2048),
+                     48, 24, max_length=32.0)
+    returns = [Live.Track.Track('Return %s' % chr(65 + index), 0,
+                                is_return=True, canonical_parent=song)
+               for index in range(2)]
+    master = Live.Track.Track('Master', 0, is_return=True, canonical_parent=song)
+    scenes = [Live.Scene.Scene('Scene %d' % (index + 1),
+                               [track.clip_slots[index] for track in tracks],
+                               canonical_parent=song)
+              for index in range(num_scenes)]
+    song.set_content(tracks, returns, master, scenes)
+    return song
+
+
+def _random_notes(rand, count, pitch_span, base_pitch, length):
+    steps = int(length * 4)
+    positions = rand.sample(range(steps * pitch_span), min(count, steps * pitch_span))
+    return [(base_pitch + position % pitch_span, (position // pitch_span) / 4.0,
+             0.25, rand.randint(20, 127), False) for position in positions]
+
+
+def _fill_dense_clip(clip, rand, count, base_pitch, pitch_span, max_length=None):
+    """ Grows the clip until `count` distinct sixteenth notes fit in it. """
+    bars = 1
+    while bars * 16 * pitch_span < count * 1.5:
+        bars *= 2
+    length = bars * 4.0
+    if max_length is not None:
+        length = min(length, max_length)
+    clip.set_silently('length', length)
+    clip.set_silently('loop_end', length)
+    clip.set_silently('end_marker', length)
+    clip.load_notes(_random_notes(rand, count, pitch_span, base_pitch, length))
@@ -0,0 +1,428 @@
+"""
+Offline benchmarks for Launchpad95.
+
+Boots the script against the fake Live object model in bench/fakes,
+answers the identification challenge for each Launchpad model and times
+the hot paths. Every figure is reported per operation together with the
+MIDI traffic the operation produced.
+
+    python bench/run_bench.py [--models mk1,mk2] [--repeat 20] [--output FILE]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import warnings
+
+warnings.simplefilter('ignore', SyntaxWarning)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import harness  # noqa: E402
+
+
+class Result(object):
+
+    def __init__(self, model, name, samples, midi, extra=None):
+        self.model = model
+        self.name = name
+        self.samples = sorted(samples)
+        count = max(1, len(samples))
+        self.messages = float(midi[0]) / count
+        self.bytes = float(midi[1]) / count
+        self.sysex = float(midi[2]) / count
+        self.extra = extra or {}
+
+    def _percentile(self, fraction):
+        if not self.samples:
+            return 0.0
+        index = min(len(self.samples) - 1, int(round(fraction * (len(self.samples) - 1))))
+        return self.samples[index]
+
+    @property
+    def mean(self):
+        return sum(self.samples) / max(1, len(self.samples))
+
+    def as_dict(self):
+        data = dict(model=self.model, name=self.name, n=len(self.samples),
+                    mean_ms=self.mean * 1000.0,
+                    p50_ms=self._percentile(0.5) * 1000.0,
+                    p95_ms=self._percentile(0.95) * 1000.0,
+                    max_ms=self._percentile(1.0) * 1000.0,
+                    msgs=self.messages, bytes=self.bytes, sysex=self.sysex)
+        data.update(self.extra)
+        return data
+
+    def row(self):
+        data = self.as_dict()
+        extra = ' '.join('%s=%s' % (key, _fmt(value))
+                         for key, value in sorted(self.extra.items()))
+        return '%-4s %-30s %5d %9.3f %9.3f %9.3f %9.3f %8.1f %9.1f  %s' % (
+            self.model, self.name, data['n'], data['mean_ms'], data['p50_ms'],
+            data['p95_ms'], data['max_ms'], data['msgs'], data['bytes'], extra)
+
+
+HEADER = '%-4s %-30s %5s %9s %9s %9s %9s %8s %9s  %s' % (
+    'lp', 'benchmark', 'n', 'mean ms', 'p50 ms', 'p95 ms', 'max ms',
+    'msgs/op', 'bytes/op', 'extra')
+
+
+def _fmt(value):
+    if isinstance(value, float):
+        return '%.3f' % value
+    return str(value)
+
+
+def measure(host, model, name, operation, repeat, extra=None):
+    """ Runs `operation(i)` `repeat` times inside Live's component guard. """
+    midi = host.c_instance.midi
+    before = midi.snapshot()
+    rebuilds = host.rebuilds
+    samples = []
+    for index in range(repeat):
+        start = time.perf_counter()
+        operation(index)
+        host.settle()
+        samples.append(time.perf_counter() - start)
+    after = midi.snapshot()
+    extra = dict(extra or {})
+    extra['rebuilds/op'] = float(host.rebuilds - rebuilds) / max(1, repeat)
+    return Result(model, name, samples,
+                  [a - b for a, b in zip(after, before)], extra)
+
+
+def guarded(host, func, *args):
+    with host.surface.component_guard():
+        return func(*args)
+
+
+def click(host, button):
+    host.press(button)
+    host.release(button)
+    host.settle()
+
+
+# scenarios
+def bench_boot(model, repeat):
+    samples = []
+    midi = [0, 0, 0]
+    for _ in range(repeat):
+        host = harness.Host(model, harness.build_song())
+        start = time.perf_counter()
+        host.boot()
+        samples.append(time.perf_counter() - start)
+        for index, value in enumerate(host.c_instance.midi.snapshot()):
+            midi[index] += value
+        host.disconnect()
+    return [Result(model, 'boot', samples, midi)]
+
+
+def _mode_name(selector):
+    import Launchpad95.Settings as settings
+    main = selector._main_mode_index
+    if main == 1:
+        return settings.Settings.USER_MODES_1[selector._sub_mode_list[1]]
+    if main == 2:
+        return settings.Settings.USER_MODES_2[selector._sub_mode_list[2]]
+    return ('session', None, None, 'mixer')[main]
+
+
+def bench_mode_switch(host, model, repeat):
+    """ Presses the mode buttons like a user cycling through every mode. """
+    # the melodic sequencer cannot show clips longer than 128 steps
+    _select(host, 2)
+    top = host.selector._modes_buttons
+    sequence = (top[1], top[1], top[2], top[2], top[3], top[0])
+    per_mode = {}
+    midi = host.c_instance.midi
+    for index in range(repeat * len(sequence)):
+        button = sequence[index % len(sequence)]
+        before = midi.snapshot()
+        start = time.perf_counter()
+        click(host, button)
+        elapsed = time.perf_counter() - start
+        after = midi.snapshot()
+        samples, traffic = per_mode.setdefault(_mode_name(host.selector), ([], [0, 0, 0]))
+        samples.append(elapsed)
+        for i in range(3):
+            traffic[i] += after[i] - before[i]
+    return [Result(model, 'mode switch -> %s' % name, samples, traffic)
+            for name, (samples, traffic) in sorted(per_mode.items())]
+
+
+def _enter_mode(host, main, sub=0):
+    selector = host.selector
+    selector._main_mode_index = main
+    selector._sub_mode_list[main] = sub
+    guarded(host, selector.update)
+    host.tick()
+
+
+def _select(host, track_index, scene_index=0):
+    song = host.song
+    song.view.selected_scene = song.scenes[scene_index]
+    song.view.selected_track = song.tracks[track_index]
+    host.tick()
+
+
+def bench_step_sequencer(host, model, repeat, label, track_index, sub_mode):
+    results = []
+    _enter_mode(host, 0)
+    _select(host, track_index)
+    _enter_mode(host, 2, sub_mode)
+    stepseq = host.selector._stepseq if sub_mode == 0 else host.selector._stepseq2
+    editor = stepseq._note_editor
+    clip = host.song.tracks[track_index].clip_slots[0].clip
+    notes = clip.note_count()
+
+    results.append(measure(host, model, '%s note_editor._update_matrix' % label,
+                           lambda i: guarded(host, editor._update_matrix), repeat,
+                           dict(notes=notes)))
+
+    pad = host.matrix_button(3, 0)
+    stats = dict(clip.stats)
+    results.append(measure(host, model, '%s pad toggle' % label,
+                           lambda i: click(host, pad), repeat,
+                           dict(notes=notes)))
+    reads = clip.stats['notes_read'] - stats.get('notes_read', 0)
+    results[-1].extra['notes_read/op'] = float(reads) / repeat
+
+    if hasattr(editor, 'width'):
+        page_span = editor.quantization * editor.width * editor.number_of_lines_per_note
+    else:
+        page_span = editor._quantization * 8
+    pages = max(1, int(clip.loop_end / page_span))
+    results.append(measure(host, model, '%s page flip' % label,
+                           lambda i: guarded(host, stepseq.set_page, i % min(pages, 8)),
+                           repeat, dict(notes=notes)))
+
+    stats = dict(clip.stats)
+    results.append(measure(host, model, '%s external note edit' % label,
+                           lambda i: _external_edit(clip, i), repeat,
+                           dict(notes=notes)))
+    reads = clip.stats['notes_read'] - stats.get('notes_read', 0)
+    results[-1].extra['notes_read/op'] = float(reads) / repeat
+
+    host.song.is_playing = True
+    clip.is_playing = True
+    clip.playing_status = 1
+    step = getattr(editor, 'quantization', 0.25) / 4.0
+    results.append(measure(host, model, '%s playhead advance' % label,
+                           lambda i: setattr(clip, 'playing_position',
+                                             (i * step) % clip.loop_end),
+                           repeat * 8, dict(notes=notes)))
+    clip.is_playing = False
+    clip.playing_status = 0
+    host.song.is_playing = False
+    _enter_mode(host, 0)
+    return results
+
+
+def _external_edit(clip, index):
+    """ An edit made in Live's own clip editor: add a note, then remove it. """
+    pitch = clip._notes[min(clip._notes)].pitch if clip._notes else 60
+    start = clip.loop_end - 0.25
+    clip.set_notes(((pitch, start, 0.25, 100, False),))
+    clip.remove_notes(start, pitch, 0.25, 1)
+
+
+def bench_session(host, model, repeat):
+    results = []
+    _enter_mode(host, 0)
+    session = host.selector._session
+    results.append(measure(host, model, 'session scroll',
+                           lambda i: guarded(host, session.set_offsets, i % 8, (i * 3) % 8),
+                           repeat))
+    guarded(host, session.set_offsets, 0, 0)
+    tracks = host.song.tracks[:8]
+
+    def launch(index):
+        track = tracks[index % len(tracks)]
+        scene = (index // len(tracks)) % 4
+        slot = track.clip_slots[scene]
+        slot.fire()
+        track.fired_slot_index = scene
+        if slot.has_clip:
+            slot.clip.is_triggered = False
+            slot.clip.is_playing = True
+        track.fired_slot_index = -1
+        track.playing_slot_index = scene
+
+    results.append(measure(host, model, 'session clip launch', launch, repeat))
+    results.append(measure(host, model, 'session idle tick',
+                           lambda i: host.tick(), repeat))
+    for track in tracks:
+        track.stop_all_clips()
+    host.tick()
+    return results
+
+
+def bench_glide(host, model, repeat, hold=0.3, tick=0.01, timeout=5.0):
+    """
+    Holds a device strip pad in stepless mode and waits until the mapped
+    parameter reaches the pad's value, ticking update_display meanwhile.
+    """
+    _enter_mode(host, 0)
+    _select(host, 1)
+    _enter_mode(host, 1, 1)
+    controller = host.selector._device_controller
+    device = host.song.tracks[1].devices[0]
+    parameter = device.parameters[1]
+    samples = []
+    writes = 0
+    errors = []
+    # stands in for the M4L patch, counting OSD refreshes
+    osd = host.surface._osd
+    refreshes = [0]
+
+    def count_refresh():
+        refreshes[0] += 1
+    osd.add_updateML_listener(count_refresh)
+    midi = host.c_instance.midi
+    before = midi.snapshot()
+    for index in range(repeat):
+        row = 0 if index % 2 == 0 else 7
+        target = parameter.max if row == 0 else parameter.min
+        pad = host.matrix_button(0, row)
+        writes_before = parameter.writes
+        host.press(pad)
+        deadline = time.perf_counter() + hold
+        while time.perf_counter() < deadline:
+            host.tick()
+            time.sleep(tick)
+        start = time.perf_counter()
+        host.release(pad)
+        while abs(parameter.value - target) > 1e-6 and \
+                time.perf_counter() - start < timeout:
+            host.tick()
+            time.sleep(tick)
+        samples.append(time.perf_counter() - start)
+        errors.append(abs(parameter.value - target))
+        writes += parameter.writes - writes_before
+    after = midi.snapshot()
+    osd.remove_updateML_listener(count_refresh)
+    _enter_mode(host, 0)
+    del controller
+    return [Result(model, 'device glide convergence', samples,
+                   [a - b for a, b in zip(after, before)],
+                   dict(writes_per_glide=float(writes) / max(1, repeat),
+                        osd_refreshes_per_glide=float(refreshes[0]) / max(1, repeat),
+                        max_error=max(errors) if errors else 0.0))]
+
+
+def bench_idle(host, model, seconds=1.0, tick=0.1):
+    """
+    Leaves the script idle in device mode while Live ticks update_display,
+    and reports the CPU time the whole process used per second, device
+    strip threads included.
+    """
+    _enter_mode(host, 0)
+    _select(host, 1)
+    _enter_mode(host, 1, 1)
+    for _ in range(3):
+        host.tick()
+    # let the device strips handle the requests queued by the mode switch
+    time.sleep(0.2)
+    host.tick()
+    scheduler = sys.modules.get('Launchpad95.DeviceControllerStripScheduler')
+    scheduler = scheduler.get_scheduler() if scheduler is not None else None
+    wakeups = scheduler.wakeups if scheduler is not None else 0
+    midi = host.c_instance.midi
+    before = midi.snapshot()
+    cpu = time.process_time()
+    start = time.perf_counter()
+    samples = []
+    while time.perf_counter() - start < seconds:
+        tick_start = time.perf_counter()
+        host.tick()
+        samples.append(time.perf_counter() - tick_start)
+        time.sleep(tick)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    after = midi.snapshot()
+    extra = dict(cpu_ms_per_s=cpu * 1000.0 / elapsed, threads=threading.active_count())
+    if scheduler is not None:
+        extra['wakeups_per_s'] = (scheduler.wakeups - wakeups) / elapsed
+    _enter_mode(host, 0)
+    return [Result(model, 'idle device mode tick', samples,
+                   [a - b for a, b in zip(after, before)], extra)]
+
+
+def proxy_latency(model):
+    """ One row per device strip proxy call, from the script's latency histograms. """
+    proxy = sys.modules.get('Launchpad95.DeviceControllerStripProxy')
+    results = []
+    for name, histogram in sorted(getattr(proxy, 'latency', {}).items()):
+        results.append(Result(model, 'proxy %s' % name, [histogram.mean] * histogram.count,
+                              [0, 0, 0],
+                              dict(p99_us=histogram.percentile(0.99) * 1e6,
+                                   max_us=histogram.max * 1e6)))
+        histogram.reset()
+    return results
+
+
+def run(models, repeat, glide_repeat):
+    results = []
+    for model in models:
+        results.extend(bench_boot(model, max(1, repeat // 4)))
+    for model in models:
+        host = harness.Host(model, harness.build_song())
+        host.boot()
+        try:
+            results.extend(bench_idle(host, model))
+            results.extend(bench_mode_switch(host, model, max(1, repeat // 4)))
+            results.extend(bench_step_sequencer(host, model, repeat, 'drum', 0, 0))
+            results.extend(bench_step_sequencer(host, model, repeat, 'melodic', 1, 1))
+            results.extend(bench_session(host, model, repeat))
+            if glide_repeat:
+                results.extend(bench_glide(host, model, glide_repeat))
+            results.extend(proxy_latency(model))
+        finally:
+            host.disconnect()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--models', default=','.join(harness.MODELS),
+                        help='comma separated subset of %s' % ','.join(harness.MODELS))
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--glide', type=int, default=2,
+                        help='number of glides per model, 0 to skip')
+    parser.add_argument('--main-thread-glide', action='store_true',
+                        help='move device parameters from the main thread glide engine')
+    parser.add_argument('--output', help='also write the report to this file')
+    parser.add_argument('--json', help='write raw results as JSON')
+    args = parser.parse_args(argv)
+    models = [m.strip() for m in args.models.split(',') if m.strip()]
+    for model in models:
+        if model not in harness.MODELS:
+            parser.error('unknown model %s' % model)
+    if args.main_thread_glide:
+        harness.load_script()
+        settings = sys.modules['Launchpad95.Settings'].Settings
+        settings.DEVICE_CONTROLLER__MAIN_THREAD_GLIDE = True
+    try:
+        results = run(models, args.repeat, args.glide)
+        lines = [HEADER] + [result.row() for result in results]
+        report = '\n'.join(lines)
+        print(report)
+        if args.output:
+            with open(args.output, 'w') as output:
+                output.write(report + '\n')
+        if args.json:
+            with open(args.json, 'w') as output:
+                json.dump([result.as_dict() for result in results], output, indent=1)
+        status = 0
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        status = 1
+    sys.stdout.flush()
+    # device strip servers of older script versions run on non-daemon threads
+    os._exit(status)
+
+
+if __name__ == '__main__':
+    main()
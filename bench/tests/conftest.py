@@ -0,0 +1,11 @@
+import os
+import sys
+
+BENCH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BENCH not in sys.path:
+    sys.path.insert(0, BENCH)
+
+import harness  # noqa: E402
+
+# the repository is imported as the Launchpad95 package, the way Live loads it
+harness.load_script()
@@ -0,0 +1,49 @@
+import harness
+
+
+def _record(button):
+    sent = []
+    button._send_midi = lambda midi_bytes, optimized=True: sent.append(midi_bytes) or True
+    return sent
+
+
+def test_a_slot_whose_feedback_did_not_change_is_not_sent_again():
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    slot = host.selector._session.scene(0).clip_slot(0)
+    sent = _record(slot._launch_button_value.subject)
+    # a playing clip flashes or pulses: two messages the send cache alone resends on every update
+    host.song.tracks[0].clip_slots[0].clip.is_playing = True
+    slot.update()
+    assert len(sent) > 0
+    del sent[:]
+    slot.update()
+    slot.update()
+    assert sent == []
+    host.song.tracks[0].clip_slots[0].clip.is_playing = False
+    slot.update()
+    assert len(sent) > 0
+    del sent[:]
+    slot.update()
+    assert sent == []
+    host.disconnect()
+
+
+def test_a_slot_is_sent_again_once_its_pad_was_drawn_over_or_forced():
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    slot = host.selector._session.scene(0).clip_slot(0)
+    button = slot._launch_button_value.subject
+    sent = _record(button)
+    slot.update()
+    assert sent == []
+    button.send_value(0)
+    del sent[:]
+    slot.update()
+    assert len(sent) > 0
+    for forget in (button.force_next_send, button.clear_send_cache, host.surface.refresh_state):
+        del sent[:]
+        forget()
+        slot.update()
+        assert len(sent) > 0
+    host.disconnect()
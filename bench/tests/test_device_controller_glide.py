@@ -0,0 +1,79 @@
+import pytest
+
+from Live.DeviceParameter import DeviceParameter
+from Launchpad95.DeviceControllerGlideEngine import DeviceControllerGlideEngine, glide_value
+
+
+class Surface(object):
+    """ Keeps the scheduled callbacks, the test runs them as display ticks """
+
+    def __init__(self):
+        self.scheduled = []
+
+    def schedule_message(self, delay, callback):
+        self.scheduled.append(callback)
+
+    def tick(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for callback in scheduled:
+            callback()
+
+
+def test_glide_value_moves_at_rate_towards_the_target():
+    assert glide_value(0.0, 1.0, 2.0, 0.25) == pytest.approx(0.5)
+    assert glide_value(1.0, 0.0, 2.0, 0.25) == pytest.approx(0.5)
+
+
+def test_glide_value_stops_at_the_target():
+    assert glide_value(0.0, 1.0, 2.0, 10.0) == 1.0
+    assert glide_value(1.0, -1.0, 2.0, 10.0) == -1.0
+
+
+def test_glide_value_without_rate_jumps_to_the_target():
+    assert glide_value(0.0, 0.7, None, 0.0) == 0.7
+
+
+def test_glide_value_before_the_start_is_the_start():
+    assert glide_value(0.2, 1.0, 2.0, -1.0) == 0.2
+
+
+def test_engine_advances_a_glide_on_each_tick_until_the_target():
+    surface = Surface()
+    engine = DeviceControllerGlideEngine(surface)
+    now = [10.0]
+    engine.clock = lambda: now[0]
+    parameter = DeviceParameter(value=0.0)
+    engine.start_glide(parameter, 1.0, 2.0)
+    now[0] = 10.25
+    surface.tick()
+    assert parameter.value == pytest.approx(0.5)
+    now[0] = 11.0
+    surface.tick()
+    assert parameter.value == 1.0
+    assert not engine.is_active
+    assert surface.scheduled == []
+
+
+def test_engine_drops_a_glide_when_the_parameter_is_moved_elsewhere():
+    surface = Surface()
+    engine = DeviceControllerGlideEngine(surface)
+    now = [10.0]
+    engine.clock = lambda: now[0]
+    parameter = DeviceParameter(value=0.0)
+    engine.start_glide(parameter, 1.0, 1.0)
+    now[0] = 10.25
+    surface.tick()
+    parameter.value = 0.9
+    now[0] = 10.5
+    surface.tick()
+    assert parameter.value == 0.9
+    assert not engine.is_active
+
+
+def test_engine_without_rate_sets_the_value_at_once():
+    surface = Surface()
+    engine = DeviceControllerGlideEngine(surface)
+    parameter = DeviceParameter(value=0.0)
+    engine.start_glide(parameter, 0.3, None)
+    assert parameter.value == 0.3
+    assert not engine.is_active
@@ -0,0 +1,67 @@
+import threading
+
+from Launchpad95.DeviceControllerStripScheduler import DeviceControllerStripScheduler
+
+
+class Server(object):
+    """ Handles requests put in pending, until it is told to shut down """
+
+    def __init__(self):
+        self.pending = []
+        self.handled = []
+        self.moving = False
+        self.ran = threading.Event()
+
+    def has_requests(self):
+        return bool(self.pending)
+
+    def is_moving(self):
+        return self.moving
+
+    def run_once(self):
+        while self.pending:
+            request = self.pending.pop(0)
+            if request == "shutdown":
+                self.ran.set()
+                return False
+            self.handled.append(request)
+        self.ran.set()
+        return True
+
+
+def test_idle_strips_run_only_when_a_request_arrives():
+    scheduler = DeviceControllerStripScheduler()
+    server = Server()
+    scheduler.register(server)
+    assert not server.ran.wait(0.05)
+    server.pending.append("update")
+    scheduler.notify()
+    assert server.ran.wait(1.0)
+    assert server.handled == ["update"]
+    server.pending.append("shutdown")
+    scheduler.notify()
+
+
+def test_the_thread_ends_with_the_last_server():
+    scheduler = DeviceControllerStripScheduler()
+    server = Server()
+    scheduler.register(server)
+    assert scheduler.is_running
+    server.pending.append("shutdown")
+    scheduler.notify()
+    thread = scheduler._thread
+    if thread is not None:
+        thread.join(1.0)
+    assert not scheduler.is_running
+
+
+def test_moving_strips_are_ticked_without_requests():
+    scheduler = DeviceControllerStripScheduler(tick_interval=0.001)
+    server = Server()
+    server.moving = True
+    scheduler.register(server)
+    assert server.ran.wait(1.0)
+    server.ran.clear()
+    assert server.ran.wait(1.0)
+    server.pending.append("shutdown")
+    scheduler.notify()
@@ -0,0 +1,91 @@
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+import harness
+from Launchpad95 import DeviceControllerStripProxy as proxy_module
+from Launchpad95.DeviceControllerStripServer import DeviceControllerStripServer
+
+
+class Scheduler(object):
+    """ Runs nothing: the tests call the server's run_once themselves """
+
+    def register(self, server):
+        pass
+
+    def notify(self):
+        pass
+
+
+def test_snapshot_has_the_token_of_the_last_handled_request():
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    buttons = [host.matrix_button(0, row) for row in range(8)]
+    requests = queue.Queue()
+    server = DeviceControllerStripServer(buttons, host.surface, 0, requests, queue.Queue())
+    for token in (1, 2, 3):
+        requests.put(("set_enabled", token, (token != 2, ), {}))
+    server.run_once()
+    assert server.snapshot[:2] == (3, True)
+    host.disconnect()
+
+
+def test_a_queued_press_keeps_the_token_of_the_request_before_it():
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    buttons = [host.matrix_button(0, row) for row in range(8)]
+    requests = queue.Queue()
+    server = DeviceControllerStripServer(buttons, host.surface, 0, requests, queue.Queue())
+    requests.put(("set_enabled", 4, (False, ), {}))
+    # the press is queued behind the pending request, without a token
+    server._button_value(127, buttons[0])
+    assert requests.qsize() == 2
+    server.run_once()
+    assert server.current_token == 4
+    assert server.snapshot[:2] == (4, False)
+    host.disconnect()
+
+
+def test_proxy_answers_from_its_mirror_until_the_server_caught_up(monkeypatch):
+    monkeypatch.setattr(proxy_module, 'get_scheduler', Scheduler)
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    buttons = [host.matrix_button(0, row) for row in range(8)]
+    proxy = proxy_module.DeviceControllerStripProxy(buttons, host.surface, 0)
+    proxy.set_enabled(False)
+    assert proxy.server.snapshot[0] < proxy.request_id
+    assert proxy._snapshot()[:2] == (proxy.request_id, False)
+    proxy.server.run_once()
+    assert proxy._snapshot() is proxy.server.snapshot
+    assert proxy._snapshot()[:2] == (proxy.request_id, False)
+    host.disconnect()
+
+
+def test_proxy_does_not_go_back_to_a_snapshot_older_than_a_queued_press(monkeypatch):
+    monkeypatch.setattr(proxy_module, 'get_scheduler', Scheduler)
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    buttons = [host.matrix_button(0, row) for row in range(8)]
+    proxy = proxy_module.DeviceControllerStripProxy(buttons, host.surface, 0)
+    proxy.set_enabled(False)
+    proxy.server._button_value(127, buttons[0])
+    proxy.server.run_once()
+    assert proxy.server.snapshot[0] == proxy.request_id
+    assert proxy._snapshot() is proxy.server.snapshot
+    host.disconnect()
+
+
+def test_proxy_parameter_reads_do_not_wait_for_the_server(monkeypatch):
+    monkeypatch.setattr(proxy_module, 'get_scheduler', Scheduler)
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    buttons = [host.matrix_button(0, row) for row in range(8)]
+    proxy = proxy_module.DeviceControllerStripProxy(buttons, host.surface, 0)
+    parameter = host.song.tracks[0].devices[0].parameters[1]
+    proxy.connect_to(parameter)
+    assert proxy.param_name() == parameter.name
+    assert proxy.param_value() == parameter.value
+    proxy.release_parameter()
+    assert proxy.param_name() == "None"
+    host.disconnect()
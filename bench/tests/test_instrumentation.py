@@ -0,0 +1,58 @@
+import pytest
+
+from Launchpad95.Instrumentation import Instrumentation
+
+
+def test_calls_are_timed_per_name():
+    instrumentation = Instrumentation(16, 0.01)
+    assert instrumentation.call("add", lambda a, b: a + b, (1, 2), {}) == 3
+    instrumentation.call("add", lambda a, b: a + b, (3, 4), {})
+    assert instrumentation.histograms["add"].count == 2
+    assert [name for start, name, seconds in instrumentation.ring] == ["add", "add"]
+
+
+def test_failing_calls_are_timed_too():
+    instrumentation = Instrumentation(16, 0.01)
+
+    def fail():
+        raise ValueError()
+    with pytest.raises(ValueError):
+        instrumentation.call("fail", fail, (), {})
+    assert instrumentation.histograms["fail"].count == 1
+
+
+def test_the_ring_keeps_the_last_calls():
+    instrumentation = Instrumentation(2, 0.01)
+    for name in ("a", "b", "c"):
+        instrumentation.record(name, 0.0, 0.001)
+    assert [name for start, name, seconds in instrumentation.ring] == ["b", "c"]
+
+
+def test_ticks_over_budget_are_counted_against_the_names_that_used_them():
+    instrumentation = Instrumentation(16, 0.01)
+    instrumentation.record("update", 0.0, 0.004, main=True)
+    instrumentation.end_tick()
+    instrumentation.record("update", 0.0, 0.008, main=True)
+    instrumentation.record("redraw", 0.0, 0.006, main=True)
+    instrumentation.end_tick()
+    assert (instrumentation.ticks, instrumentation.overruns) == (2, 1)
+    assert instrumentation.overrun_time == {"update": 0.008, "redraw": 0.006}
+    assert instrumentation.worst_tick[0] == pytest.approx(0.014)
+
+
+def test_nested_calls_count_once_in_the_tick():
+    instrumentation = Instrumentation(16, 0.01)
+    instrumentation.call("outer", instrumentation.call, ("inner", lambda: None, (), {}), {})
+    instrumentation.end_tick()
+    seconds, tick_time = instrumentation.worst_tick
+    assert sorted(tick_time) == ["inner", "outer"]
+    assert seconds == pytest.approx(tick_time["outer"])
+
+
+def test_counters():
+    instrumentation = Instrumentation(16, 0.01)
+    instrumentation.count("rebuilds")
+    instrumentation.count("rebuilds", 2)
+    assert instrumentation.counters == {"rebuilds": 3}
+    instrumentation.reset()
+    assert instrumentation.counters == {}
@@ -0,0 +1,253 @@
+from _Framework.ButtonElement import ButtonElement
+from _Framework.InputControlElement import MIDI_CC_TYPE, MIDI_NOTE_TYPE
+from Launchpad95.LedFrameBuffer import LedFrameBuffer, LPX_LED_SYSEX, MAX_LEDS_PER_SYSEX, MK2_LED_SYSEX, MK3_LED_SYSEX, led_sysex
+from Launchpad95.MidiMeter import TokenBucket
+
+
+def test_messages_outside_a_frame_are_sent_at_once():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 11)])
+    assert frame.send((144, 11, 5))
+    assert sent == [(144, 11, 5)]
+
+
+def test_unchanged_pads_are_dropped():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 11)])
+    frame.send((144, 11, 5))
+    frame.send((144, 11, 5))
+    assert sent == [(144, 11, 5)]
+    assert frame.messages_dropped == 1
+
+
+def test_a_frame_sends_the_last_state_of_each_pad():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 11), ButtonElement(True, MIDI_NOTE_TYPE, 0, 12)])
+    frame.begin_frame()
+    frame.send((144, 11, 5))
+    frame.send((144, 11, 7))
+    frame.send((144, 12, 5))
+    assert sent == []
+    frame.end_frame()
+    assert sent == [(144, 11, 7), (144, 12, 5)]
+
+
+def test_a_pad_set_back_within_a_frame_is_not_sent():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 11)])
+    frame.send((144, 11, 5))
+    frame.begin_frame()
+    frame.send((144, 11, 0))
+    frame.send((144, 11, 5))
+    frame.end_frame()
+    assert sent == [(144, 11, 5)]
+
+
+def test_flash_messages_are_sent_over_an_unchanged_static_colour():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 11)])
+    frame.send((144, 11, 5))
+    frame.send((145, 11, 9))
+    frame.send((145, 11, 9))
+    assert sent == [(144, 11, 5), (145, 11, 9)]
+    # the static colour sent again clears the flash
+    frame.send((144, 11, 5))
+    assert sent[-1] == (144, 11, 5)
+
+
+def test_note_off_lights_the_note_on_pad():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 11)])
+    frame.send((144, 11, 0))
+    frame.send((128, 11, 0))
+    assert sent == [(144, 11, 0), (128, 11, 0)]
+
+
+def test_messages_for_other_pads_are_left_to_the_caller_after_a_flush():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 11)])
+    frame.begin_frame()
+    frame.send((144, 11, 5))
+    assert not frame.send((144, 99, 5))
+    assert not frame.send((240, 0, 32, 41, 247))
+    assert sent == [(144, 11, 5)]
+    frame.end_frame()
+
+
+def test_invalidate_resends_every_pad():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 11)])
+    frame.send((144, 11, 5))
+    frame.invalidate()
+    frame.send((144, 11, 5))
+    assert sent == [(144, 11, 5), (144, 11, 5)]
+
+
+def test_a_disabled_frame_handles_nothing():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 11)])
+    frame.enabled = False
+    assert not frame.send((144, 11, 5))
+    assert sent == []
+
+
+def test_mk2_static_colours_of_a_frame_go_in_one_sysex():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, identifier) for identifier in (11, 12, 13)])
+    frame.set_led_format(MK2_LED_SYSEX)
+    frame.begin_frame()
+    frame.send((144, 11, 5))
+    frame.send((144, 12, 6))
+    frame.send((128, 13, 0))
+    frame.send((145, 11, 9))
+    frame.end_frame()
+    # the flash goes after the sysex that sets the pad's static colour
+    assert sent == [(240, 0, 32, 41, 2, 24, 10, 11, 5, 12, 6, 13, 0, 247), (145, 11, 9)]
+
+
+def test_mk3_static_colours_of_a_frame_go_in_one_sysex():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, identifier) for identifier in (11, 12, 13)])
+    frame.set_led_format(MK3_LED_SYSEX)
+    frame.begin_frame()
+    frame.send((144, 11, 5))
+    frame.send((144, 12, 6))
+    frame.send((144, 13, 7))
+    frame.end_frame()
+    assert sent == [(240, 0, 32, 41, 2, 13, 3, 0, 11, 5, 0, 12, 6, 0, 13, 7, 247)]
+
+
+def test_lpx_static_colours_of_a_frame_go_in_one_sysex():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, identifier) for identifier in (11, 12, 13)])
+    frame.set_led_format(LPX_LED_SYSEX)
+    frame.begin_frame()
+    frame.send((144, 11, 5))
+    frame.send((144, 12, 6))
+    frame.send((144, 13, 7))
+    frame.end_frame()
+    assert sent == [(240, 0, 32, 41, 2, 12, 3, 0, 11, 5, 0, 12, 6, 0, 13, 7, 247)]
+
+
+def test_a_few_static_colours_are_sent_as_single_messages():
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, identifier) for identifier in (11, 12)])
+    frame.set_led_format(MK2_LED_SYSEX)
+    frame.begin_frame()
+    frame.send((144, 11, 5))
+    frame.send((144, 12, 6))
+    frame.end_frame()
+    assert sent == [(144, 11, 5), (144, 12, 6)]
+
+
+def test_led_sysex_is_split_after_the_maximum_leds():
+    leds = [(led, 1) for led in range(MAX_LEDS_PER_SYSEX + 1)]
+    messages = led_sysex(MK3_LED_SYSEX, leds)
+    assert len(messages) == 2
+    assert messages[0][:7] == (240, 0, 32, 41, 2, 13, 3)
+    assert len(messages[0]) == 7 + MAX_LEDS_PER_SYSEX * 3 + 1
+    assert messages[1] == (240, 0, 32, 41, 2, 13, 3, 0, MAX_LEDS_PER_SYSEX, 1, 247)
+
+
+def test_mk1_full_repaint_is_drawn_in_the_hidden_buffer_and_flipped():
+    # mk1 rapid update order: the grid row by row, then the side and the top buttons
+    grid = [ButtonElement(True, MIDI_NOTE_TYPE, 0, row * 16 + column) for row in range(8) for column in range(8)]
+    side = [ButtonElement(True, MIDI_NOTE_TYPE, 0, row * 16 + 8) for row in range(8)]
+    top = [ButtonElement(True, MIDI_CC_TYPE, 0, 104 + index) for index in range(8)]
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons(grid + side + top)
+    frame.set_rapid_update(grid + side + top)
+    frame.begin_frame()
+    for button in grid:
+        frame.send((144, button._original_identifier, 51))
+    frame.end_frame()
+    assert sent[:2] == [(176, 0, 1), (176, 0, 36)]
+    assert sent[2:42] == [(146, 51, 51)] * 32 + [(146, 0, 0)] * 8
+    assert sent[42:] == [(176, 0, 49), (176, 0, 32)]
+
+
+def test_mk1_repaint_sends_flashing_leds_again_after_the_flip():
+    grid = [ButtonElement(True, MIDI_NOTE_TYPE, 0, row * 16 + column) for row in range(8) for column in range(8)]
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons(grid)
+    frame.set_rapid_update(grid)
+    frame.begin_frame()
+    for button in grid:
+        frame.send((144, button._original_identifier, 51))
+    frame.send((144, 0, 59))
+    frame.end_frame()
+    assert sent[2] == (146, 51, 51)
+    assert sent[-1] == (144, 0, 59)
+
+
+def test_mk1_repaint_restores_the_layout_and_buffer_mode():
+    grid = [ButtonElement(True, MIDI_NOTE_TYPE, 0, row * 16 + column) for row in range(8) for column in range(8)]
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons(grid)
+    frame.set_rapid_update(grid)
+    assert not frame.send((176, 0, 2))
+    assert not frame.send((176, 0, 40))
+    frame.begin_frame()
+    for button in grid:
+        frame.send((144, button._original_identifier, 51))
+    frame.end_frame()
+    assert sent[:2] == [(176, 0, 2), (176, 0, 36)]
+    assert sent[-2:] == [(176, 0, 49), (176, 0, 40)]
+
+
+def test_mk1_small_changes_are_sent_as_single_messages():
+    grid = [ButtonElement(True, MIDI_NOTE_TYPE, 0, row * 16 + column) for row in range(8) for column in range(8)]
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons(grid)
+    frame.set_rapid_update(grid)
+    frame.send((144, 3, 51))
+    assert sent == [(144, 3, 51)]
+
+
+def test_limiter_defers_the_low_priority_pads_that_do_not_fit():
+    now = [0.0]
+    sent = []
+    frame = LedFrameBuffer(sent.append)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 1)], source="side")
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 2), ButtonElement(True, MIDI_NOTE_TYPE, 0, 3)], source="matrix", low_priority=True)
+    frame.limiter = TokenBucket(10, 2, clock=lambda: now[0])
+    frame.begin_frame()
+    for identifier in (1, 2, 3):
+        frame.send((144, identifier, 5))
+    frame.end_frame()
+    assert sent == [(144, 1, 5), (144, 2, 5)]
+    assert frame.messages_deferred == 1
+    frame.limiter.take(len(sent))
+    # the deferred pad is sent with what changed on it meanwhile
+    frame.send((144, 3, 7))
+    assert sent == [(144, 1, 5), (144, 2, 5)]
+    now[0] = 1.0
+    frame.flush()
+    assert sent[-1] == (144, 3, 7)
+
+
+def test_source_of_the_messages_sent():
+    frame = LedFrameBuffer(lambda midi_bytes: None)
+    frame.add_buttons([ButtonElement(True, MIDI_NOTE_TYPE, 0, 1)], source="matrix")
+    assert frame.source_of((144, 1, 5)) == "matrix"
+    assert frame.source_of((128, 1, 0)) == "matrix"
+    assert frame.source_of((144, 2, 5)) == "other"
+    assert frame.source_of((240, 0, 32, 41, 247)) == "sysex"
+    assert frame.source_of((176, 0, 40)) == "config"
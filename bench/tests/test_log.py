@@ -0,0 +1,98 @@
+import os
+
+from Launchpad95 import Log
+from Launchpad95.Settings import Settings
+
+
+def test_writer_writes_the_queued_lines_in_order(tmp_path):
+    path = str(tmp_path / "log.txt")
+    writer = Log.LogWriter(path)
+    writer.put((0.0, "MainThread", "Launchpad", Log.INFO, "first"))
+    writer.put((0.0, "LogTest", None, Log.ERROR, ["second", "third"]))
+    writer.put((0.0, None, None, None, "===="))
+    writer.flush()
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert lines[0].startswith("0 ") and lines[0].endswith(" INFO MainThread Launchpad: first")
+    assert lines[1].startswith("1 ") and lines[1].endswith(" ERROR LogTest: second")
+    assert lines[2:] == ["third", "===="]
+
+
+def test_writer_survives_messages_that_cannot_be_formatted(tmp_path):
+    path = str(tmp_path / "log.txt")
+    writer = Log.LogWriter(path)
+    writer.put((0.0, "MainThread", None, "NOT A LEVEL", "message"))
+    writer.put((0.0, None, None, None, "after"))
+    writer.flush()
+    with open(path) as f:
+        assert f.read().splitlines() == ["log: message could not be formatted", "after"]
+
+
+def test_writer_rotates_past_the_maximum_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "LOG_MAX_BYTES", 10)
+    monkeypatch.setattr(Settings, "LOG_BACKUPS", 2)
+    path = str(tmp_path / "log.txt")
+    writer = Log.LogWriter(path)
+    for index in range(4):
+        writer.put((0.0, None, None, None, "line %d" % index))
+        writer.flush()
+    # the file is rotated once the batch is written: the next flush waits for it
+    writer.flush()
+    assert sorted(os.listdir(str(tmp_path))) == ["log.txt", "log.txt.1", "log.txt.2"]
+    assert os.path.getsize(path) == 0
+    with open(path + ".1") as f:
+        assert f.read() == "line 2\nline 3\n"
+    with open(path + ".2") as f:
+        assert f.read() == "line 0\nline 1\n"
+
+
+def test_writer_without_backups_starts_the_log_over(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "LOG_MAX_BYTES", 10)
+    monkeypatch.setattr(Settings, "LOG_BACKUPS", 0)
+    path = str(tmp_path / "log.txt")
+    writer = Log.LogWriter(path)
+    for index in range(2):
+        writer.put((0.0, None, None, None, "line %d" % index))
+        writer.flush()
+    writer.flush()
+    writer.put((0.0, None, None, None, "line 2"))
+    writer.flush()
+    assert os.listdir(str(tmp_path)) == ["log.txt"]
+    with open(path) as f:
+        assert f.read() == "line 2\n"
+
+
+def test_loggers_take_the_level_of_their_module(monkeypatch):
+    monkeypatch.setattr(Settings, "LOGGING", True)
+    monkeypatch.setattr(Settings, "LOG_LEVEL", "WARNING")
+    monkeypatch.setattr(Settings, "LOG_MODULE_LEVELS", {"NoteEditorComponent": "DEBUG"})
+    assert Log.get_logger("Launchpad95.NoteEditorComponent").is_enabled_for(Log.DEBUG)
+    assert not Log.get_logger("Launchpad95.Launchpad").is_enabled_for(Log.INFO)
+    assert Log.get_logger("Launchpad95.Launchpad").is_enabled_for(Log.WARNING)
+
+
+def test_loggers_are_off_without_logging(monkeypatch):
+    monkeypatch.setattr(Settings, "LOGGING", False)
+    assert not Log.get_logger("Launchpad95.Launchpad").is_enabled_for(Log.ERROR)
+
+
+def test_loggers_of_an_old_settings_py_log_everything(monkeypatch):
+    monkeypatch.setattr(Settings, "LOGGING", True)
+    monkeypatch.delattr(Settings, "LOG_LEVEL")
+    monkeypatch.delattr(Settings, "LOG_MODULE_LEVELS")
+    assert Log.get_logger("Launchpad95.Launchpad").is_enabled_for(Log.DEBUG)
+
+
+def test_stopping_the_writer_writes_the_queued_lines_and_ends_its_thread(tmp_path):
+    path = str(tmp_path / "log.txt")
+    writer = Log.LogWriter(path)
+    writer.put((0.0, None, None, None, "first"))
+    thread = writer._thread
+    writer.stop()
+    assert not thread.is_alive()
+    with open(path) as f:
+        assert f.read() == "first\n"
+    writer.put((0.0, None, None, None, "second"))
+    writer.stop()
+    with open(path) as f:
+        assert f.read() == "first\nsecond\n"
@@ -0,0 +1,83 @@
+from Launchpad95.M4LInterface import M4LInterface
+
+
+def test_updates_are_published_once_per_tick():
+    osd = M4LInterface()
+    notified = []
+    osd.set_updateML_listener(lambda: notified.append(osd.info[0]))
+    osd.set_info(0, "Track 1")
+    osd.update()
+    osd.set_info(0, "Track 2")
+    osd.update()
+    assert osd.publish()
+    assert not osd.publish()
+    assert notified == ["Track 2"]
+
+
+def test_writes_are_read_back_once_published():
+    osd = M4LInterface()
+    osd.set_mode("Session")
+    osd.set_info(0, "Track 1")
+    osd.update()
+    assert osd.mode == " " and osd.info == [" ", " "]
+    assert osd.draft_mode == "Session"
+    osd.publish()
+    assert osd.mode == "Session" and osd.info == ["Track 1", " "]
+
+
+def test_the_version_changes_only_with_the_content():
+    osd = M4LInterface()
+    osd.set_attribute(0, "1")
+    osd.update()
+    osd.publish()
+    version = osd.version
+    osd.set_attribute(0, "1")
+    osd.update()
+    osd.publish()
+    assert osd.version == version
+    osd.set_attribute(0, "2")
+    osd.update()
+    osd.publish()
+    assert osd.version == version + 1
+
+
+def test_writes_without_update_are_not_published():
+    osd = M4LInterface()
+    osd.set_attribute_name(2, "Cutoff")
+    osd.publish()
+    assert osd.attribute_names[2] == " "
+    assert osd.version == 0
+
+
+def test_published_frames_are_never_changed():
+    osd = M4LInterface()
+    frame = osd.frame
+    osd.set_info(1, "Device")
+    osd.update()
+    osd.publish()
+    assert frame.info == [" ", " "]
+    assert osd.frame.version == frame.version + 1
+    assert osd.frame.info == [" ", "Device"]
+
+
+def test_a_listener_added_later_gets_the_current_frame():
+    osd = M4LInterface()
+    osd.set_info(0, "Track 1")
+    osd.update()
+    assert not osd.publish()
+    notified = []
+    osd.set_updateML_listener(lambda: notified.append(osd.version))
+    assert osd.publish()
+    assert notified == [1]
+
+
+def test_setting_the_draft_mode_keeps_the_draft():
+    osd = M4LInterface()
+    osd.set_mode("Instrument")
+    osd.set_attribute(0, "Major")
+    osd.draft_mode = osd.draft_mode + " - Scale"
+    assert osd.mode == " "
+    osd.update()
+    osd.publish()
+    assert osd.mode == "Instrument - Scale" and osd.attributes[0] == "Major"
+    assert type(osd.attributes) is list and type(osd.attribute_names) is list
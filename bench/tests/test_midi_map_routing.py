@@ -0,0 +1,35 @@
+import harness
+
+
+def _request(host):
+    with host.surface.component_guard():
+        host.surface.request_rebuild_midi_map()
+    requested = host.c_instance.rebuild_requested
+    host.settle()
+    return requested
+
+
+def test_requests_are_dropped_while_the_routing_does_not_change():
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    dropped = host.surface.midi_map_requests_dropped
+    assert not _request(host)
+    assert host.surface.midi_map_requests_dropped == dropped + 1
+    host.disconnect()
+
+
+def test_feedback_changes_made_through_c_instance_rebuild_the_midi_map():
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    surface = host.surface
+    surface.set_feedback_velocity(5)
+    assert _request(host)
+    surface.set_feedback_channels([11])
+    assert _request(host)
+    surface.set_controlled_track(host.song.tracks[1])
+    assert _request(host)
+    surface.set_feedback_velocity(5)
+    surface.set_feedback_channels([11])
+    assert not _request(host)
+    assert host.c_instance.feedback_velocity == 5
+    host.disconnect()
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from Launchpad95.MidiMeter import MidiMeter, TokenBucket
+
+
+def test_meter_counts_messages_and_bytes_per_source():
+    meter = MidiMeter(clock=lambda: 0.0)
+    meter.count("matrix", 3)
+    meter.count("matrix", 3)
+    meter.count("sysex", 20)
+    assert meter.messages == {"matrix": 2, "sysex": 1}
+    assert meter.bytes == {"matrix": 6, "sysex": 20}
+    assert (meter.total_messages, meter.total_bytes) == (3, 26)
+
+
+def test_meter_rate_is_measured_over_a_second():
+    now = [0.0]
+    meter = MidiMeter(clock=lambda: now[0])
+    for _ in range(30):
+        meter.count("matrix", 3)
+    now[0] = 0.5
+    meter.tick()
+    assert meter.rate == 0.0
+    now[0] = 1.5
+    meter.tick()
+    assert meter.rate == pytest.approx(20.0)
+    now[0] = 3.0
+    meter.tick()
+    assert meter.rate == 0.0
+    assert meter.peak_rate == pytest.approx(20.0)
+
+
+def test_bucket_starts_full():
+    assert TokenBucket(10, 5, clock=lambda: 100.0).available() == 5
+
+
+def test_bucket_refills_at_rate_up_to_burst():
+    now = [100.0]
+    bucket = TokenBucket(10, 5, clock=lambda: now[0])
+    bucket.take(5)
+    assert bucket.available() == 0
+    now[0] = 100.2
+    assert bucket.available() == pytest.approx(2)
+    now[0] = 110.0
+    assert bucket.available() == 5
+
+
+def test_bucket_goes_negative_when_more_is_taken_than_available():
+    now = [100.0]
+    bucket = TokenBucket(10, 5, clock=lambda: now[0])
+    bucket.take(8)
+    assert bucket.available() == -3
+    now[0] = 100.5
+    assert bucket.available() == pytest.approx(2)
+
+
+def test_counts_from_several_threads_add_up():
+    meter = MidiMeter(clock=lambda: 0.0)
+    bucket = TokenBucket(10, 5, clock=lambda: 100.0)
+
+    def send():
+        for _ in range(5000):
+            meter.count("matrix", 3)
+            bucket.take()
+    threads = [threading.Thread(target=send) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (meter.messages["matrix"], meter.total_messages, meter.total_bytes) == (20000, 20000, 60000)
+    assert bucket.available() == 5 - 20000
@@ -0,0 +1,94 @@
+from Launchpad95.NoteCache import NoteCache
+
+# (pitch, time, duration, velocity, mute), not in time order
+NOTES = (
+    (36, 1.0, 0.25, 100, False),
+    (38, 0.0, 0.5, 100, False),
+    (36, 0.0, 0.25, 100, False),
+    (40, 0.5, 2.0, 100, True),
+    (42, 2.0, 0.25, 100, False),
+)
+
+
+def test_compares_equal_to_the_notes_it_holds():
+    assert NoteCache(NOTES) == list(NOTES)
+    assert NoteCache(NOTES) == NoteCache(NOTES)
+    assert NoteCache(NOTES) != NOTES[1:]
+    assert NoteCache(NOTES) != None
+
+
+def test_grid_buckets_notes_by_pitch_and_step():
+    grid = NoteCache(NOTES).grid(0.25, 4)
+    assert grid.notes_at(36, 0) == [NOTES[2]]
+    assert grid.notes_at(36, 4) == [NOTES[0]]
+    assert grid.notes_at(38, 1) == ()
+    assert grid.notes_at_step(0) == [NOTES[1], NOTES[2]]
+
+
+def test_grid_buckets_notes_by_page():
+    grid = NoteCache(NOTES).grid(0.25, 4)
+    assert grid.notes_in_page(0) == [NOTES[1], NOTES[2], NOTES[3]]
+    assert grid.notes_in_page(1) == [NOTES[0]]
+    assert grid.notes_in_page(2) == [NOTES[4]]
+    assert grid.page(1.99) == 1
+
+
+def test_one_grid_per_layout():
+    cache = NoteCache(NOTES)
+    assert cache.grid(0.25, 4) is cache.grid(0.25, 4)
+    assert cache.grid(0.5, 4).notes_at(40, 1) == [NOTES[3]]
+
+
+def test_playing_index_changes_when_the_sounding_notes_do():
+    cache = NoteCache(NOTES)
+    # 36 and 38 start at 0.0, 36 ends at 0.25, 38 at 0.5
+    assert cache.playing_index(0.0) == cache.playing_index(0.1)
+    assert cache.playing_index(0.25) != cache.playing_index(0.3)
+    assert cache.playing_index(0.3) == cache.playing_index(0.45)
+    assert cache.playing_index(0.45) != cache.playing_index(0.6)
+
+
+def test_playing_index_ignores_muted_notes():
+    # the muted 40 is the only note ending between 2.3 and 2.6
+    cache = NoteCache(NOTES)
+    assert cache.playing_index(2.3) == cache.playing_index(2.6)
+
+
+def test_by_time_keeps_the_clip_order_of_notes_starting_together():
+    cache = NoteCache(NOTES)
+    assert cache.by_time == [NOTES[1], NOTES[2], NOTES[3], NOTES[0], NOTES[4]]
+    assert cache.columns[1] == [0.0, 0.0, 0.5, 1.0, 2.0]
+
+
+def test_time_range_is_the_slice_of_notes_starting_in_it():
+    cache = NoteCache(NOTES)
+    first, last = cache.time_range(0.0, 1.0)
+    assert cache.by_time[first:last] == [NOTES[1], NOTES[2], NOTES[3]]
+    first, last = cache.time_range(1.0, 2.0)
+    assert cache.by_time[first:last] == [NOTES[0]]
+    assert cache.time_range(0.75, 0.8) == (3, 3)
+
+
+def test_time_range_without_end_runs_to_the_last_note():
+    cache = NoteCache(NOTES)
+    assert cache.time_range(1.0) == (3, 5)
+    assert cache.time_range(3.0) == (5, 5)
+    assert NoteCache().time_range(0.0, 4.0) == (0, 0)
+
+
+def test_pitches_playing_at_include_the_start_and_end_of_each_note():
+    cache = NoteCache(NOTES)
+    assert cache.pitches_playing_at(0.0) == {36, 38}
+    assert cache.pitches_playing_at(0.5) == {38}
+    assert cache.pitches_playing_at(1.25) == {36}
+    assert cache.pitches_playing_at(1.5) == set()
+
+
+def test_pitches_playing_at_skip_muted_notes():
+    assert NoteCache(NOTES).pitches_playing_at(1.75) == set()
+
+
+def test_pitches_playing_at_see_a_long_note_under_a_later_short_one():
+    cache = NoteCache([(50, 0.0, 4.0, 100, False), (50, 1.0, 0.25, 100, False)])
+    assert cache.pitches_playing_at(3.0) == {50}
+    assert cache.pitches_playing_at(4.5) == set()
@@ -0,0 +1,45 @@
+import harness
+from Launchpad95.NoteCache import NoteCache
+
+
+def _drum_editor(host):
+    selector = host.selector
+    host.song.view.selected_track = host.song.tracks[0]
+    host.tick()
+    selector._main_mode_index = 2
+    selector._sub_mode_list[2] = 0
+    with host.surface.component_guard():
+        selector.update()
+    host.tick()
+    return selector._stepseq._note_editor
+
+
+def test_a_pad_edits_the_clip_even_before_the_note_cache_caught_up():
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    editor = _drum_editor(host)
+    clip = host.song.tracks[0].clip_slots[0].clip
+    clip.remove_notes(0.0, 0, clip.length, 128)
+    stale = NoteCache()
+    editor.set_note_cache(stale)
+    editor._matrix_value_message([127, 1, 7, True])
+    assert clip.note_count() == 1
+    # the notes listener has not handed the new note to the editor yet
+    editor.set_note_cache(stale)
+    editor._matrix_value_message([127, 1, 7, True])
+    assert clip.note_count() == 0
+    host.disconnect()
+
+
+def test_a_muted_lane_is_read_from_the_clip():
+    host = harness.Host('mk2', harness.build_song(num_tracks=2, num_scenes=2, dense_notes=16))
+    host.boot()
+    editor = _drum_editor(host)
+    clip = host.song.tracks[0].clip_slots[0].clip
+    clip.remove_notes(0.0, 0, clip.length, 128)
+    clip.set_notes(((36, 0.0, 0.25, 100, False), (36, 1.0, 0.25, 100, False), (38, 0.0, 0.25, 100, False)))
+    editor.set_note_cache(NoteCache())
+    editor.mute_lane(36)
+    clip.select_all_notes()
+    assert sorted(clip.get_selected_notes()) == [(36, 0.0, 0.25, 100, True), (36, 1.0, 0.25, 100, True), (38, 0.0, 0.25, 100, False)]
+    host.disconnect()
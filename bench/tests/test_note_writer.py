@@ -0,0 +1,146 @@
+import random
+
+from Live.Clip import Clip, LegacyClip
+from Launchpad95.NoteWriter import change_found_notes, diff_notes, notes_at, write_note_changes, write_notes
+
+
+def test_diff_of_the_same_notes_in_another_order_is_empty():
+    notes = [(36, 0.0, 0.25, 100, False), (38, 1.0, 0.25, 100, False)]
+    assert diff_notes(notes, notes[::-1]) == ([], [], [])
+
+
+def test_diff_pairs_changes_at_the_same_pitch_and_time():
+    old = [(36, 0.0, 0.25, 100, False), (38, 1.0, 0.25, 100, False)]
+    new = [(36, 0.0, 0.25, 64, False), (40, 2.0, 0.25, 100, False)]
+    removed, added, modified = diff_notes(old, new)
+    assert removed == [(38, 1.0, 0.25, 100, False)]
+    assert added == [(40, 2.0, 0.25, 100, False)]
+    assert modified == [((36, 0.0, 0.25, 100, False), (36, 0.0, 0.25, 64, False))]
+
+
+def test_diff_counts_duplicates():
+    note = (36, 0.0, 0.25, 100, False)
+    assert diff_notes([note, note], [note]) == ([note], [], [])
+    assert diff_notes([note], [note, note, note]) == ([], [note, note], [])
+
+
+def test_diff_pairs_each_removed_note_once():
+    old = [(36, 0.0, 0.25, 100, False), (36, 0.0, 0.5, 100, False)]
+    new = [(36, 0.0, 0.25, 1, False), (36, 0.0, 0.5, 1, False), (36, 0.0, 1.0, 1, False)]
+    removed, added, modified = diff_notes(old, new)
+    assert removed == []
+    assert added == [(36, 0.0, 1.0, 1, False)]
+    assert sorted(old for old, new in modified) == old
+    assert sorted(new for old, new in modified) == new[:2]
+
+
+def test_diff_treats_lists_and_tuples_alike():
+    assert diff_notes([[36, 0.0, 0.25, 100, False]], [(36, 0.0, 0.25, 100, False)]) == ([], [], [])
+
+
+def test_write_notes_with_the_note_id_api_touches_only_the_difference():
+    old = [(36, 0.0, 0.25, 100, False), (38, 1.0, 0.25, 100, False), (42, 3.0, 0.25, 100, False)]
+    new = [(36, 0.0, 0.25, 64, True), (40, 2.0, 0.25, 100, False), (42, 3.0, 0.25, 100, False)]
+    clip = Clip()
+    clip.load_notes(old)
+    write_notes(clip, old, new)
+    clip.select_all_notes()
+    assert sorted(clip.get_selected_notes()) == new
+    assert clip.stats['replace_selected_notes'] == 0
+
+
+def test_write_notes_before_live_11_rewrites_the_clip():
+    old = [(36, 0.0, 0.25, 100, False), (38, 1.0, 0.25, 100, False)]
+    new = [(36, 0.0, 0.25, 64, True), (40, 2.0, 0.25, 100, False)]
+    clip = LegacyClip()
+    clip.load_notes(old)
+    write_notes(clip, old, new)
+    clip.select_all_notes()
+    assert sorted(clip.get_selected_notes()) == new
+    assert clip.stats['replace_selected_notes'] == 1
+
+
+def test_write_note_changes_with_the_note_id_api_touches_only_the_given_notes():
+    notes = [(36, 0.0, 0.25, 100, False), (38, 1.0, 0.25, 100, False), (42, 3.0, 0.25, 100, False)]
+    clip = Clip()
+    clip.load_notes(notes)
+    write_note_changes(clip, removed=[notes[1]], added=[(40, 2.0, 0.25, 100, False)], modified=[(notes[0], (36, 0.0, 0.25, 64, True))])
+    clip.select_all_notes()
+    assert sorted(clip.get_selected_notes()) == [(36, 0.0, 0.25, 64, True), (40, 2.0, 0.25, 100, False), (42, 3.0, 0.25, 100, False)]
+    assert clip.stats['replace_selected_notes'] == 0
+
+
+def test_write_note_changes_before_live_11_reads_only_the_touched_notes():
+    notes = [(36, 0.0, 0.25, 100, False), (38, 1.0, 0.25, 100, False), (60, 8.0, 0.25, 100, False)]
+    clip = LegacyClip()
+    clip.load_notes(notes)
+    read = clip.stats['notes_read']
+    write_note_changes(clip, removed=[notes[1]], modified=[(notes[0], (36, 0.0, 0.25, 64, False))])
+    assert clip.stats['notes_read'] - read == 2
+    assert clip.stats['replace_selected_notes'] == 0
+    clip.select_all_notes()
+    assert sorted(clip.get_selected_notes()) == [(36, 0.0, 0.25, 64, False), (60, 8.0, 0.25, 100, False)]
+
+
+def test_write_note_changes_accepts_iterators():
+    old = [(36, 0.0, 0.25, 100, False), (38, 1.0, 0.25, 100, False)]
+    new = [(36, 0.0, 0.25, 1, True), (38, 1.0, 0.25, 1, True)]
+    for clip_type in (Clip, LegacyClip):
+        clip = clip_type()
+        clip.load_notes(old)
+        write_note_changes(clip, modified=zip(old, new))
+        clip.select_all_notes()
+        assert sorted(clip.get_selected_notes()) == new
+
+
+def test_write_note_changes_leaves_the_clip_as_write_notes_would():
+    rng = random.Random(7)
+    for clip_type in (Clip, LegacyClip):
+        for _ in range(20):
+            old = [(rng.randrange(36, 44), rng.randrange(16) * 0.25, 0.25, 100, False) for _ in range(12)]
+            new = [note for note in old if rng.random() < 0.7]
+            new += [(rng.randrange(36, 44), rng.randrange(16) * 0.25, 0.25, 100, False) for _ in range(3)]
+            new = [(pitch, time, length, rng.choice((100, 64)), mute) for pitch, time, length, velocity, mute in new]
+            clip = clip_type()
+            clip.load_notes(old)
+            write_note_changes(clip, *diff_notes(old, new))
+            clip.select_all_notes()
+            assert sorted(clip.get_selected_notes()) == sorted(new)
+
+
+
+def test_notes_are_matched_on_start_times_a_rounding_error_apart():
+    clip = Clip()
+    clip.load_notes([(36, 0.1 + 0.2, 0.25, 100, False)])
+    write_note_changes(clip, modified=[((36, 0.3, 0.25, 100, False), (36, 0.3, 0.25, 64, False))])
+    clip.select_all_notes()
+    assert [note[3] for note in clip.get_selected_notes()] == [64]
+
+
+def test_a_changed_note_missing_from_the_clip_is_added_instead():
+    clip = Clip()
+    write_note_changes(clip, removed=[(38, 1.0, 0.25, 100, False)], modified=[((36, 0.0, 0.25, 100, False), (36, 0.0, 0.25, 64, False))])
+    clip.select_all_notes()
+    assert list(clip.get_selected_notes()) == [(36, 0.0, 0.25, 64, False)]
+
+
+def test_found_notes_are_changed_by_id():
+    clip = Clip()
+    clip.load_notes([(36, 0.0, 0.25, 100, False), (36, 0.5, 0.25, 100, False), (38, 0.0, 0.25, 100, False)])
+    found = notes_at(clip, 36, 0.0, 0.5)
+    assert [note for note_id, note in found] == [(36, 0.0, 0.25, 100, False)]
+    assert all(isinstance(note_id, int) for note_id, note in found)
+    change_found_notes(clip, [(note_id, note, None) for note_id, note in notes_at(clip, 38, 0.0, 1.0)] + [(found[0][0], found[0][1], (36, 0.0, 0.25, 100, True))])
+    clip.select_all_notes()
+    assert sorted(clip.get_selected_notes()) == [(36, 0.0, 0.25, 100, True), (36, 0.5, 0.25, 100, False)]
+    assert clip.stats['replace_selected_notes'] == 0
+
+
+def test_found_notes_before_live_11_are_changed_by_value():
+    clip = LegacyClip()
+    clip.load_notes([(36, 0.0, 0.25, 100, False), (38, 0.0, 0.25, 100, False)])
+    found = notes_at(clip, 36, 0.0, 0.5)
+    assert found == [(None, (36, 0.0, 0.25, 100, False))]
+    change_found_notes(clip, [(None, found[0][1], (36, 0.0, 0.25, 100, True))])
+    clip.select_all_notes()
+    assert sorted(clip.get_selected_notes()) == [(36, 0.0, 0.25, 100, True), (38, 0.0, 0.25, 100, False)]
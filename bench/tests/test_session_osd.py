@@ -0,0 +1,39 @@
+import harness
+
+
+def _click(host, button):
+    host.press(button)
+    host.release(button)
+    host.tick()
+
+
+def test_the_session_and_mixer_write_the_osd_again_when_their_mode_comes_back():
+    host = harness.Host('mk2', harness.build_song(num_tracks=4, num_scenes=2, dense_notes=16))
+    host.boot()
+    osd = host.surface._osd
+    modes = host.selector._modes_buttons
+    assert osd.mode == "Session" and osd.attribute_names[:4] == ["Track 1", "Track 2", "Track 3", "Track 4"]
+    _click(host, modes[3])
+    assert osd.mode == "Mixer" and osd.attribute_names[0] == "Track 1"
+    _click(host, modes[1])
+    assert osd.mode != "Mixer"
+    _click(host, modes[0])
+    assert osd.mode == "Session" and osd.attribute_names[0] == "Track 1"
+    _click(host, modes[3])
+    assert osd.mode == "Mixer"
+    host.disconnect()
+
+
+def test_the_session_leaves_the_osd_alone_while_its_names_do_not_change():
+    host = harness.Host('mk2', harness.build_song(num_tracks=4, num_scenes=2, dense_notes=16))
+    host.boot()
+    osd = host.surface._osd
+    session = host.selector._session
+    osd.set_mode("Other")
+    session.update()
+    assert osd.draft_mode == "Other"
+    host.song.tracks[1].name = "Bass"
+    assert osd.draft_mode == "Session" and osd.attribute_names[1] == "Track 2"
+    host.tick()
+    assert osd.attribute_names[1] == "Bass"
+    host.disconnect()
@@ -0,0 +1,14 @@
+from Launchpad95.SettingDefaults import DEFAULTS, setting
+from Launchpad95.Settings import Settings
+
+
+def test_settings_py_values_are_used():
+    for name in DEFAULTS:
+        assert setting(name) == getattr(Settings, name)
+
+
+def test_settings_missing_from_an_old_settings_py_take_their_default(monkeypatch):
+    for name in DEFAULTS:
+        monkeypatch.delattr(Settings, name)
+    for name, value in DEFAULTS.items():
+        assert setting(name) == value
@@ -0,0 +1,80 @@
+from _Framework.ButtonElement import Color
+from _Framework.InputControlElement import MIDI_NOTE_TYPE
+from _Framework.Skin import Skin
+from Launchpad95.ColorsMK2 import Blink, Pulse
+from Launchpad95.ConfigurableButtonElement import ConfigurableButtonElement
+from Launchpad95.SkinTable import color_id, find_color_id, skin_table
+
+
+class Colors:
+
+    class Pad:
+        Static = Color(5)
+        Flash = Blink(9)
+        Glow = Pulse(13)
+
+
+def test_colour_ids_are_shared_by_name():
+    assert color_id("Test.Shared") == color_id("Test.Shared")
+    assert color_id("Test.Shared") != color_id("Test.Other")
+    assert color_id("Test.Shared").name == "Test.Shared"
+
+
+def test_find_color_id_of_names_ids_and_other_values():
+    id = color_id("Test.Found")
+    assert find_color_id("Test.Found") == id
+    assert find_color_id(id) is id
+    assert find_color_id("Test.Never.Interned") is None
+    assert find_color_id(5) is None
+    assert find_color_id([]) is None
+
+
+def test_skin_is_compiled_once_into_its_colours():
+    skin = Skin(Colors)
+    table = skin_table(skin)
+    assert skin_table(skin) is table
+    assert table.entry(color_id("Pad.Static")) is Colors.Pad.Static
+    assert table.entry(color_id("Pad.Flash")) is Colors.Pad.Flash
+    assert table.entry(color_id("Test.Not.In.Skin")) is None
+
+
+def test_plain_ints_of_a_skin_are_drawn_as_colours():
+
+    class Plain:
+
+        class Pad:
+            Red = 5
+
+    assert skin_table(Skin(Plain)).entry(color_id("Pad.Red")).midi_value == 5
+
+
+def test_buttons_draw_flashing_colours_over_black():
+    button = ConfigurableButtonElement(True, MIDI_NOTE_TYPE, 0, 11, skin=Skin(Colors))
+    sent = []
+    button._send_midi = lambda midi_bytes, optimized=True: sent.append(midi_bytes) or True
+    button.set_light("Pad.Static")
+    button.set_light("Pad.Flash")
+    button.set_light(color_id("Pad.Glow"))
+    assert sent == [(144, 11, 5), (144, 11, 0), (145, 11, 9), (144, 11, 0), (146, 11, 13)]
+
+
+def test_buttons_send_values_that_are_not_skin_colours():
+    button = ConfigurableButtonElement(True, MIDI_NOTE_TYPE, 0, 11, skin=Skin(Colors))
+    sent = []
+    button._send_midi = lambda midi_bytes, optimized=True: sent.append(midi_bytes) or True
+    button.set_light(7)
+    assert sent == [(144, 11, 7)]
+
+
+def test_buttons_draw_the_skin_colours_of_their_states():
+    button = ConfigurableButtonElement(True, MIDI_NOTE_TYPE, 0, 11, skin=Skin(Colors))
+    sent = []
+    button._send_midi = lambda midi_bytes, optimized=True: sent.append(midi_bytes) or True
+    button.set_on_off_values("Pad.Flash", "Pad.Static")
+    assert button.on_value is Colors.Pad.Flash
+    button.turn_on()
+    button.turn_off()
+    button.set_on_off_values(127, 0)
+    assert button.on_value == 127
+    button.turn_on()
+    assert sent == [(144, 11, 0), (145, 11, 9), (144, 11, 5), (144, 11, 127)]